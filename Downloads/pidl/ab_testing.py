@@ -0,0 +1,399 @@
+"""
+Offline A/B Test Motoru - Tavsiye Algoritması Karşılaştırması
+
+İki kol (arm) farklı ağırlık (α, β, γ, δ), mod ve task_complexity
+konfigürasyonlarıdır. Ağırlıktan bağımsız bileşenler (S, C, P, L, D) her
+(task_complexity, time_factor) koşulu için bir kez hesaplanır; kolun skor
+matrisi mode_features ile tek bir tensör çarpımıdır:
+
+    totals = F(mode) @ w     (U×P×4) @ (4,) → U×P
+
+Kullanıcı başına metrikler:
+- Top-k kesişimi (iki kolun top-k listelerinin ortak oranı)
+- Spearman sıra korelasyonu (tüm persona sıralaması)
+- Top-1 uyumu
+- Metrik farkı (B - A), yalnızca ortak bir ölçek verilirse: gözlenen
+  sonuçlar (outcomes) veya her iki kolun top-k seçimlerini yeniden skorlayan
+  tek bir referans kol. Kolların kendi skorları farklı ölçeklerdedir (ör.
+  daha büyük α tek başına skoru büyütür), bu yüzden karşılaştırılmaz.
+
+Anlamlılık, kullanıcı başına farklar üzerinde vektörize paired sign-flip
+permütasyon testi veya multiplier bootstrap ile hesaplanır: binlerce
+yeniden örnekleme, rastgele byte'lardan açılan seçim maskeleriyle parçalı
+float32 matris çarpımıdır.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from recommendation_engine import (RecommendationEngine, SCORING_MODES, select_top_k,
+                                   user_vectors_to_array)
+from weight_sweep import WEIGHT_NAMES, mode_features
+
+
+SIGNIFICANCE_TESTS = ("permutation", "bootstrap")
+
+
+@dataclass
+class ABArm:
+    """Bir A/B kolunun engine konfigürasyonu (None ağırlık = engine'in değeri)"""
+    name: str = "A"
+    mode: str = "hybrid"
+    alpha: Optional[float] = None
+    beta: Optional[float] = None
+    gamma: Optional[float] = None
+    delta: Optional[float] = None
+    task_complexity: float = 0.5
+    time_factor: float = 0.5
+
+    def __post_init__(self):
+        if self.mode not in SCORING_MODES:
+            raise ValueError(f"Geçersiz mod: {self.mode}. {SCORING_MODES} olmalı.")
+
+    def weights(self, engine: RecommendationEngine) -> np.ndarray:
+        """(α, β, γ, δ) vektörü, toplamı 1'e normalize edilmiş"""
+        weights = np.array([
+            getattr(engine, name) if getattr(self, name) is None else getattr(self, name)
+            for name in WEIGHT_NAMES
+        ], dtype=np.float64)
+        if np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError(f"Ağırlıklar negatif olmayan ve toplamı pozitif olmalı: {weights}")
+        return weights / weights.sum()
+
+    def config(self, engine: RecommendationEngine) -> Dict:
+        """Raporlama için çözümlenmiş konfigürasyon"""
+        return {
+            "mode": self.mode,
+            **dict(zip(WEIGHT_NAMES, self.weights(engine).tolist())),
+            "task_complexity": self.task_complexity,
+            "time_factor": self.time_factor
+        }
+
+
+@dataclass
+class ABTestResult:
+    """
+    A/B testi çıktısı: kullanıcı başına diziler + anlamlılık
+
+    Ortak ölçek (outcomes / referans) verilmediyse metric, metric_a,
+    metric_b None ve significance boştur; yalnızca uyum metrikleri vardır.
+    """
+    persona_ids: list
+    arm_a: Dict
+    arm_b: Dict
+    top_k: int
+    metric: Optional[str]
+    top_a: np.ndarray           # U×k persona indeksleri
+    top_b: np.ndarray
+    topk_overlap: np.ndarray    # (U,)
+    rank_correlation: np.ndarray
+    top1_agreement: np.ndarray
+    metric_a: Optional[np.ndarray] = None
+    metric_b: Optional[np.ndarray] = None
+    significance: Dict = field(default_factory=dict)
+
+    @property
+    def delta(self) -> Optional[np.ndarray]:
+        """Kullanıcı başına metrik farkı (B - A), metrik yoksa None"""
+        if self.metric is None:
+            return None
+        return self.metric_b - self.metric_a
+
+    def __len__(self) -> int:
+        return len(self.top_a)
+
+    def top1_distribution(self, arm: str = "a") -> Dict[str, int]:
+        """Kolun top-1 persona dağılımı (azalan)"""
+        top = self.top_a if arm.lower() == "a" else self.top_b
+        counts = np.bincount(top[:, 0], minlength=len(self.persona_ids))
+        order = np.argsort(-counts, kind="stable")
+        return {self.persona_ids[idx]: int(counts[idx]) for idx in order if counts[idx] > 0}
+
+    def summary(self) -> Dict:
+        """Özet metrikler (metrik alanları yalnızca ortak ölçek varsa)"""
+        summary = {
+            "n_users": len(self),
+            "metric": self.metric,
+            "arm_a": self.arm_a,
+            "arm_b": self.arm_b,
+            f"mean_top{self.top_k}_overlap": float(self.topk_overlap.mean()),
+            "mean_rank_correlation": float(self.rank_correlation.mean()),
+            "top1_agreement": float(self.top1_agreement.mean())
+        }
+        if self.metric is not None:
+            summary.update({
+                "mean_metric_a": float(self.metric_a.mean()),
+                "mean_metric_b": float(self.metric_b.mean()),
+                "mean_delta": float(self.delta.mean()),
+                **self.significance
+            })
+        return summary
+
+    def per_user_frame(self) -> pd.DataFrame:
+        """Kullanıcı başına metrikler DataFrame'i"""
+        persona_ids = np.asarray(self.persona_ids, dtype=object)
+        frame = pd.DataFrame({
+            "top1_a": persona_ids[self.top_a[:, 0]],
+            "top1_b": persona_ids[self.top_b[:, 0]],
+            "topk_overlap": self.topk_overlap,
+            "rank_correlation": self.rank_correlation
+        })
+        if self.metric is not None:
+            frame["metric_a"] = self.metric_a
+            frame["metric_b"] = self.metric_b
+            frame["delta"] = self.delta
+        return frame
+
+
+def _random_half_sums(values: np.ndarray, n_resamples: int, seed: Optional[int],
+                      chunk_size: int = 64) -> np.ndarray:
+    """
+    Rastgele yarı alt kümelerin sütun toplamları (R×C)
+
+    Her kullanıcı her yeniden örneklemede 1/2 olasılıkla seçilir. Seçim
+    maskeleri rastgele byte'lardan açılır (kullanıcı başına tek rastgele bit);
+    bir parça yeniden örnekleme tek bir float32 matris çarpımıdır:
+    (R×U maske) @ (U×C değerler).
+
+    Args:
+        values: (U,) veya U×C değerler
+        n_resamples: Yeniden örnekleme sayısı
+        seed: Random seed
+        chunk_size: Parça başına yeniden örnekleme (maske belleği R×U float32)
+    """
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=np.float32).reshape(len(values), -1)
+    n_users = len(values)
+    n_bytes = -(-n_users // 8)
+    sums = np.empty((n_resamples, values.shape[1]))
+    for start in range(0, n_resamples, chunk_size):
+        stop = min(start + chunk_size, n_resamples)
+        selection = rng.integers(0, 256, size=(stop - start, n_bytes), dtype=np.uint8)
+        mask = np.unpackbits(selection, axis=1, count=n_users, bitorder="little")
+        sums[start:stop] = mask.astype(np.float32) @ values
+    return sums
+
+
+def paired_permutation_test(deltas: np.ndarray, n_resamples: int = 5000,
+                            seed: Optional[int] = 42) -> Dict:
+    """
+    Paired sign-flip permütasyon testi (H0: ortalama fark = 0)
+
+    H0 altında her kullanıcının farkının işareti rastgeledir. İşareti
+    korunan kullanıcılar rastgele yarı alt küme S ise permütasyon ortalaması
+    (2·ΣS - Σ) / U'dur.
+
+    Args:
+        deltas: (U,) kullanıcı başına fark
+        n_resamples: Permütasyon sayısı
+        seed: Random seed
+
+    Returns:
+        {"test", "p_value", "n_resamples"}
+    """
+    deltas = np.asarray(deltas, dtype=np.float64)
+    n_users = len(deltas)
+    observed = abs(deltas.mean())
+    kept = _random_half_sums(deltas, n_resamples, seed)[:, 0]
+    means = (2 * kept - deltas.sum()) / n_users
+    # float32 toplamların yuvarlamasına karşı göreli tolerans
+    extreme = int(np.count_nonzero(np.abs(means) >= observed * (1 - 1e-5)))
+
+    return {
+        "test": "permutation",
+        "p_value": (extreme + 1) / (n_resamples + 1),
+        "n_resamples": n_resamples
+    }
+
+
+def bootstrap_test(deltas: np.ndarray, n_resamples: int = 5000, seed: Optional[int] = 42,
+                   confidence: float = 0.95) -> Dict:
+    """
+    Ortalama fark için bootstrap güven aralığı ve iki yönlü p-değeri
+
+    Multiplier (ağırlıklı) bootstrap: her kullanıcının ağırlığı 2·Bernoulli(½)
+    (ortalama 1, varyans 1 - Poisson(1) bootstrap'ı ile aynı ilk iki moment).
+    Yeniden örnekleme ortalaması Σ w·d / Σ w'dur.
+
+    Returns:
+        {"test", "p_value", "ci_lower", "ci_upper", "n_resamples"}
+    """
+    deltas = np.asarray(deltas, dtype=np.float64)
+    sums = _random_half_sums(np.column_stack([deltas, np.ones_like(deltas)]), n_resamples, seed)
+    means = sums[:, 0] / np.maximum(sums[:, 1], 1)
+
+    tail = (1 - confidence) / 2
+    below = np.count_nonzero(means <= 0) / n_resamples
+    above = np.count_nonzero(means >= 0) / n_resamples
+    return {
+        "test": "bootstrap",
+        "p_value": float(min(1.0, 2 * min(below, above))),
+        "ci_lower": float(np.quantile(means, tail)),
+        "ci_upper": float(np.quantile(means, 1 - tail)),
+        "n_resamples": n_resamples
+    }
+
+
+class ABTestEngine:
+    """İki engine konfigürasyonunu tüm kohort üzerinde toplu karşılaştır"""
+
+    def __init__(self, engine: Optional[RecommendationEngine] = None, personas=None):
+        """
+        Args:
+            engine: Bileşenleri hesaplayan engine (None = varsayılan)
+            personas: None (tümü) veya persona id listesi
+        """
+        self.engine = engine or RecommendationEngine()
+        self.personas = personas
+        self._components = {}
+
+    def user_matrix(self, users) -> np.ndarray:
+        """
+        Kullanıcıları U×10 matrise dönüştür
+
+        Args:
+            users: U×10 matris, UserVector listesi, profil dict listesi
+                (create_user_vector) veya SyntheticUserColumns
+        """
+        if hasattr(users, "user_matrix"):
+            return users.user_matrix(self.engine)
+        if not isinstance(users, np.ndarray):
+            users = [self.engine.create_user_vector(user) if isinstance(user, dict) else user
+                     for user in users]
+        return user_vectors_to_array(users)
+
+    def _condition_components(self, users: np.ndarray, task_complexity: float,
+                              time_factor: float) -> Dict:
+        """(task_complexity, time_factor) başına bileşenler (aynı koşuldaki kollar paylaşır)"""
+        key = (id(users), task_complexity, time_factor)
+        if key not in self._components:
+            self._components[key] = self.engine.score_components(
+                users, self.personas, task_complexity, time_factor
+            )
+        return self._components[key]
+
+    def arm_scores(self, users, arm: ABArm) -> np.ndarray:
+        """Kolun U×P toplam skor matrisi"""
+        components = self._condition_components(users, arm.task_complexity, arm.time_factor)
+        features = mode_features(components, components["learning_goal"], arm.mode)
+        return features @ arm.weights(self.engine)
+
+    def run(self, users, arm_a: ABArm, arm_b: ABArm, top_k: int = 3,
+            outcomes: Optional[np.ndarray] = None, reference: Optional[ABArm] = None,
+            test: str = "permutation",
+            n_resamples: int = 5000, seed: Optional[int] = 42,
+            confidence: float = 0.95) -> ABTestResult:
+        """
+        A/B testini çalıştır
+
+        Args:
+            users: Kohort (bkz. user_matrix)
+            arm_a, arm_b: Kol konfigürasyonları
+            top_k: Kesişim ve metrik için K
+            outcomes: U×P gözlenen sonuç matrisi (örn. puanlar). Verilirse
+                metrik = kolun top-k persona'larının ortalama sonucu
+            reference: Ortak ölçek için referans kol (outcomes yoksa).
+                Verilirse metrik = kolun top-k persona'larının referans
+                koldaki ortalama skoru. İkisi de yoksa metrik ve anlamlılık
+                hesaplanmaz (kazanan ilan edilemez)
+            test: "permutation" veya "bootstrap"
+            n_resamples: Yeniden örnekleme sayısı
+            seed: Random seed
+            confidence: Bootstrap güven düzeyi
+
+        Returns:
+            ABTestResult
+        """
+        if test not in SIGNIFICANCE_TESTS:
+            raise ValueError(f"Geçersiz test: {test}. {SIGNIFICANCE_TESTS} olmalı.")
+
+        users = self.user_matrix(users)
+        self._components = {}
+        scores_a = self.arm_scores(users, arm_a)
+        scores_b = self.arm_scores(users, arm_b)
+        scores_reference = (self.arm_scores(users, reference)
+                            if outcomes is None and reference is not None else None)
+        persona_ids = list(self._condition_components(
+            users, arm_a.task_complexity, arm_a.time_factor)["persona_ids"])
+        self._components = {}
+
+        n_users, n_personas = scores_a.shape
+        top_k = min(top_k, n_personas)
+
+        # Tam sıralama (P küçük): top-k ve Spearman aynı argsort'tan
+        order_a = select_top_k(scores_a, n_personas)
+        order_b = select_top_k(scores_b, n_personas)
+        ranks_a = np.empty_like(order_a)
+        ranks_b = np.empty_like(order_b)
+        positions = np.broadcast_to(np.arange(n_personas), order_a.shape)
+        np.put_along_axis(ranks_a, order_a, positions, axis=1)
+        np.put_along_axis(ranks_b, order_b, positions, axis=1)
+
+        topk_overlap = ((ranks_a < top_k) & (ranks_b < top_k)).sum(axis=1) / top_k
+        spearman_scale = 6.0 / (n_personas * (n_personas ** 2 - 1)) if n_personas > 1 else 0.0
+        rank_correlation = 1 - spearman_scale * ((ranks_a - ranks_b) ** 2).sum(axis=1)
+
+        top_a, top_b = order_a[:, :top_k], order_b[:, :top_k]
+        # Kazanan ancak iki kolun seçimleri aynı ölçekte skorlanınca belirlenir
+        metric, metric_a, metric_b, significance = None, None, None, {}
+        if outcomes is not None:
+            common = np.asarray(outcomes, dtype=np.float64)
+            metric = f"outcome@{top_k}"
+        elif scores_reference is not None:
+            common = scores_reference
+            metric = f"reference@{top_k}"
+        if metric is not None:
+            metric_a = np.take_along_axis(common, top_a, axis=1).mean(axis=1)
+            metric_b = np.take_along_axis(common, top_b, axis=1).mean(axis=1)
+            deltas = metric_b - metric_a
+            if test == "permutation":
+                significance = paired_permutation_test(deltas, n_resamples, seed)
+            else:
+                significance = bootstrap_test(deltas, n_resamples, seed, confidence)
+
+        return ABTestResult(
+            persona_ids=persona_ids,
+            arm_a={"name": arm_a.name, **arm_a.config(self.engine)},
+            arm_b={"name": arm_b.name, **arm_b.config(self.engine)},
+            top_k=top_k,
+            metric=metric,
+            top_a=top_a,
+            top_b=top_b,
+            topk_overlap=topk_overlap,
+            rank_correlation=rank_correlation,
+            top1_agreement=order_a[:, 0] == order_b[:, 0],
+            metric_a=metric_a,
+            metric_b=metric_b,
+            significance=significance
+        )
+
+
+# Test için
+if __name__ == "__main__":
+    import time
+    from synthetic_user_generator import SyntheticUserGenerator
+
+    cohort = SyntheticUserGenerator(seed=42).generate_columns(n_per_stratum=10_000)
+    ab = ABTestEngine()
+
+    arm_a = ABArm("A", mode="similarity")
+    arm_b = ABArm("B", mode="hybrid", alpha=0.25, beta=0.25, gamma=0.25, delta=0.25,
+                  task_complexity=0.7)
+
+    # Ortak ölçek: iki kolun top-3 seçimleri engine'in adaptive skoruyla
+    reference = ABArm("referans", mode="adaptive")
+
+    for test in SIGNIFICANCE_TESTS:
+        start = time.time()
+        result = ab.run(cohort, arm_a, arm_b, top_k=3, reference=reference, test=test)
+        summary = result.summary()
+        print(f"✅ {test}: {len(result):,} kullanıcı {time.time() - start:.2f}s")
+        print(f"  Δ {summary['metric']} = {summary['mean_delta']:+.4f}, p = {summary['p_value']:.4f}"
+              + (f", CI [{summary['ci_lower']:+.4f}, {summary['ci_upper']:+.4f}]"
+                 if test == "bootstrap" else ""))
+
+    print(f"  Top-3 kesişim: {summary['mean_top3_overlap']:.3f}, "
+          f"Spearman ρ: {summary['mean_rank_correlation']:.3f}, "
+          f"top-1 uyum: {summary['top1_agreement']:.3f}")
@@ -8,6 +8,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+import asyncio
 import json
 import os
 import numpy as np
@@ -25,10 +26,11 @@ from advanced_math_models import (
     CorrelationAnalysis
 )
 from multi_llm_engine import MultiLLMEngine
-from recommendation_engine import RecommendationEngine
+from recommendation_engine import RecommendationEngine, SCORING_MODES
 from synthetic_user_generator import SyntheticUserGenerator
 from bulk_simulation import BulkSimulation
-from matching_tester import MatchingTester
+from matching_tester import MatchingTester, ShardedMatchingRunner
+from ab_testing import ABArm, ABTestEngine
 
 # Sayfa yapılandırması
 st.set_page_config(
@@ -514,56 +516,28 @@ def main():
             rec_engine = RecommendationEngine()
             user_vec = rec_engine.create_user_vector(profile_dict)
             
-            # Mod 1: Similarity - DOMINANT domain'e göre filtrele!
-            rankings_similarity = []
+            n_personas = len(rec_engine.persona_vectors)
             
+            # Mod 1: Similarity - DOMINANT domain'e göre filtrele!
             # Kullanıcının dominant domain'ine göre persona'ları filtrele
             # Eğer technical güçlüyse (veya daha az zayıf), technical persona'lar
             # Eğer educational güçlüyse, educational persona'lar
             preferred_category = "technology" if profile.dominant_domain == "technical" else "education"
             
-            for persona_id, persona_vec in rec_engine.persona_vectors.items():
-                # Persona'nın kategorisini al
-                persona_obj = next((p for p in get_all_personas() if p.id == persona_id), None)
-                
-                # Similarity modunda: aynı kategoriden persona'ları öner
-                if persona_obj and persona_obj.category == preferred_category:
-                    score_dict = rec_engine.calculate_recommendation_score(
-                        user_vec, persona_vec, mode="similarity"
-                    )
-                    rankings_similarity.append({
-                        "persona_id": persona_id,
-                        "score": score_dict["total_score"],
-                        "components": score_dict["components"],
-                        "mode": score_dict["mode"]
-                    })
-            
-            rankings_similarity.sort(key=lambda x: x["score"], reverse=True)
+            # Similarity modunda: aynı kategoriden persona'ları öner (maske ile)
+            rankings_similarity = rec_engine.rank_personas(
+                user_vec, top_k=n_personas, mode="similarity", categories=preferred_category
+            )
             
             # Mod 2: Complementary - WEAK domain'den persona'ları öner!
-            rankings_complementary = []
-            
             # Kullanıcının weak domain'ine göre persona'ları filtrele
             # Zayıf olduğunuz alanda güçlü olan persona'lar
             complementary_category = "education" if profile.weak_domain == "educational" else "technology"
             
-            for persona_id, persona_vec in rec_engine.persona_vectors.items():
-                # Persona'nın kategorisini al
-                persona_obj = next((p for p in get_all_personas() if p.id == persona_id), None)
-                
-                # Complementary modunda: KARŞI kategoriden persona'ları öner
-                if persona_obj and persona_obj.category == complementary_category:
-                    score_dict = rec_engine.calculate_recommendation_score(
-                        user_vec, persona_vec, mode="complementary"
-                    )
-                    rankings_complementary.append({
-                        "persona_id": persona_id,
-                        "score": score_dict["total_score"],
-                        "components": score_dict["components"],
-                        "mode": score_dict["mode"]
-                    })
-            
-            rankings_complementary.sort(key=lambda x: x["score"], reverse=True)
+            # Complementary modunda: KARŞI kategoriden persona'ları öner (maske ile)
+            rankings_complementary = rec_engine.rank_personas(
+                user_vec, top_k=n_personas, mode="complementary", categories=complementary_category
+            )
             
             # İki kolonda göster
             col1, col2 = st.columns(2)
@@ -684,12 +658,12 @@ def main():
                     label_visibility="collapsed"
                 )
 
-            # CLT-optimal persona'ları hesapla
-            clt_rankings = rec_engine.get_clt_optimal_personas(
-                user_vec,
-                task_complexity=task_complexity,
-                top_k=10
+            # CLT-optimal persona'ları hesapla (batch; metinler sadece gösterilen satırlar için)
+            clt_batch = rec_engine.calculate_cognitive_load_batch(
+                [user_vec],
+                task_complexities=[task_complexity]
             )
+            clt_rankings = clt_batch.rankings(0, 0, top_k=10, with_messages=False)
 
             # En iyi 3 persona göster
             st.markdown("#### 🏆 CLT-Optimal Persona Sıralaması")
@@ -725,8 +699,11 @@ def main():
                             st.warning("ℹ️ Çok kolay - kapasite kullanılmıyor")
 
                         # Recommendations
-                        if clt_analysis['recommendations']:
-                            st.caption(f"💡 {clt_analysis['recommendations'][0]}")
+                        _, clt_recommendations = clt_batch.messages(
+                            0, clt_batch.persona_ids.index(persona_id), 0
+                        )
+                        if clt_recommendations:
+                            st.caption(f"💡 {clt_recommendations[0]}")
 
                         st.markdown("---")
 
@@ -1007,24 +984,62 @@ def main():
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    # 1. Kod üretimi
-                    status_text.text(f"⏳ Kodlar üretiliyor... ({provider} - {model})")
-                    progress_bar.progress(25)
+                    # 1-2. Kod üretimi + değerlendirme (pipeline): her persona'nın kodu
+                    # üretildiği anda değerlendirilir, en yavaş LLM yanıtı beklenmez
+                    status_text.text(f"⏳ Kodlar üretiliyor ve değerlendiriliyor... ({provider} - {model})")
+                    progress_bar.progress(10)
 
                     if provider_name == "openai":
                         generator = CodeGenerator(api_key=api_key, model=model, provider="openai")
                     else:
                         generator = CodeGenerator(anthropic_key=api_key, model=model, provider="anthropic")
 
-                    results = generator.generate_codes(task, active_personas)
+                    evaluator = CodeEvaluator(cache=True)
+                    persona_order = {persona.id: index for index, persona in enumerate(active_personas)}
+
+                    live_board = st.empty()
+
+                    async def generate_and_evaluate():
+                        # Persona başına son çift; provisional çiftin değerlendirmesi
+                        # araçlar bitince yerinde güncellenip tekrar gelir
+                        pairs = {}
+                        final_ids = set()
+                        async for generation, evaluation in evaluator.evaluate_stream(
+                                generator.generate_codes_as_completed(task, active_personas),
+                                provisional=True):
+                            persona_id = generation["persona_id"]
+                            # Geçici olmayan ya da ikinci gelen çift nihaidir
+                            if not evaluation.get("provisional") or persona_id in pairs:
+                                final_ids.add(persona_id)
+                            pairs[persona_id] = (generation, evaluation)
+                            if persona_id in final_ids:
+                                progress_bar.progress(
+                                    10 + int(65 * len(final_ids) / len(active_personas)))
+                                status_text.text(f"📊 {generation['persona_name']} değerlendirildi "
+                                                 f"({len(final_ids)}/{len(active_personas)})")
+                            else:
+                                status_text.text(f"⏳ {generation['persona_name']} geçici skor: "
+                                                 f"{evaluation['total_score']:.1f}")
+                            live_board.dataframe(pd.DataFrame([
+                                {
+                                    "Persona": pair_generation["persona_name"],
+                                    "Skor": round(pair_evaluation.get("total_score", 0), 1),
+                                    "Durum": ("✅ tam" if pair_generation["persona_id"] in final_ids
+                                              else "⏳ geçici")
+                                }
+                                for pair_generation, pair_evaluation in sorted(
+                                    pairs.values(),
+                                    key=lambda pair: -pair[1].get("total_score", 0))
+                            ]), use_container_width=True, hide_index=True)
+                        # Persona sırasına geri dön
+                        return sorted(pairs.values(),
+                                      key=lambda pair: persona_order[pair[0]["persona_id"]])
+
+                    pairs = asyncio.run(generate_and_evaluate())
+                    live_board.empty()
+                    results = [generation for generation, _ in pairs]
+                    evaluated = [evaluation for _, evaluation in pairs]
                     st.session_state.generated_codes = results
-                    
-                    # 2. Değerlendirme
-                    status_text.text("📊 Kodlar değerlendiriliyor...")
-                    progress_bar.progress(50)
-                    
-                    evaluator = CodeEvaluator()
-                    evaluated = evaluator.evaluate_all(results)
                     st.session_state.evaluated_results = evaluated
                     
                     # 3. Sıralama
@@ -1325,7 +1340,8 @@ def main():
                         "Sıra": f"{'🥇' if idx==1 else '🥈' if idx==2 else '🥉' if idx==3 else str(idx)}",
                         "Persona": f"{persona.get('avatar', '👤')} {persona.get('persona_name')}",
                         "Kategori": persona.get('category', 'N/A').title(),
-                        "Toplam": f"{persona.get('total_score', 0):.1f}",
+                        "Toplam": f"{persona.get('total_score', 0):.1f}"
+                                  + (" ⏱️ kısmi" if persona.get('partial') else ""),
                         "Kalite": f"{persona.get('quality_score', 0):.1f}",
                         "LOC": f"{general_metrics.get('lines_of_code', 0)}",
                         "Yorum %": f"{general_metrics.get('comment_ratio', 0):.1f}",
@@ -1336,6 +1352,12 @@ def main():
                 
                 df = pd.DataFrame(ranking_data)
                 st.dataframe(df, use_container_width=True, hide_index=True)
+
+                partial_count = sum(1 for persona in overall if persona.get('partial'))
+                if partial_count:
+                    st.warning(f"⏱️ {partial_count} kodun değerlendirmesi süre sınırını aştı: skorları "
+                               "yalnızca tamamlanan metriklerden hesaplandı (kısmi) ve bu kodlar "
+                               "tam değerlendirilenlerin arkasında sıralandı.")
                 
                 # Görselleştirme
                 st.markdown("### 📊 Görselleştirme")
@@ -2729,172 +2751,159 @@ def main():
                                     persona = next(p for p in personas if p.id == m['persona_id'])
                                     st.markdown(f"- {persona.avatar} {persona.name} (Skor: {m['score']:.3f})")
 
-        # ========== Matching Algorithm Tester ==========
-        with sim_tab3:
-            st.markdown("### 📊 Matching Algorithm Tester")
-            st.markdown("Farklı matching parametrelerini test et ve karşılaştır")
-
-            if 'synthetic_users' not in st.session_state or not st.session_state.synthetic_users:
-                st.warning("⚠️ Önce 'Synthetic User Generator' sekmesinden kullanıcı üretin")
-            else:
-                st.markdown("#### ⚙️ A/B Test Ayarları")
-
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.markdown("**Algoritma A:**")
-                    algo_a_mode = st.selectbox("Mod A", ["similarity", "complementary"], key="algo_a")
-                    weight_a_sim = st.slider("Benzerlik Ağırlığı A", 0.0, 1.0, 0.7, key="w_a_sim")
-                    weight_a_comp = st.slider("Tamamlayıcılık Ağırlığı A", 0.0, 1.0, 0.3, key="w_a_comp")
-
-                with col2:
-                    st.markdown("**Algoritma B:**")
-                    algo_b_mode = st.selectbox("Mod B", ["similarity", "complementary"], index=1, key="algo_b")
-                    weight_b_sim = st.slider("Benzerlik Ağırlığı B", 0.0, 1.0, 0.3, key="w_b_sim")
-                    weight_b_comp = st.slider("Tamamlayıcılık Ağırlığı B", 0.0, 1.0, 0.7, key="w_b_comp")
-
-                sample_size = st.slider("Test için kullanıcı sayısı", 10, min(100, len(st.session_state.synthetic_users)), 50)
-
-                if st.button("🧪 A/B Test Başlat", type="primary"):
-                    with st.spinner("⏳ A/B test çalışıyor..."):
-                        from recommendation_engine import RecommendationEngine
-                        rec_engine = RecommendationEngine()
-                        personas = get_all_personas()
-
-                        users_sample = st.session_state.synthetic_users[:sample_size]
-
-                        results_a = []
-                        results_b = []
-
-                        for user in users_sample:
-                            # Basit matching algoritması
-                            persona_scores_a = []
-                            persona_scores_b = []
-
-                            for persona in personas:
-                                # Persona ağırlıkları
-                                if "education" in persona.category:
-                                    persona_edu = 0.8
-                                    persona_tech = 0.2
-                                else:
-                                    persona_edu = 0.2
-                                    persona_tech = 0.8
-
-                                user_edu = user['educational_score'] / 100
-                                user_tech = user['technical_score'] / 100
-
-                                # Algoritma A
-                                if algo_a_mode == "similarity":
-                                    score_a = 1 - (abs(user_edu - persona_edu) * 0.5 + abs(user_tech - persona_tech) * 0.5)
-                                else:  # complementary
-                                    score_a = 1 - (abs(user_edu - persona_tech) * 0.5 + abs(user_tech - persona_edu) * 0.5)
-
-                                score_a = score_a * weight_a_sim if algo_a_mode == "similarity" else score_a * weight_a_comp
-
-                                # Algoritma B
-                                if algo_b_mode == "similarity":
-                                    score_b = 1 - (abs(user_edu - persona_edu) * 0.5 + abs(user_tech - persona_tech) * 0.5)
-                                else:  # complementary
-                                    score_b = 1 - (abs(user_edu - persona_tech) * 0.5 + abs(user_tech - persona_edu) * 0.5)
+            # Büyük kohortlar: RecommendationEngine ile çok çekirdekli tam matching
+            st.markdown("---")
+            with st.expander("⚡ Çok Çekirdekli Toplu Eşleştirme (RecommendationEngine)"):
+                st.caption("SyntheticUserGenerator kohortu shard'lara bölünür, her çekirdek kendi "
+                           "engine'i ile skorlar ve data/matching_shards/ altına yazar")
+
+                shard_col1, shard_col2 = st.columns(2)
+                with shard_col1:
+                    shard_n_per_stratum = st.number_input(
+                        "Her seviye-domain grubu için kişi", min_value=10, max_value=100_000,
+                        value=1_000, step=1_000, key="shard_n_per_stratum"
+                    )
+                    st.caption(f"Toplam: {shard_n_per_stratum * 10:,} kullanıcı")
+                with shard_col2:
+                    shard_workers = st.slider("Worker sayısı", 1, os.cpu_count() or 1,
+                                              os.cpu_count() or 1, key="shard_workers")
+                    shard_task_complexity = st.slider("Görev karmaşıklığı", 0.0, 1.0, 0.5,
+                                                      key="shard_task_complexity")
+
+                if st.button("🚀 Toplu Eşleştirmeyi Başlat", key="run_sharded_matching"):
+                    cohort = SyntheticUserGenerator(seed=42).generate_columns(
+                        n_per_stratum=int(shard_n_per_stratum)
+                    )
+                    shard_progress = st.progress(0.0)
+                    shard_status = st.empty()
+
+                    def show_shard_progress(progress):
+                        shard_progress.progress(progress['done_users'] / max(progress['total_users'], 1))
+                        shard_status.caption(
+                            f"⏳ {progress['done_users']:,}/{progress['total_users']:,} kullanıcı · "
+                            f"{progress['finished_shards']}/{progress['total_shards']} shard"
+                        )
 
-                                score_b = score_b * weight_b_sim if algo_b_mode == "similarity" else score_b * weight_b_comp
+                    runner = ShardedMatchingRunner(workers=shard_workers,
+                                                   task_complexity=shard_task_complexity)
+                    st.session_state.sharded_matching = runner.run(
+                        cohort, output_dir='data/matching_shards', progress=show_shard_progress
+                    )
 
-                                persona_scores_a.append({"persona_id": persona.id, "score": score_a})
-                                persona_scores_b.append({"persona_id": persona.id, "score": score_b})
+                if st.session_state.get('sharded_matching'):
+                    sharded = st.session_state.sharded_matching
+                    analysis = sharded['analysis']
+                    st.success(f"✅ {sharded['rows_written']:,} matching, "
+                               f"{len(sharded['shard_files'])} shard, {sharded['elapsed']:.1f}s")
 
-                            # En iyi persona'ları bul
-                            persona_scores_a.sort(key=lambda x: x['score'], reverse=True)
-                            persona_scores_b.sort(key=lambda x: x['score'], reverse=True)
+                    shard_col1, shard_col2 = st.columns(2)
+                    with shard_col1:
+                        st.metric("Similarity Ort.", f"{analysis['similarity_mode']['mean_score']:.3f}",
+                                  f"SD {analysis['similarity_mode']['std']:.3f}", delta_color="off")
+                    with shard_col2:
+                        st.metric("Complementary Ort.", f"{analysis['complementary_mode']['mean_score']:.3f}",
+                                  f"SD {analysis['complementary_mode']['std']:.3f}", delta_color="off")
 
-                            results_a.append({
-                                "user_id": user['user_id'],
-                                "top_persona": persona_scores_a[0]['persona_id'],
-                                "top_score": persona_scores_a[0]['score']
-                            })
+        # ========== Matching Algorithm Tester ==========
+        with sim_tab3:
+            st.markdown("### 📊 Matching Algorithm Tester")
+            st.markdown("İki RecommendationEngine konfigürasyonunu tüm synthetic kohort üzerinde "
+                        "offline A/B testi ile karşılaştır")
 
-                            results_b.append({
-                                "user_id": user['user_id'],
-                                "top_persona": persona_scores_b[0]['persona_id'],
-                                "top_score": persona_scores_b[0]['score']
-                            })
+            st.markdown("#### ⚙️ A/B Test Ayarları")
 
-                        st.session_state.ab_test_results = {
-                            "algo_a": results_a,
-                            "algo_b": results_b,
-                            "params_a": {"mode": algo_a_mode, "w_sim": weight_a_sim, "w_comp": weight_a_comp},
-                            "params_b": {"mode": algo_b_mode, "w_sim": weight_b_sim, "w_comp": weight_b_comp}
-                        }
+            col1, col2 = st.columns(2)
 
-                        st.success("✅ A/B test tamamlandı!")
+            with col1:
+                st.markdown("**Algoritma A:**")
+                algo_a_mode = st.selectbox("Mod A", list(SCORING_MODES), key="algo_a")
+                weight_a_sim = st.slider("Benzerlik Ağırlığı A (α)", 0.0, 1.0, 0.7, key="w_a_sim")
+                weight_a_comp = st.slider("Tamamlayıcılık Ağırlığı A (β)", 0.0, 1.0, 0.3, key="w_a_comp")
+                task_complexity_a = st.slider("Görev Karmaşıklığı A", 0.0, 1.0, 0.5, key="tc_a")
 
-                # Sonuçları göster
-                if 'ab_test_results' in st.session_state:
-                    st.markdown("---")
-                    st.markdown("#### 📊 A/B Test Sonuçları")
+            with col2:
+                st.markdown("**Algoritma B:**")
+                algo_b_mode = st.selectbox("Mod B", list(SCORING_MODES), index=1, key="algo_b")
+                weight_b_sim = st.slider("Benzerlik Ağırlığı B (α)", 0.0, 1.0, 0.3, key="w_b_sim")
+                weight_b_comp = st.slider("Tamamlayıcılık Ağırlığı B (β)", 0.0, 1.0, 0.7, key="w_b_comp")
+                task_complexity_b = st.slider("Görev Karmaşıklığı B", 0.0, 1.0, 0.5, key="tc_b")
 
-                    results = st.session_state.ab_test_results
+            st.caption("γ ve δ engine'in değerleridir; her kolun (α, β, γ, δ) vektörü toplamı "
+                       "1 olacak şekilde normalize edilir.")
 
-                    col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
+            with col1:
+                ab_n_per_stratum = st.number_input(
+                    "Her seviye-domain grubu için kişi", min_value=10, max_value=100_000,
+                    value=1_000, step=1_000, key="ab_n_per_stratum"
+                )
+                st.caption(f"Toplam: {ab_n_per_stratum * 10:,} kullanıcı")
+            with col2:
+                ab_top_k = st.slider("Top-k", 1, 5, 3, key="ab_top_k")
 
-                    with col1:
-                        st.markdown("**Algoritma A Sonuçları:**")
-                        st.json(results['params_a'])
+            if st.button("🧪 A/B Test Başlat", type="primary"):
+                with st.spinner("⏳ A/B test çalışıyor..."):
+                    cohort = SyntheticUserGenerator(seed=42).generate_columns(
+                        n_per_stratum=int(ab_n_per_stratum)
+                    )
+                    arm_a = ABArm("A", mode=algo_a_mode, alpha=weight_a_sim, beta=weight_a_comp,
+                                  task_complexity=task_complexity_a)
+                    arm_b = ABArm("B", mode=algo_b_mode, alpha=weight_b_sim, beta=weight_b_comp,
+                                  task_complexity=task_complexity_b)
 
-                        avg_score_a = np.mean([r['top_score'] for r in results['algo_a']])
-                        st.metric("Ortalama Top-1 Skor", f"{avg_score_a:.3f}")
+                    st.session_state.ab_test_results = ABTestEngine().run(
+                        cohort, arm_a, arm_b, top_k=ab_top_k
+                    )
 
-                        # Persona dağılımı
-                        persona_counts_a = {}
-                        for r in results['algo_a']:
-                            pid = r['top_persona']
-                            persona_counts_a[pid] = persona_counts_a.get(pid, 0) + 1
+                    st.success("✅ A/B test tamamlandı!")
 
-                        st.markdown("**Top-1 Persona Dağılımı:**")
-                        for pid, count in sorted(persona_counts_a.items(), key=lambda x: x[1], reverse=True)[:5]:
-                            persona = next(p for p in get_all_personas() if p.id == pid)
-                            st.markdown(f"- {persona.avatar} {persona.name}: {count}")
+            # Sonuçları göster
+            if st.session_state.get('ab_test_results') is not None:
+                st.markdown("---")
+                st.markdown("#### 📊 A/B Test Sonuçları")
 
-                    with col2:
-                        st.markdown("**Algoritma B Sonuçları:**")
-                        st.json(results['params_b'])
+                results = st.session_state.ab_test_results
+                summary = results.summary()
+                personas_by_id = {p.id: p for p in get_all_personas()}
 
-                        avg_score_b = np.mean([r['top_score'] for r in results['algo_b']])
-                        st.metric("Ortalama Top-1 Skor", f"{avg_score_b:.3f}")
+                col1, col2 = st.columns(2)
 
-                        # Persona dağılımı
-                        persona_counts_b = {}
-                        for r in results['algo_b']:
-                            pid = r['top_persona']
-                            persona_counts_b[pid] = persona_counts_b.get(pid, 0) + 1
+                for column, arm in ((col1, "a"), (col2, "b")):
+                    with column:
+                        st.markdown(f"**Algoritma {arm.upper()} Sonuçları:**")
+                        st.json(summary[f"arm_{arm}"])
 
                         st.markdown("**Top-1 Persona Dağılımı:**")
-                        for pid, count in sorted(persona_counts_b.items(), key=lambda x: x[1], reverse=True)[:5]:
-                            persona = next(p for p in get_all_personas() if p.id == pid)
-                            st.markdown(f"- {persona.avatar} {persona.name}: {count}")
-
-                    # Karşılaştırma
-                    st.markdown("---")
-                    st.markdown("#### 🏆 Kazanan Algoritma")
-
-                    if avg_score_a > avg_score_b:
-                        st.success(f"✅ Algoritma A kazandı! (Skor farkı: +{avg_score_a - avg_score_b:.3f})")
-                    elif avg_score_b > avg_score_a:
-                        st.success(f"✅ Algoritma B kazandı! (Skor farkı: +{avg_score_b - avg_score_a:.3f})")
-                    else:
-                        st.info("🤝 Algoritmalar eşit performans gösterdi")
-
-                    # Skor dağılımı karşılaştırması
-                    df_comparison = pd.DataFrame({
-                        "Algoritma A": [r['top_score'] for r in results['algo_a']],
-                        "Algoritma B": [r['top_score'] for r in results['algo_b']]
-                    })
-
-                    fig = go.Figure()
-                    fig.add_trace(go.Box(y=df_comparison["Algoritma A"], name="Algoritma A"))
-                    fig.add_trace(go.Box(y=df_comparison["Algoritma B"], name="Algoritma B"))
-                    fig.update_layout(title="Skor Dağılımı Karşılaştırması", yaxis_title="Match Skoru")
-                    st.plotly_chart(fig, use_container_width=True)
+                        for pid, count in list(results.top1_distribution(arm).items())[:5]:
+                            persona = personas_by_id[pid]
+                            st.markdown(f"- {persona.avatar} {persona.name}: {count:,}")
 
+                # Karşılaştırma
+                st.markdown("---")
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Kullanıcı", f"{summary['n_users']:,}")
+                with col2:
+                    st.metric(f"Top-{results.top_k} Kesişim",
+                              f"{summary[f'mean_top{results.top_k}_overlap']:.3f}")
+                with col3:
+                    st.metric("Spearman ρ", f"{summary['mean_rank_correlation']:.3f}")
+                with col4:
+                    st.metric("Top-1 Uyum", f"{summary['top1_agreement']:.1%}")
+
+                # Kolların kendi skorları farklı ölçeklerde: ortak bir sonuç
+                # (gözlenen puanlar) olmadan kazanan ilan edilmez
+                st.info("ℹ️ Kolların skorları kendi ölçeklerindedir; gözlenen sonuç verisi olmadan "
+                        "kazanan belirlenmez. Yukarıdaki metrikler iki algoritmanın önerilerinin "
+                        "ne kadar örtüştüğünü gösterir.")
+
+                # Kullanıcı başına sıralama uyumu (büyük kohortlarda örneklem)
+                plot_index = np.random.default_rng(0).permutation(len(results))[:5_000]
+                fig = go.Figure()
+                fig.add_trace(go.Histogram(x=results.rank_correlation[plot_index], nbinsx=40))
+                fig.update_layout(title="Kullanıcı Başına Spearman ρ Dağılımı",
+                                  xaxis_title="Spearman ρ (A vs B)", yaxis_title="Kullanıcı")
+                st.plotly_chart(fig, use_container_width=True)
 
 if __name__ == "__main__":
     main()
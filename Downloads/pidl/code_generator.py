@@ -4,7 +4,7 @@ Kod Üretim Motoru - LLM entegrasyonu ile persona'lar için kod üretimi
 
 import os
 import asyncio
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from dotenv import load_dotenv
 import openai
 
@@ -384,6 +384,33 @@ Sadece Python kodunu yaz, başka açıklama ekleme. Kod blokları olmadan direkt
         results = await asyncio.gather(*tasks)
         
         return list(results)
+
+    async def generate_codes_as_completed(self, task: str,
+                                          personas: Optional[List[Persona]] = None
+                                          ) -> AsyncIterator[Dict]:
+        """
+        Paralel kod üretimi, sonuçlar tamamlanma sırasıyla
+
+        generate_codes_parallel gibi tüm persona'lar için aynı anda istek
+        atılır; ancak en yavaş yanıt beklenmeden her sonuç hazır olduğunda
+        döner (ör. CodeEvaluator.evaluate_stream ile hemen değerlendirilir).
+
+        Args:
+            task: Kod yazılacak görev
+            personas: Persona listesi (None ise tüm persona'lar)
+
+        Returns:
+            Sonuç dictionary'lerini üreten async iterator
+        """
+        if personas is None:
+            personas = self.personas
+
+        tasks = [
+            self.generate_code_async(persona, task)
+            for persona in personas
+        ]
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
     
     def generate_codes(self, task: str, personas: Optional[List[Persona]] = None) -> List[Dict]:
         """
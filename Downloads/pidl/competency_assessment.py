@@ -35,6 +35,21 @@ class CompetencyProfile:
     recommended_personas_similarity: List[str]  # Benzerlik bazlı
     recommended_personas_complementary: List[str]  # Tamamlayıcı bazlı
 
+    def engine_profile(self) -> Dict:
+        """
+        RecommendationEngine.create_user_vector'ın okuduğu profil dict'i
+
+        create_user_vector yalnızca score / level / domain / responses
+        anahtarlarını okur; diğer anahtarlar sessizce varsayılana düşer
+        (skor 0, novice, technical).
+        """
+        return {
+            "score": self.overall_score,
+            "level": self.technical_level,
+            "domain": self.dominant_domain,
+            "responses": self.responses
+        }
+
 
 class CompetencyAssessment:
     """Yetkinlik değerlendirme sistemi"""
@@ -166,9 +181,18 @@ class CompetencyAssessment:
         }
     ]
     
-    def __init__(self):
-        """Assessment sistemini başlat"""
-        self.rec_engine = RecommendationEngine() if RECOMMENDATION_ENGINE_AVAILABLE else None
+    def __init__(self, rec_engine=None):
+        """
+        Assessment sistemini başlat
+
+        Args:
+            rec_engine: Paylaşılan RecommendationEngine (ör. tablo bağlanmış);
+                None ise yeni engine oluşturulur
+        """
+        if rec_engine is not None:
+            self.rec_engine = rec_engine
+        else:
+            self.rec_engine = RecommendationEngine() if RECOMMENDATION_ENGINE_AVAILABLE else None
     
     def _recommend_with_math_engine(self, competency_profile: Dict) -> List[Dict]:
         """
@@ -189,24 +213,25 @@ class CompetencyAssessment:
         # Task complexity tahmin et (orta seviye varsayalım)
         task_complexity = 0.5
         
-        # Persona'ları rank'le
-        rankings = self.rec_engine.rank_personas(
+        # Persona'ları rank'le (bileşenler, mod ve ağırlıklarla birlikte)
+        ranking_result = self.rec_engine.ranking_result(
             user_vector, 
             task_complexity=task_complexity,
             top_k=5
         )
         
+        # Açıklamalar tek geçişte, yeniden skorlama yapılmadan
+        explanations = self.rec_engine.explain_recommendations(ranking_result)
+        weights = ranking_result.weights
+        
         # Formata dönüştür
         recommendations = []
-        for idx, ranking in enumerate(rankings, 1):
+        for idx, (ranking, explanation) in enumerate(zip(ranking_result.entries, explanations), 1):
             persona_id = ranking["persona_id"]
             score = ranking["score"]
             components = ranking["components"]
             ci = ranking["confidence_interval"]
             
-            # Açıklama üret
-            explanation = self.rec_engine.explain_recommendation(user_vector, persona_id)
-            
             # Matematiksel detaylar ekle
             math_details = f"""
 **Matematiksel Skor Detayları:**
@@ -217,7 +242,7 @@ class CompetencyAssessment:
 - Öğrenme Yörüngesi (L): {components['learning_trajectory']:.3f}
 - 95% CI: [{ci['lower']:.3f}, {ci['upper']:.3f}]
 
-Formül: R = {self.rec_engine.alpha}·S + {self.rec_engine.beta}·C + {self.rec_engine.gamma}·P + {self.rec_engine.delta}·L
+Formül: R = {weights['alpha']}·S + {weights['beta']}·C + {weights['gamma']}·P + {weights['delta']}·L
 """
             
             recommendations.append({
@@ -0,0 +1,235 @@
+"""
+İçerik Adresli Değerlendirme Cache'i (Content-Addressed Evaluation Cache)
+
+Aynı kod sık sık yeniden değerlendirilir (tekrar çalıştırmalar, düşük
+temperature replikasyonları, dashboard yenilemeleri). Cache anahtarı:
+
+    SHA-256(kod, evaluator sürümü, bandit/pylint/radon sürümleri, skor ağırlıkları)
+
+Sonuç dict'i JSON olarak yerel bir SQLite dosyasında saklanır; toplam boyut
+sınırı aşılınca en uzun süredir kullanılmayan (LRU) kayıtlar silinir. Sık
+kullanılan kayıtlar bellekte de tutulur, böylece isabet (hit) mikrosaniyeler
+sürer; bellek isabetlerinin erişim zamanları SQLite'a toplu yazılır
+(eviction öncesinde, kapanışta ve biriktikçe).
+
+Araç sürümü veya ağırlıklar değişince ortam fingerprint'i değişir: anahtarlar
+zaten farklı olduğundan eski kayıtlar asla dönmez ve açılışta silinir.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from importlib import metadata
+from typing import Dict, Optional
+
+
+CACHE_TOOLS = ("bandit", "pylint", "radon")
+
+
+def tool_versions() -> Dict[str, str]:
+    """Kurulu analiz araçlarının sürümleri (kurulu değilse "missing")"""
+    versions = {}
+    for tool in CACHE_TOOLS:
+        try:
+            versions[tool] = metadata.version(tool)
+        except metadata.PackageNotFoundError:
+            versions[tool] = "missing"
+    return versions
+
+
+def environment_fingerprint(evaluator_version: str, scoring: Dict) -> str:
+    """
+    Evaluator sürümü, araç sürümleri ve skor ağırlıklarının özeti (SHA-256)
+
+    Args:
+        evaluator_version: Değerlendirme mantığının sürümü
+        scoring: Skoru etkileyen ağırlıklar (JSON'a çevrilebilir)
+    """
+    payload = json.dumps({
+        "evaluator": evaluator_version,
+        "tools": tool_versions(),
+        "scoring": scoring
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """SQLite + bellek içi LRU değerlendirme cache'i"""
+
+    def __init__(self, fingerprint: str, filepath: str = 'data/evaluation_cache.sqlite',
+                 max_bytes: int = 64 * 1024 * 1024, memory_entries: int = 512):
+        """
+        Args:
+            fingerprint: Ortam fingerprint'i (environment_fingerprint)
+            filepath: SQLite dosyası (":memory:" = yalnızca process ömrü)
+            max_bytes: Saklanan JSON'ların toplam boyut sınırı (LRU eviction)
+            memory_entries: Bellekte tutulan kayıt sayısı
+        """
+        self.fingerprint = fingerprint
+        self.filepath = filepath
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        # Bellek isabetlerinin SQLite'a henüz yazılmamış erişim zamanları
+        self._touched = {}
+        self._lock = threading.Lock()
+
+        if filepath != ":memory:" and os.path.dirname(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self._db = sqlite3.connect(filepath, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            " key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, result TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS evaluations_lru ON evaluations(last_access)")
+        # Araç sürümü / ağırlık değişmiş: eski kayıtlar geçersiz
+        self._db.execute("DELETE FROM evaluations WHERE fingerprint != ?", (fingerprint,))
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM evaluations"
+        ).fetchone()[0]
+
+    def key(self, code: str) -> str:
+        """Kodun içerik adresi: SHA-256(fingerprint, kod)"""
+        digest = hashlib.sha256(self.fingerprint.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(code.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, code: str) -> Optional[Dict]:
+        """
+        Cache'teki sonuç (her çağrıda bağımsız kopya) veya None
+
+        Bellek isabetinde SQLite'a dokunulmaz; disk isabetinde kayıt belleğe
+        alınır ve LRU zamanı güncellenir.
+        """
+        key = self.key(code)
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self._touched[key] = time.time()
+                if len(self._touched) >= self.memory_entries:
+                    self._flush_touched()
+            else:
+                row = self._db.execute(
+                    "SELECT result FROM evaluations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                payload = row[0]
+                self._db.execute("UPDATE evaluations SET last_access = ? WHERE key = ?",
+                                 (time.time(), key))
+                self._remember(key, payload)
+            self.hits += 1
+        return json.loads(payload)
+
+    def put(self, code: str, result: Dict):
+        """Sonucu sakla (gerekirse LRU kayıtları sil)"""
+        key = self.key(code)
+        payload = json.dumps(result, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT size FROM evaluations WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO evaluations (key, fingerprint, result, size, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, self.fingerprint, payload, size, time.time())
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._remember(key, payload)
+            self._evict()
+
+    def _remember(self, key: str, payload: str):
+        """Bellek LRU'suna ekle"""
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self):
+        """Bellek isabetlerinin erişim zamanlarını SQLite'a toplu yaz"""
+        if self._touched:
+            self._db.executemany("UPDATE evaluations SET last_access = ? WHERE key = ?",
+                                 [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+
+    def _evict(self):
+        """Toplam boyut sınırın altına inene kadar en eski kayıtları sil"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        # LRU sırası bellek isabetlerini de içermeli
+        self._flush_touched()
+        excess = self._total_bytes - self.max_bytes
+        removed, freed = [], 0
+        for key, size in self._db.execute(
+                "SELECT key, size FROM evaluations ORDER BY last_access"):
+            removed.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM evaluations WHERE key = ?", [(key,) for key in removed])
+        for key in removed:
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+        self._total_bytes -= freed
+        self.evictions += len(removed)
+
+    def clear(self):
+        """Tüm kayıtları sil"""
+        with self._lock:
+            self._db.execute("DELETE FROM evaluations")
+            self._memory.clear()
+            self._touched.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        """İsabet / kayıp sayaçları ve boyut"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "memory_entries": len(self._memory),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+    def close(self):
+        """Bekleyen erişim zamanlarını yazıp SQLite bağlantısını kapat"""
+        with self._lock:
+            self._flush_touched()
+            self._db.close()
+
+
+# Test için
+if __name__ == "__main__":
+    cache = EvaluationCache(environment_fingerprint("test", {"weights": [0.3, 0.3, 0.2, 0.2]}),
+                            filepath=":memory:", max_bytes=256, memory_entries=2)
+
+    for index in range(10):
+        cache.put(f"print({index})", {"total_score": index, "metrics": {}, "issues": []})
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        cache.get("print(9)")
+    print(f"✅ Bellek isabeti: {(time.perf_counter() - start) / 10_000 * 1e6:.1f} µs")
+
+    print(f"  print(0) → {cache.get('print(0)')} (LRU ile silindi)")
+    print(f"  Araç sürümleri: {tool_versions()}")
+    print(f"  İstatistik: {cache.stats()}")
@@ -1,28 +1,350 @@
 """
 Performans Değerlendirme Sistemi
 Kodları güvenlik, kalite, performans ve karmaşıklık açısından değerlendirir
+
+Güvenlik analizi iki backend ile yapılabilir:
+- inprocess: Bandit'in Python API'si (BanditManager) bellekteki kaynak
+  üzerinde çalışır; config ve plugin test seti process başına bir kez yüklenir
+- subprocess: Her kod geçici dosyaya yazılıp `bandit -f json` ile taranır
+  (izolasyon gerektiğinde veya Bandit import edilemediğinde)
+
+AST ve Radon tabanlı metrikler kod başına bir kez kurulan AnalysisContext'i
+okur: kod bir kez parse edilir, ağaç bir kez dolaşılır, Radon sonuçları
+memoize edilir.
+
+Değerlendirme iki kademelidir (tier):
+- Tier 0: AST/Radon metrikleri, milisaniyeler içinde geçici (provisional)
+  total_score ile döner
+- Tier 1: Bandit + Pylint; complete_evaluation Tier 0 sonucunu yerinde
+  tamamlar. Sonucun "tier" / "provisional" alanları kod başına tamamlanma
+  durumudur
+
+evaluate_stream, kod üretimiyle boru hattı (pipeline) kurar: her üretilen kod
+geldiği anda process havuzuna gönderilir, (üretim, değerlendirme) çiftleri
+tamamlandıkça döner; provisional=True ile önce Tier 0 skorları akar.
 """
 
 import ast
+import asyncio
+import io
 import tempfile
 import os
+import signal
 import subprocess
 import json
-from typing import Dict, List, Optional
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from collections import deque
+from radon.metrics import h_visit_ast, mi_compute
 from radon.raw import analyze
+from radon.visitors import ComplexityVisitor
 import re
 
+from evaluation_cache import EvaluationCache, environment_fingerprint
+
+try:
+    from bandit.core import config as bandit_config
+    from bandit.core import constants as bandit_constants
+    from bandit.core import manager as bandit_manager
+    from bandit.core import meta_ast as bandit_meta_ast
+    from bandit.core import metrics as bandit_metrics
+    BANDIT_AVAILABLE = True
+except ImportError:
+    BANDIT_AVAILABLE = False
+
+
+SECURITY_BACKENDS = ("auto", "inprocess", "subprocess")
+# Bandit issue severity → skor cezası
+SECURITY_SEVERITY_WEIGHTS = {'HIGH': 20, 'MEDIUM': 10, 'LOW': 5}
+# Pylint mesaj tipi → skor cezası (bilinmeyen tipler 2)
+QUALITY_TYPE_WEIGHTS = {'error': 10, 'warning': 5, 'convention': 2, 'refactor': 3}
+# Kod başına Pylint süresi sınırı (saniye)
+QUALITY_TIMEOUT = 15
+# Değerlendirme mantığı değişince artırılır (cache anahtarının parçası)
+EVALUATOR_VERSION = "1.2"
+# Paralel değerlendirmede kod başına varsayılan süre sınırı (saniye)
+SNIPPET_DEADLINE = 30
+# Paralel değerlendirmede takılan worker'lar için ek bekleme payı (saniye)
+PARALLEL_GRACE_SECONDS = 5
+# total_score ağırlıkları ve skorun geldiği metrik
+SCORE_WEIGHTS = {"security_score": 0.30, "quality_score": 0.30,
+                 "complexity_score": 0.20, "maintainability_index": 0.20}
+SCORE_METRICS = {"security_score": "security", "quality_score": "quality",
+                 "complexity_score": "complexity", "maintainability_index": "maintainability"}
+# Değerlendirme kademeleri: 0 = AST/Radon (hızlı, geçici skor), 1 = + Bandit/Pylint (tam)
+FAST_TIER = 0
+FULL_TIER = 1
+# evaluate_all'un code generator sonucundan eklediği alanlar (cache'e yazılmaz)
+RESULT_METADATA_KEYS = ("persona_role", "category", "avatar", "tokens_used", "persona_prompt")
+
+
+class EvaluationTimeout(BaseException):
+    """
+    Kod başına süre sınırı aşıldı
+
+    BaseException'dan türer: metriklerdeki `except Exception` blokları onu
+    yutup değerlendirmeye devam etmez.
+    """
+
+
+@contextmanager
+def _deadline_alarm(seconds: Optional[float]):
+    """
+    Süre dolunca çalışan koda EvaluationTimeout fırlat (SIGALRM)
+
+    Sinyaller yalnızca ana thread'de ve POSIX'te kullanılabilir; aksi halde
+    süre yalnızca metrikler arasında kontrol edilir.
+    """
+    if (not seconds or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise EvaluationTimeout()
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _check_deadline(deadline_at: Optional[float]):
+    """Süre dolduysa EvaluationTimeout (süre içinde biten metrik yarım kalmış olabilir)"""
+    if deadline_at is not None and time.monotonic() >= deadline_at:
+        raise EvaluationTimeout()
+
+
+# İç içe geçme derinliğini artıran kontrol akışı node'ları
+CONTROL_FLOW_NODES = (ast.For, ast.While, ast.If, ast.With)
+
+
+class AnalysisContext:
+    """
+    Tek kodun paylaşılan analiz durumu
+
+    Kod bir kez parse edilir ve ağaç tek geçişte (ast.walk ile aynı BFS
+    sırası) node tipine göre indekslenir; maksimum iç içe geçme derinliği de
+    bu geçişte hesaplanır. Radon sonuçları (raw analyze, ComplexityVisitor,
+    Maintainability Index) ilk kullanımda hesaplanıp saklanır. Parse veya
+    analiz hatası saklanır ve ilgili erişimde yeniden fırlatılır; böylece
+    metriklerin hata durumundaki varsayılan skorları değişmez.
+    """
+
+    def __init__(self, code: str):
+        """
+        Args:
+            code: Analiz edilecek kod
+        """
+        self.code = code
+        self.lines = code.split('\n')
+        self.code_lower = code.lower()
+        self._memo = {}
+        self._nodes = {}
+        self.max_nesting_depth = 0
+        try:
+            self._tree = ast.parse(code)
+            self.parse_error = None
+        except Exception as e:
+            self._tree = None
+            self.parse_error = e
+            return
+
+        queue = deque([(self._tree, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            self._nodes.setdefault(type(node), []).append(node)
+            self.max_nesting_depth = max(self.max_nesting_depth, depth)
+            if isinstance(node, CONTROL_FLOW_NODES):
+                depth += 1
+            queue.extend((child, depth) for child in ast.iter_child_nodes(node))
+
+    @property
+    def tree(self) -> ast.AST:
+        """Parse edilmiş ağaç (parse başarısızsa hatayı fırlatır)"""
+        if self.parse_error is not None:
+            raise self.parse_error
+        return self._tree
+
+    def nodes(self, *node_types: type) -> List[ast.AST]:
+        """Verilen tiplerdeki node'lar (ast.walk sırasıyla, tip sırasına göre gruplu)"""
+        if self.parse_error is not None:
+            raise self.parse_error
+        return [node for node_type in node_types for node in self._nodes.get(node_type, [])]
+
+    @property
+    def functions(self) -> List[ast.FunctionDef]:
+        """Tüm FunctionDef node'ları (metotlar ve iç fonksiyonlar dahil)"""
+        return self.nodes(ast.FunctionDef)
+
+    @property
+    def names(self) -> List[str]:
+        """Tüm ast.Name kimlikleri (tekrarlarıyla)"""
+        return [node.id for node in self.nodes(ast.Name)]
+
+    def _cached(self, key, compute):
+        """compute() sonucunu veya fırlattığı hatayı bir kez hesaplayıp sakla"""
+        if key not in self._memo:
+            try:
+                self._memo[key] = (compute(), None)
+            except Exception as e:
+                self._memo[key] = (None, e)
+        value, error = self._memo[key]
+        if error is not None:
+            raise error
+        return value
+
+    @property
+    def raw(self):
+        """radon.raw.analyze sonucu"""
+        return self._cached("raw", lambda: analyze(self.code))
+
+    @property
+    def complexity_visitor(self) -> ComplexityVisitor:
+        """Ağaç üzerinde bir kez çalıştırılan Radon ComplexityVisitor"""
+        return self._cached("complexity", lambda: ComplexityVisitor.from_ast(self.tree))
+
+    @property
+    def complexity_blocks(self) -> List:
+        """radon cc_visit(code) ile aynı bloklar"""
+        return self.complexity_visitor.blocks
+
+    def maintainability_index(self, multi: bool) -> float:
+        """radon mi_visit(code, multi) ile aynı değer, paylaşılan ağaç ve raw metriklerle"""
+        def compute():
+            tree = self.tree
+            raw = self.raw
+            comment_lines = raw.comments + (raw.multi if multi else 0)
+            comments = comment_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+            return mi_compute(
+                self._cached("halstead", lambda: h_visit_ast(tree)).total.volume,
+                self.complexity_visitor.total_complexity,
+                raw.lloc,
+                comments
+            )
+        return self._cached(("mi", multi), compute)
+
+
+class InProcessBanditScanner:
+    """
+    Bandit'i process içinde, bellekteki kaynak üzerinde çalıştırır
+
+    BanditManager (config + plugin test seti) bir kez kurulur; her tarama
+    yalnızca sonuç/metrik durumunu sıfırlar. Manager durumlu olduğu için
+    taramalar lock ile sıralanır.
+    """
+
+    SNIPPET_NAME = "./snippet.py"
+
+    def __init__(self):
+        self._manager = bandit_manager.BanditManager(bandit_config.BanditConfig(), "file",
+                                                     quiet=True)
+        self._lock = threading.Lock()
+
+    def scan(self, code: str) -> List[Dict]:
+        """
+        Kodu tara
+
+        Returns:
+            `bandit -f json` çıktısındaki "results" ile aynı formatta issue listesi
+        """
+        with self._lock:
+            manager = self._manager
+            manager.results = []
+            manager.scores = []
+            manager.skipped = []
+            manager.metrics = bandit_metrics.Metrics()
+            manager.b_ma = bandit_meta_ast.BanditMetaAst()
+            manager.files_list = [self.SNIPPET_NAME]
+            manager._parse_file(self.SNIPPET_NAME, io.BytesIO(code.encode("utf-8")),
+                                list(manager.files_list))
+            # CLI varsayılanı: tüm severity / confidence seviyeleri
+            issues = manager.get_issue_list(sev_level=bandit_constants.LOW,
+                                            conf_level=bandit_constants.LOW)
+            return [issue.as_dict(with_code=False) for issue in issues]
+
+
+_BANDIT_SCANNER = None
+_BANDIT_SCANNER_LOCK = threading.Lock()
+
+
+def get_bandit_scanner() -> InProcessBanditScanner:
+    """Process başına paylaşılan tarayıcı (plugin'ler bir kez yüklenir)"""
+    global _BANDIT_SCANNER
+    if _BANDIT_SCANNER is None:
+        with _BANDIT_SCANNER_LOCK:
+            if _BANDIT_SCANNER is None:
+                _BANDIT_SCANNER = InProcessBanditScanner()
+    return _BANDIT_SCANNER
+
+
+def evaluation_fingerprint() -> str:
+    """Evaluator sürümü + araç sürümleri + skor ağırlıkları (cache geçerliliği)"""
+    return environment_fingerprint(EVALUATOR_VERSION, {
+        "total": SCORE_WEIGHTS,
+        "security": SECURITY_SEVERITY_WEIGHTS,
+        "quality": QUALITY_TYPE_WEIGHTS
+    })
+
+
+# Worker process başına paylaşılan evaluator (Bandit plugin'leri bir kez yüklenir)
+_WORKER_EVALUATOR = None
+
+
+def _evaluate_in_worker(code: str, persona_id: str, persona_name: str,
+                        quality_results: Optional[Dict], deadline: Optional[float],
+                        security_backend: str) -> Dict:
+    """ProcessPoolExecutor görevi: tek kodu worker'ın evaluator'ı ile değerlendir"""
+    global _WORKER_EVALUATOR
+    if _WORKER_EVALUATOR is None or _WORKER_EVALUATOR.security_backend != security_backend:
+        _WORKER_EVALUATOR = CodeEvaluator(security_backend=security_backend)
+    return _WORKER_EVALUATOR.evaluate_code(code, persona_id, persona_name,
+                                           quality_results=quality_results, deadline=deadline)
+
+
+def _complete_in_worker(evaluation: Dict, deadline: Optional[float],
+                        security_backend: str) -> Dict:
+    """ProcessPoolExecutor görevi: Tier 0 sonucunu worker'da Bandit + Pylint ile tamamla"""
+    global _WORKER_EVALUATOR
+    if _WORKER_EVALUATOR is None or _WORKER_EVALUATOR.security_backend != security_backend:
+        _WORKER_EVALUATOR = CodeEvaluator(security_backend=security_backend)
+    return _WORKER_EVALUATOR.complete_evaluation(evaluation, deadline=deadline)
+
 
 class CodeEvaluator:
     """Kod değerlendirme sınıfı"""
     
-    def __init__(self):
-        """Evaluator başlat"""
+    def __init__(self, security_backend: str = "auto",
+                 cache: Union[bool, EvaluationCache, None] = None):
+        """
+        Evaluator başlat
+
+        Args:
+            security_backend: "auto" (Bandit import edilebiliyorsa inprocess),
+                "inprocess" veya "subprocess"
+            cache: EvaluationCache, True (data/evaluation_cache.sqlite) veya
+                None (cache yok)
+        """
+        if security_backend not in SECURITY_BACKENDS:
+            raise ValueError(f"Geçersiz security backend: {security_backend}. "
+                             f"{SECURITY_BACKENDS} olmalı.")
+        if security_backend == "auto":
+            security_backend = "inprocess" if BANDIT_AVAILABLE else "subprocess"
+        elif security_backend == "inprocess" and not BANDIT_AVAILABLE:
+            raise ImportError("inprocess backend için bandit paketi gerekli")
+        self.security_backend = security_backend
+        self.cache = EvaluationCache(evaluation_fingerprint()) if cache is True else (cache or None)
         self.metrics = {}
     
-    def evaluate_code(self, code: str, persona_id: str, persona_name: str) -> Dict:
+    def evaluate_code(self, code: str, persona_id: str, persona_name: str,
+                      quality_results: Optional[Dict] = None,
+                      deadline: Optional[float] = None, tier: int = FULL_TIER) -> Dict:
         """
         Tek bir kodu değerlendir
         
@@ -30,58 +352,97 @@ class CodeEvaluator:
             code: Değerlendirilecek kod
             persona_id: Persona ID
             persona_name: Persona adı
+            quality_results: Önceden hesaplanmış Pylint sonucu (toplu analiz);
+                None ise Pylint bu kod için çalıştırılır
+            deadline: Saniye cinsinden süre sınırı (None = sınırsız). Aşılırsa
+                tamamlanan metriklerle kısmi sonuç döner ("partial": True)
+            tier: FULL_TIER (tüm metrikler) veya FAST_TIER (yalnızca AST/Radon;
+                "provisional": True, tamamlamak için complete_evaluation)
             
         Returns:
-            Değerlendirme sonuçları
+            Değerlendirme sonuçları ("tier": tamamlanan kademe)
         """
-        results = {
-            "persona_id": persona_id,
-            "persona_name": persona_name,
-            "code": code,
-            "security_score": 0,
-            "quality_score": 0,
-            "complexity_score": 0,
-            "maintainability_index": 0,
-            "total_score": 0,
-            "metrics": {},
-            "issues": []
-        }
+        cached = self._cached_result(code, persona_id, persona_name)
+        if cached is not None:
+            return cached
+        return self._store_result(
+            self._evaluate(code, persona_id, persona_name, quality_results, deadline, tier)
+        )
+
+    def _cached_result(self, code: str, persona_id: str, persona_name: str) -> Optional[Dict]:
+        """Cache isabetinde sonucun bu persona için kopyası, aksi halde None"""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(code)
+        if cached is not None:
+            cached.update({"persona_id": persona_id, "persona_name": persona_name, "cached": True})
+        return cached
+
+    def _store_result(self, results: Dict) -> Dict:
+        """
+        Tam ve deterministik sonuçları cache'e yaz
+
+        Kısmi (süre aşımı) ve geçici (Tier 0) sonuçlar ile araç hatası
+        içerenler (severity'siz issue: Timeout, exception, değerlendirme hatası)
+        saklanmaz. Generator metadata'sı saklanmaz.
+        """
+        if (self.cache is not None and not results.get("partial")
+                and not results.get("provisional")
+                and all("severity" in issue for issue in results["issues"])):
+            self.cache.put(results["code"], {key: value for key, value in results.items()
+                                             if key not in RESULT_METADATA_KEYS})
+        return results
+
+    def _evaluate(self, code: str, persona_id: str, persona_name: str,
+                  quality_results: Optional[Dict] = None,
+                  deadline: Optional[float] = None, tier: int = FULL_TIER) -> Dict:
+        """evaluate_code'un cache'siz gövdesi"""
+        results = self._empty_result(code, persona_id, persona_name)
+        if tier == FAST_TIER:
+            # Süre aşımı / hata olsa da Tier 1 ile tamamlanmayı bekler
+            results["tier"] = FAST_TIER
+            results["provisional"] = True
+        deadline_at = time.monotonic() + deadline if deadline else None
         
         try:
-            # 1. Güvenlik Analizi (Bandit)
-            security_results = self._run_security_analysis(code)
-            results["security_score"] = security_results["score"]
-            results["metrics"]["security"] = security_results
-            results["issues"].extend(security_results.get("issues", []))
+            # Önce process içi hızlı metrikler: süre aşılırsa elde kalan bunlardır
+            with _deadline_alarm(deadline):
+                context = AnalysisContext(code)
+
+                # 1. Karmaşıklık Analizi (Radon)
+                complexity_results = self._analyze_complexity(context)
+                _check_deadline(deadline_at)
+                results["complexity_score"] = complexity_results["score"]
+                results["metrics"]["complexity"] = complexity_results
+                
+                # 2. Maintainability Index (Radon)
+                mi_results = self._analyze_maintainability(context)
+                _check_deadline(deadline_at)
+                results["maintainability_index"] = mi_results["index"]
+                results["metrics"]["maintainability"] = mi_results
+                
+                # 3. Genel Metrikler
+                general_metrics = self._analyze_general_metrics(context)
+                _check_deadline(deadline_at)
+                results["metrics"]["general"] = general_metrics
+
+                if tier == FAST_TIER:
+                    # Tier 0: araçlar çalıştırılmadan geçici skor
+                    results["total_score"] = self._partial_total_score(results)
+                    return results
+
+                self._run_tool_tier(results, quality_results, deadline_at)
             
-            # 2. Kod Kalitesi Analizi (Pylint)
-            quality_results = self._run_quality_analysis(code)
-            results["quality_score"] = quality_results["score"]
-            results["metrics"]["quality"] = quality_results
-            results["issues"].extend(quality_results.get("issues", []))
-            
-            # 3. Karmaşıklık Analizi (Radon)
-            complexity_results = self._analyze_complexity(code)
-            results["complexity_score"] = complexity_results["score"]
-            results["metrics"]["complexity"] = complexity_results
-            
-            # 4. Maintainability Index (Radon)
-            mi_results = self._analyze_maintainability(code)
-            results["maintainability_index"] = mi_results["index"]
-            results["metrics"]["maintainability"] = mi_results
-            
-            # 5. Genel Metrikler
-            general_metrics = self._analyze_general_metrics(code)
-            results["metrics"]["general"] = general_metrics
-            
-            # Toplam skor hesapla (ağırlıklı ortalama)
-            results["total_score"] = (
-                results["security_score"] * 0.30 +
-                results["quality_score"] * 0.30 +
-                results["complexity_score"] * 0.20 +
-                (results["maintainability_index"] / 100) * 100 * 0.20
-            )
+            self._set_total_score(results)
             
+        except EvaluationTimeout:
+            # Kısmi sonuç: tamamlanan metriklerin ağırlıkları yeniden normalize edilir
+            results["partial"] = True
+            results["total_score"] = self._partial_total_score(results)
+            results["issues"].append({
+                "type": "timeout",
+                "message": f"Değerlendirme süresi aşıldı ({deadline}s), kısmi metrikler"
+            })
         except Exception as e:
             results["issues"].append({
                 "type": "error",
@@ -89,9 +450,131 @@ class CodeEvaluator:
             })
         
         return results
+
+    def _run_tool_tier(self, results: Dict, quality_results: Optional[Dict] = None,
+                       deadline_at: Optional[float] = None):
+        """Tier 1: Bandit ve Pylint metriklerini sonuca ekle"""
+        code = results["code"]
+
+        # 4. Güvenlik Analizi (Bandit)
+        security_results = self._run_security_analysis(code)
+        _check_deadline(deadline_at)
+        results["security_score"] = security_results["score"]
+        results["metrics"]["security"] = security_results
+        results["issues"].extend(security_results.get("issues", []))
+        
+        # 5. Kod Kalitesi Analizi (Pylint)
+        if quality_results is None:
+            quality_results = self._run_quality_analysis(code)
+        _check_deadline(deadline_at)
+        results["quality_score"] = quality_results["score"]
+        results["metrics"]["quality"] = quality_results
+        results["issues"].extend(quality_results.get("issues", []))
+
+    def _set_total_score(self, results: Dict):
+        """Toplam skor hesapla (SCORE_WEIGHTS ile ağırlıklı ortalama)"""
+        results["total_score"] = sum(results[score] * weight
+                                     for score, weight in SCORE_WEIGHTS.items())
+
+    def complete_evaluation(self, evaluation: Dict,
+                            quality_results: Optional[Dict] = None,
+                            deadline: Optional[float] = None) -> Dict:
+        """
+        Tier 0 sonucunu Bandit ve Pylint ile tamamla
+
+        Araçlar sonucun kopyası üzerinde çalışır; sonuç dict'i tek bir update
+        ile yerinde güncellenir, böylece başka thread'ler yarım sonuç görmez.
+        Tier 0'ı süre aşımıyla biten sonuç kısmi kalır (eksik metrikler
+        ağırlıklandırılmaz).
+
+        Args:
+            evaluation: evaluate_code(..., tier=FAST_TIER) sonucu
+            quality_results: Önceden hesaplanmış Pylint sonucu (toplu analiz)
+            deadline: Araçlar için süre sınırı (saniye, None = sınırsız)
+
+        Returns:
+            Güncellenen (aynı) sonuç dict'i
+        """
+        if evaluation.get("tier", FULL_TIER) >= FULL_TIER:
+            return evaluation
+        completed = dict(evaluation, metrics=dict(evaluation["metrics"]),
+                         issues=list(evaluation["issues"]), tier=FULL_TIER, provisional=False)
+        try:
+            with _deadline_alarm(deadline):
+                self._run_tool_tier(completed, quality_results,
+                                    time.monotonic() + deadline if deadline else None)
+            if completed.get("partial"):
+                completed["total_score"] = self._partial_total_score(completed)
+            else:
+                self._set_total_score(completed)
+        except EvaluationTimeout:
+            completed["partial"] = True
+            completed["total_score"] = self._partial_total_score(completed)
+            completed["issues"].append({
+                "type": "timeout",
+                "message": f"Değerlendirme süresi aşıldı ({deadline}s), kısmi metrikler"
+            })
+        except Exception as e:
+            completed["issues"].append({
+                "type": "error",
+                "message": f"Değerlendirme hatası: {str(e)}"
+            })
+        evaluation.update(completed)
+        return self._store_result(evaluation)
+
+    def _empty_result(self, code: str, persona_id: str, persona_name: str) -> Dict:
+        """Metrik içermeyen değerlendirme sonucu"""
+        return {
+            "persona_id": persona_id,
+            "persona_name": persona_name,
+            "code": code,
+            "security_score": 0,
+            "quality_score": 0,
+            "complexity_score": 0,
+            "maintainability_index": 0,
+            "total_score": 0,
+            "tier": FULL_TIER,
+            "provisional": False,
+            "metrics": {},
+            "issues": []
+        }
+
+    def _partial_total_score(self, results: Dict) -> float:
+        """Yalnızca tamamlanan metriklerden ağırlıklı ortalama skor"""
+        completed = [score for score, metric in SCORE_METRICS.items() if metric in results["metrics"]]
+        weight = sum(SCORE_WEIGHTS[score] for score in completed)
+        if not weight:
+            return 0
+        return sum(results[score] * SCORE_WEIGHTS[score] for score in completed) / weight
     
     def _run_security_analysis(self, code: str) -> Dict:
-        """Bandit ile güvenlik analizi"""
+        """Bandit ile güvenlik analizi (inprocess hata verirse subprocess'e düşer)"""
+        if self.security_backend == "inprocess":
+            try:
+                return self._security_result(get_bandit_scanner().scan(code))
+            except Exception:
+                pass
+        return self._run_security_subprocess(code)
+
+    def _security_result(self, issues: List[Dict]) -> Dict:
+        """Bandit issue listesinden güvenlik skoru (100 - severity cezaları)"""
+        penalty = sum(SECURITY_SEVERITY_WEIGHTS.get(issue['issue_severity'], 5) for issue in issues)
+        return {
+            "score": max(0, 100 - penalty),
+            "issues_count": len(issues),
+            "issues": [
+                {
+                    "type": "security",
+                    "severity": issue.get('issue_severity', 'UNKNOWN'),
+                    "message": issue.get('issue_text', ''),
+                    "line": issue.get('line_number', 0)
+                }
+                for issue in issues
+            ]
+        }
+
+    def _run_security_subprocess(self, code: str) -> Dict:
+        """Bandit'i ayrı process'te çalıştır (geçici dosya + JSON çıktı)"""
         try:
             # Geçici dosya oluştur
             with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
@@ -111,26 +594,7 @@ class CodeEvaluator:
             
             if result.stdout:
                 bandit_output = json.loads(result.stdout)
-                issues = bandit_output.get('results', [])
-                
-                # Skor hesapla (100 - (her issue için -10))
-                severity_weights = {'HIGH': 20, 'MEDIUM': 10, 'LOW': 5}
-                penalty = sum(severity_weights.get(issue['issue_severity'], 5) for issue in issues)
-                score = max(0, 100 - penalty)
-                
-                return {
-                    "score": score,
-                    "issues_count": len(issues),
-                    "issues": [
-                        {
-                            "type": "security",
-                            "severity": issue.get('issue_severity', 'UNKNOWN'),
-                            "message": issue.get('issue_text', ''),
-                            "line": issue.get('line_number', 0)
-                        }
-                        for issue in issues
-                    ]
-                }
+                return self._security_result(bandit_output.get('results', []))
             else:
                 return {"score": 100, "issues_count": 0, "issues": []}
                 
@@ -152,7 +616,7 @@ class CodeEvaluator:
                 ['pylint', '--output-format=json', temp_file],
                 capture_output=True,
                 text=True,
-                timeout=15
+                timeout=QUALITY_TIMEOUT
             )
             
             # Geçici dosyayı sil
@@ -161,26 +625,7 @@ class CodeEvaluator:
             if result.stdout:
                 try:
                     pylint_output = json.loads(result.stdout)
-                    issues = pylint_output if isinstance(pylint_output, list) else []
-                    
-                    # Skor hesapla
-                    type_weights = {'error': 10, 'warning': 5, 'convention': 2, 'refactor': 3}
-                    penalty = sum(type_weights.get(issue.get('type', ''), 2) for issue in issues)
-                    score = max(0, 100 - penalty)
-                    
-                    return {
-                        "score": score,
-                        "issues_count": len(issues),
-                        "issues": [
-                            {
-                                "type": "quality",
-                                "severity": issue.get('type', 'unknown').upper(),
-                                "message": issue.get('message', ''),
-                                "line": issue.get('line', 0)
-                            }
-                            for issue in issues[:10]  # İlk 10'u al
-                        ]
-                    }
+                    return self._quality_result(pylint_output if isinstance(pylint_output, list) else [])
                 except json.JSONDecodeError:
                     # JSON parse hatası, regex ile skor çıkar
                     score_match = re.search(r'Your code has been rated at ([\d.]+)/10', result.stdout)
@@ -194,12 +639,85 @@ class CodeEvaluator:
             return {"score": 50, "issues_count": 0, "issues": [{"type": "quality", "message": "Timeout"}]}
         except Exception as e:
             return {"score": 50, "issues_count": 0, "issues": [{"type": "quality", "message": str(e)}]}
+
+    def _quality_result(self, issues: List[Dict]) -> Dict:
+        """Pylint JSON mesajlarından kalite skoru (100 - mesaj tipi cezaları)"""
+        penalty = sum(QUALITY_TYPE_WEIGHTS.get(issue.get('type', ''), 2) for issue in issues)
+        return {
+            "score": max(0, 100 - penalty),
+            "issues_count": len(issues),
+            "issues": [
+                {
+                    "type": "quality",
+                    "severity": issue.get('type', 'unknown').upper(),
+                    "message": issue.get('message', ''),
+                    "line": issue.get('line', 0)
+                }
+                for issue in issues[:10]  # İlk 10'u al
+            ]
+        }
+
+    def _run_quality_batch(self, codes: List[str], jobs: Optional[int] = None,
+                           fallback: bool = True) -> List[Optional[Dict]]:
+        """
+        Tüm kodları tek Pylint çalıştırmasında analiz et
+
+        Kodlar tek bir geçici dizine snippet_<i>.py olarak yazılır, pylint bir
+        kez (--jobs ile paralel) çalışır ve JSON mesajları dosya adına göre
+        kodlara geri dağıtılır. Yalnızca dosyalar arası çalışan checker'lar
+        (duplicate-code, cyclic-import) kapatılır; böylece kod başına mesajlar
+        ve skorlar tek tek çalıştırmayla aynıdır.
+
+        Args:
+            codes: Kodlar
+            jobs: Pylint worker sayısı (None = CPU sayısı)
+            fallback: Toplu çalıştırma başarısız olursa kod başına analiz yap
+                (False = o kodlar için None döner)
+
+        Returns:
+            Kodlarla aynı sırada kalite sonuçları
+        """
+        if not codes:
+            return []
+        jobs = jobs or os.cpu_count() or 1
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                paths = []
+                for index, code in enumerate(codes):
+                    path = os.path.join(temp_dir, f"snippet_{index}.py")
+                    with open(path, 'w') as f:
+                        f.write(code)
+                    paths.append(path)
+
+                result = subprocess.run(
+                    ['pylint', '--output-format=json', f'--jobs={jobs}',
+                     '--disable=duplicate-code,cyclic-import', *paths],
+                    capture_output=True,
+                    text=True,
+                    timeout=QUALITY_TIMEOUT * max(1, -(-len(codes) // jobs))
+                )
+            messages = json.loads(result.stdout)
+            if not isinstance(messages, list):
+                raise ValueError("Pylint JSON çıktısı liste değil")
+        except (subprocess.TimeoutExpired, OSError, ValueError):
+            if not fallback:
+                return [None] * len(codes)
+            return [self._run_quality_analysis(code) for code in codes]
+
+        # Dosya adı → kod indeksi (mesajların dosya içi sırası korunur)
+        per_snippet = [[] for _ in codes]
+        index_of = {os.path.basename(path): index for index, path in enumerate(paths)}
+        for message in messages:
+            index = index_of.get(os.path.basename(message.get('path', '')))
+            if index is not None:
+                per_snippet[index].append(message)
+        return [self._quality_result(issues) for issues in per_snippet]
     
-    def _analyze_complexity(self, code: str) -> Dict:
+    def _analyze_complexity(self, context: AnalysisContext) -> Dict:
         """Radon ile karmaşıklık analizi"""
         try:
             # Cyclomatic Complexity
-            complexity_results = cc_visit(code)
+            complexity_results = context.complexity_blocks
             
             if complexity_results:
                 # Ortalama complexity hesapla
@@ -241,11 +759,11 @@ class CodeEvaluator:
                 "error": str(e)
             }
     
-    def _analyze_maintainability(self, code: str) -> Dict:
+    def _analyze_maintainability(self, context: AnalysisContext) -> Dict:
         """Radon ile maintainability index analizi"""
         try:
             # Önce multi=True dene
-            mi_results = mi_visit(code, multi=True)
+            mi_results = context.maintainability_index(multi=True)
             
             if mi_results:
                 # Ortalama MI hesapla
@@ -259,7 +777,7 @@ class CodeEvaluator:
                 }
             
             # multi=True çalışmazsa multi=False dene
-            mi_results = mi_visit(code, multi=False)
+            mi_results = context.maintainability_index(multi=False)
             if mi_results:
                 mi_values = [item.mi for item in mi_results]
                 avg_mi = sum(mi_values) / len(mi_values)
@@ -272,7 +790,7 @@ class CodeEvaluator:
             
             # Hiçbiri çalışmazsa, manuel hesaplama
             # Basit bir kod için yüksek maintainability ver
-            raw_metrics = analyze(code)
+            raw_metrics = context.raw
             
             # Basit heuristic: 
             # - Az satır = iyi (max 100 satır optimal)
@@ -294,7 +812,7 @@ class CodeEvaluator:
                 comment_score = max(60, 130 - comment_ratio)
             
             # Karmaşıklık etkisi
-            complexity_results = cc_visit(code)
+            complexity_results = context.complexity_blocks
             if complexity_results:
                 avg_complexity = sum(item.complexity for item in complexity_results) / len(complexity_results)
                 complexity_score = max(0, 100 - avg_complexity * 5)
@@ -314,7 +832,7 @@ class CodeEvaluator:
         except Exception as e:
             # Gerçekten hata varsa, genel metriklerden tahmin et
             try:
-                raw_metrics = analyze(code)
+                raw_metrics = context.raw
                 loc = raw_metrics.loc if raw_metrics.loc > 0 else 1
                 
                 # Çok basit tahmin: orta seviye kod
@@ -339,10 +857,10 @@ class CodeEvaluator:
                     "estimated": True
                 }
     
-    def _analyze_general_metrics(self, code: str) -> Dict:
+    def _analyze_general_metrics(self, context: AnalysisContext) -> Dict:
         """Genel kod metrikleri"""
         try:
-            analysis = analyze(code)
+            analysis = context.raw
             
             # Yorum oranı hesapla
             if analysis.loc > 0:
@@ -351,19 +869,19 @@ class CodeEvaluator:
                 comment_ratio = 0
             
             # Fonksiyon sayısı
-            function_count = self._count_functions(code)
+            function_count = self._count_functions(context)
             
             # Type hint kullanımı
-            type_hint_ratio = self._calculate_type_hint_usage(code)
+            type_hint_ratio = self._calculate_type_hint_usage(context)
             
             # Docstring detay skoru
-            docstring_score = self._calculate_docstring_quality(code)
+            docstring_score = self._calculate_docstring_quality(context)
             
             # PEDAGOGICAL METRIKLER
-            learning_ease = self._calculate_learning_ease(code, comment_ratio, docstring_score, function_count)
-            cognitive_load = self._calculate_cognitive_load(code, function_count)
-            instructiveness = self._calculate_instructiveness(code, comment_ratio, docstring_score)
-            example_quality = self._calculate_example_quality(code)
+            learning_ease = self._calculate_learning_ease(context, comment_ratio, docstring_score, function_count)
+            cognitive_load = self._calculate_cognitive_load(context, function_count)
+            instructiveness = self._calculate_instructiveness(context, comment_ratio, docstring_score)
+            example_quality = self._calculate_example_quality(context)
             
             return {
                 "lines_of_code": analysis.loc,
@@ -386,20 +904,17 @@ class CodeEvaluator:
         except Exception as e:
             return {"error": str(e)}
     
-    def _count_functions(self, code: str) -> int:
+    def _count_functions(self, context: AnalysisContext) -> int:
         """Fonksiyon sayısını say"""
         try:
-            tree = ast.parse(code)
-            functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-            return len(functions)
+            return len(context.functions)
         except:
             return 0
     
-    def _calculate_type_hint_usage(self, code: str) -> float:
+    def _calculate_type_hint_usage(self, context: AnalysisContext) -> float:
         """Type hint kullanım oranını hesapla"""
         try:
-            tree = ast.parse(code)
-            functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+            functions = context.functions
             
             if not functions:
                 return 0
@@ -426,11 +941,10 @@ class CodeEvaluator:
         except:
             return 0
     
-    def _calculate_docstring_quality(self, code: str) -> float:
+    def _calculate_docstring_quality(self, context: AnalysisContext) -> float:
         """Docstring kalite skoru (0-100)"""
         try:
-            tree = ast.parse(code)
-            functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+            functions = context.functions
             
             if not functions:
                 return 0
@@ -465,7 +979,7 @@ class CodeEvaluator:
         except:
             return 0
     
-    def _calculate_learning_ease(self, code: str, comment_ratio: float, 
+    def _calculate_learning_ease(self, context: AnalysisContext, comment_ratio: float, 
                                  docstring_score: float, function_count: int) -> float:
         """
         Öğrenme Kolaylığı Skoru (0-100)
@@ -500,7 +1014,7 @@ class CodeEvaluator:
                 func_score = max(50, 100 - (function_count - 5) * 5)
             
             # Değişken isim açıklayıcılığı
-            name_score = self._check_variable_naming_quality(code)
+            name_score = self._check_variable_naming_quality(context)
             
             # Ağırlıklı ortalama
             ease_score = (
@@ -515,7 +1029,7 @@ class CodeEvaluator:
         except:
             return 50
     
-    def _calculate_cognitive_load(self, code: str, function_count: int) -> float:
+    def _calculate_cognitive_load(self, context: AnalysisContext, function_count: int) -> float:
         """
         Bilişsel Yük Skoru (0-100, DÜŞÜK yük = YÜKSEK skor)
         Sweller's Cognitive Load Theory bazlı
@@ -524,10 +1038,10 @@ class CodeEvaluator:
         Yüksek bilişsel yük = öğrenmesi zor
         """
         try:
-            tree = ast.parse(code)
+            context.tree  # Parse edilemeyen kod → except ile varsayılan skor
             
             # 1. Nesting depth (iç içe yapılar)
-            max_depth = self._calculate_max_nesting_depth(tree)
+            max_depth = context.max_nesting_depth
             # Skor: 0-2 depth = 100, 3-4 = 70, 5+ = 40
             if max_depth <= 2:
                 depth_score = 100
@@ -537,7 +1051,7 @@ class CodeEvaluator:
                 depth_score = max(20, 100 - max_depth * 15)
             
             # 2. Ortalama fonksiyon karmaşıklığı
-            complexity_results = cc_visit(code)
+            complexity_results = context.complexity_blocks
             if complexity_results:
                 avg_complexity = sum(item.complexity for item in complexity_results) / len(complexity_results)
                 # Düşük complexity = düşük bilişsel yük
@@ -551,10 +1065,10 @@ class CodeEvaluator:
                 complexity_score = 100
             
             # 3. Satır başına kavram sayısı (her satır kaç şey yapıyor?)
-            lines = code.split('\n')
-            non_empty_lines = [l for l in lines if l.strip() and not l.strip().startswith('#')]
+            non_empty_lines = [l for l in context.lines if l.strip() and not l.strip().startswith('#')]
             if non_empty_lines:
                 # Operatör sayısı / satır sayısı
+                code = context.code
                 operators = code.count('(') + code.count('[') + code.count('{')
                 density = operators / len(non_empty_lines) if non_empty_lines else 0
                 # Düşük density = her satır basit
@@ -574,7 +1088,7 @@ class CodeEvaluator:
         except:
             return 60
     
-    def _calculate_instructiveness(self, code: str, comment_ratio: float, 
+    def _calculate_instructiveness(self, context: AnalysisContext, comment_ratio: float, 
                                    docstring_score: float) -> float:
         """
         Öğreticilik İndeksi (0-100)
@@ -582,16 +1096,16 @@ class CodeEvaluator:
         """
         try:
             # 1. Yorum kalitesi (sadece oran değil, içerik)
-            explanatory_comments = self._count_explanatory_comments(code)
+            explanatory_comments = self._count_explanatory_comments(context)
             
             # 2. Docstring skoru (zaten var)
             
             # 3. Adım adım açıklama var mı?
-            has_step_markers = self._check_step_by_step_markers(code)
+            has_step_markers = self._check_step_by_step_markers(context)
             step_score = 100 if has_step_markers else 40
             
             # 4. Örnek kullanım var mı?
-            has_examples = self._has_usage_examples(code)
+            has_examples = self._has_usage_examples(context)
             example_score = 100 if has_examples else 30
             
             # Ağırlıklı ortalama
@@ -607,12 +1121,13 @@ class CodeEvaluator:
         except:
             return 50
     
-    def _calculate_example_quality(self, code: str) -> float:
+    def _calculate_example_quality(self, context: AnalysisContext) -> float:
         """
         Örnek Kalitesi Skoru (0-100)
         Main bloğu, usage examples, test cases kalitesi
         """
         try:
+            code = context.code
             score = 0
             
             # 1. if __name__ == "__main__": bloğu var mı?
@@ -621,7 +1136,7 @@ class CodeEvaluator:
                 score += 40
             
             # 2. Örnek kullanım gösteriliyor mu?
-            has_usage = any(keyword in code.lower() for keyword in ['örnek', 'example', 'usage', 'test'])
+            has_usage = any(keyword in context.code_lower for keyword in ['örnek', 'example', 'usage', 'test'])
             if has_usage:
                 score += 30
             
@@ -640,19 +1155,14 @@ class CodeEvaluator:
         except:
             return 30
     
-    def _check_variable_naming_quality(self, code: str) -> float:
+    def _check_variable_naming_quality(self, context: AnalysisContext) -> float:
         """
         Değişken isim kalitesi (0-100)
         Açıklayıcı ve öğretici isimler mi?
         """
         try:
-            tree = ast.parse(code)
-            
             # Tüm değişkenleri topla
-            variables = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Name):
-                    variables.append(node.id)
+            variables = context.names
             
             if not variables:
                 return 50
@@ -685,33 +1195,12 @@ class CodeEvaluator:
         except:
             return 50
     
-    def _calculate_max_nesting_depth(self, tree) -> int:
-        """Maksimum iç içe geçme derinliği"""
-        try:
-            max_depth = 0
-            
-            def get_depth(node, current_depth=0):
-                nonlocal max_depth
-                max_depth = max(max_depth, current_depth)
-                
-                if isinstance(node, (ast.For, ast.While, ast.If, ast.With)):
-                    current_depth += 1
-                
-                for child in ast.iter_child_nodes(node):
-                    get_depth(child, current_depth)
-            
-            get_depth(tree)
-            return max_depth
-            
-        except:
-            return 0
-    
-    def _count_explanatory_comments(self, code: str) -> float:
+    def _count_explanatory_comments(self, context: AnalysisContext) -> float:
         """
         Açıklayıcı yorum sayısı ve kalitesi (0-100)
         """
         try:
-            lines = code.split('\n')
+            lines = context.lines
             comments = [l for l in lines if l.strip().startswith('#')]
             
             if not comments:
@@ -744,16 +1233,15 @@ class CodeEvaluator:
         except:
             return 0
     
-    def _check_step_by_step_markers(self, code: str) -> bool:
+    def _check_step_by_step_markers(self, context: AnalysisContext) -> bool:
         """
         Adım adım açıklama marker'ları var mı?
         # ADIM 1:, # Step 1:, etc.
         """
         markers = ['adim', 'step', 'aşama', 'stage', 'phase', '1.', '2.', '3.']
-        code_lower = code.lower()
-        return any(marker in code_lower for marker in markers)
+        return any(marker in context.code_lower for marker in markers)
     
-    def _has_usage_examples(self, code: str) -> bool:
+    def _has_usage_examples(self, context: AnalysisContext) -> bool:
         """
         Kullanım örneği var mı?
         """
@@ -766,8 +1254,7 @@ class CodeEvaluator:
             'test',
             '# demo'
         ]
-        code_lower = code.lower()
-        return any(marker in code_lower for marker in example_markers)
+        return any(marker in context.code_lower for marker in example_markers)
     
     def _complexity_grade(self, complexity: float) -> str:
         """Karmaşıklık notu"""
@@ -795,49 +1282,272 @@ class CodeEvaluator:
         else:
             return "F"
     
-    def evaluate_all(self, results: List[Dict]) -> List[Dict]:
+    def evaluate_all(self, results: List[Dict], batch_quality: bool = True,
+                     parallel: bool = False, workers: Optional[int] = None,
+                     deadline: Optional[float] = SNIPPET_DEADLINE) -> List[Dict]:
         """
         Tüm persona sonuçlarını değerlendir
         
         Args:
             results: Code generator sonuçları
+            batch_quality: Pylint'i tüm kodlar için tek çalıştırmada yap
+                (False = kod başına ayrı Pylint process'i)
+            parallel: Kodları ProcessPoolExecutor ile çekirdeklere dağıt
+            workers: Process sayısı (None = CPU sayısı)
+            deadline: Kod başına süre sınırı (saniye, None = sınırsız). Aşan kod
+                kısmi metriklerle döner; toplu işi bekletmez
             
         Returns:
-            Değerlendirilmiş sonuçlar
+            Değerlendirilmiş sonuçlar (girdi sırasıyla)
         """
         evaluated = []
+
+        indices = [index for index, result in enumerate(results)
+                   if result.get("success") and result.get("code")]
+        # Cache isabetleri Pylint / worker'lara hiç gitmez
+        evaluation_by_index = {}
+        for index in indices:
+            cached = self._cached_result(results[index]["code"], results[index]["persona_id"],
+                                         results[index]["persona_name"])
+            if cached is not None:
+                evaluation_by_index[index] = cached
+        indices = [index for index in indices if index not in evaluation_by_index]
+
+        quality_by_index = {}
+        if batch_quality:
+            # Paralel modda toplu Pylint başarısız olursa kod başına Pylint worker'larda çalışır
+            batch = self._run_quality_batch([results[index]["code"] for index in indices],
+                                            fallback=not parallel)
+            quality_by_index = dict(zip(indices, batch))
+
+        tasks = [
+            (results[index]["code"], results[index]["persona_id"], results[index]["persona_name"],
+             quality_by_index.get(index))
+            for index in indices
+        ]
+        if parallel and len(tasks) > 1:
+            evaluations = self._evaluate_parallel(tasks, workers, deadline)
+        else:
+            evaluations = [self._evaluate(*task, deadline=deadline) for task in tasks]
+        for index, evaluation in zip(indices, evaluations):
+            evaluation_by_index[index] = self._store_result(evaluation)
         
-        for result in results:
-            if result.get("success") and result.get("code"):
-                evaluation = self.evaluate_code(
-                    result["code"],
-                    result["persona_id"],
-                    result["persona_name"]
-                )
-                # Orijinal bilgileri ekle
-                evaluation.update({
-                    "persona_role": result.get("persona_role"),
-                    "category": result.get("category"),
-                    "avatar": result.get("avatar"),
-                    "tokens_used": result.get("tokens_used", 0),
-                    "persona_prompt": result.get("persona_prompt", "Prompt bulunamadı")
-                })
-                evaluated.append(evaluation)
+        for index, result in enumerate(results):
+            if index in evaluation_by_index:
+                evaluated.append(self._with_metadata(evaluation_by_index[index], result))
             else:
                 # Başarısız sonuçları da ekle
-                evaluated.append({
-                    "persona_id": result["persona_id"],
-                    "persona_name": result["persona_name"],
-                    "persona_role": result.get("persona_role"),
-                    "category": result.get("category"),
-                    "avatar": result.get("avatar"),
-                    "code": result.get("code", ""),
-                    "persona_prompt": result.get("persona_prompt", "Prompt oluşturulamadı"),
-                    "total_score": 0,
-                    "error": result.get("error")
-                })
+                evaluated.append(self._failed_evaluation(result))
         
         return evaluated
+
+    def _with_metadata(self, evaluation: Dict, result: Dict) -> Dict:
+        """Değerlendirmeye code generator sonucundaki orijinal bilgileri ekle"""
+        evaluation.update({
+            "persona_role": result.get("persona_role"),
+            "category": result.get("category"),
+            "avatar": result.get("avatar"),
+            "tokens_used": result.get("tokens_used", 0),
+            "persona_prompt": result.get("persona_prompt", "Prompt bulunamadı")
+        })
+        return evaluation
+
+    def _failed_evaluation(self, result: Dict) -> Dict:
+        """Kod üretilemeyen persona için skorsuz sonuç"""
+        return {
+            "persona_id": result["persona_id"],
+            "persona_name": result["persona_name"],
+            "persona_role": result.get("persona_role"),
+            "category": result.get("category"),
+            "avatar": result.get("avatar"),
+            "code": result.get("code", ""),
+            "persona_prompt": result.get("persona_prompt", "Prompt oluşturulamadı"),
+            "total_score": 0,
+            "error": result.get("error")
+        }
+
+    def _evaluate_parallel(self, tasks: List[tuple], workers: Optional[int],
+                           deadline: Optional[float]) -> List[Dict]:
+        """
+        (code, persona_id, persona_name, quality_results) görevlerini process
+        havuzunda değerlendir
+
+        Süre sınırı worker içinde uygulanır (kısmi metrikler döner). Worker
+        tamamen takılırsa ana process tüm görevlerin süresi + pay kadar bekler;
+        bitmeyen görevler metriksiz kısmi sonuç olarak döner.
+        """
+        workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(_evaluate_in_worker, *task, deadline, self.security_backend)
+                       for task in tasks]
+            budget = None
+            if deadline:
+                budget = deadline * -(-len(tasks) // workers) + PARALLEL_GRACE_SECONDS
+            wait(futures, timeout=budget)
+        finally:
+            # Takılan worker yoksa havuzun yönetim thread'i kapanana kadar bekle
+            executor.shutdown(wait=all(future.done() for future in futures),
+                              cancel_futures=True)
+
+        evaluations = []
+        for (code, persona_id, persona_name, _), future in zip(tasks, futures):
+            finished = future.done() and not future.cancelled()
+            error = future.exception() if finished else None
+            if finished and error is None:
+                evaluations.append(future.result())
+            else:
+                evaluations.append(self._unfinished_result(code, persona_id, persona_name,
+                                                           error, deadline))
+        return evaluations
+
+    def _unfinished_result(self, code: str, persona_id: str, persona_name: str,
+                           error: Optional[BaseException], deadline: Optional[float]) -> Dict:
+        """Worker'da hata veren (error) veya süresi dolan (error=None) görevin sonucu"""
+        evaluation = self._empty_result(code, persona_id, persona_name)
+        if error is not None:
+            evaluation["issues"].append({
+                "type": "error",
+                "message": f"Değerlendirme hatası: {str(error)}"
+            })
+        else:
+            evaluation["partial"] = True
+            evaluation["issues"].append({
+                "type": "timeout",
+                "message": f"Değerlendirme süresi aşıldı ({deadline}s), metrik alınamadı"
+            })
+        return evaluation
+
+    async def evaluate_stream(self, generations: AsyncIterator[Dict],
+                              workers: Optional[int] = None,
+                              deadline: Optional[float] = SNIPPET_DEADLINE,
+                              provisional: bool = False
+                              ) -> AsyncIterator[Tuple[Dict, Dict]]:
+        """
+        Üretilen kodları geldikleri anda değerlendir (generate → evaluate pipeline)
+
+        Her üretim sonucu beklemeden process havuzuna gönderilir; hızlı yanıt
+        veren persona'ların değerlendirmesi en yavaş LLM çağrısını beklemez.
+        Toplam gecikme yaklaşık max(üretim) + bir değerlendirme olur.
+
+        Pylint burada kod başına (worker'da) çalışır, evaluate_all'daki toplu
+        Pylint kullanılmaz: toplu analiz tüm üretimlerin bitmesini beklemeyi
+        gerektirir. Kod başına Pylint daha fazla CPU harcar ama LLM
+        beklemesiyle örtüşür; tüm kodlar elde hazırsa evaluate_all daha ucuzdur.
+
+        Args:
+            generations: Kod generator sonuçları (ör.
+                CodeGenerator.generate_codes_as_completed)
+            workers: Process sayısı (None = CPU sayısı)
+            deadline: Kod başına süre sınırı (saniye, None = sınırsız)
+            provisional: True ise her kod için önce Tier 0 (geçici skor) çifti,
+                Bandit + Pylint bitince aynı değerlendirme dict'i yerinde
+                güncellenerek ikinci kez üretilir
+
+        Returns:
+            (üretim sonucu, değerlendirme) çiftlerini tamamlanma sırasıyla
+            üreten async iterator. provisional=True iken her kodun ikinci
+            çifti nihaidir; araçlar tamamlanamazsa sonuç Tier 0 ve kısmi kalır
+        """
+        workers = max(1, workers or os.cpu_count() or 1)
+        executor = ProcessPoolExecutor(max_workers=workers)
+        finished = asyncio.Queue()
+        in_flight = 0
+        abandoned = False
+
+        async def evaluate(generation: Dict):
+            nonlocal in_flight, abandoned
+            in_flight += 1
+            try:
+                async for evaluation in self._evaluate_generation(
+                        generation, executor, deadline, -(-in_flight // workers), provisional):
+                    abandoned = evaluation.pop("abandoned", False) or abandoned
+                    finished.put_nowait((generation, evaluation))
+            finally:
+                in_flight -= 1
+
+        async def submit_all():
+            evaluations = []
+            try:
+                async for generation in generations:
+                    evaluations.append(asyncio.ensure_future(evaluate(generation)))
+                await asyncio.gather(*evaluations)
+            finally:
+                finished.put_nowait(None)
+
+        producer = asyncio.ensure_future(submit_all())
+        drained = False
+        try:
+            while True:
+                pair = await finished.get()
+                if pair is None:
+                    break
+                yield pair
+            # Üretim tarafındaki hatayı tüketiciye ilet
+            await producer
+            drained = True
+        finally:
+            producer.cancel()
+            # Son çiftten sonra havuzun kapanmasını bekle; erken çıkışta veya
+            # takılan worker varsa bekleyen görevleri iptal edip bırak
+            clean = drained and not abandoned
+            executor.shutdown(wait=clean, cancel_futures=not clean)
+
+    async def _evaluate_generation(self, generation: Dict, executor: ProcessPoolExecutor,
+                                   deadline: Optional[float], rounds: int,
+                                   provisional: bool = False) -> AsyncIterator[Dict]:
+        """
+        Tek üretim sonucunu (cache → process havuzu) değerlendir
+
+        provisional=True ise Tier 0 bu process'te hesaplanıp hemen üretilir,
+        araçlar worker'da tamamlanınca aynı dict güncellenip tekrar üretilir.
+        Süre sınırı worker içinde uygulanır; worker tamamen takılırsa sıradaki
+        görev sayısına göre (rounds) süre + pay kadar beklenir ve sonuç
+        "abandoned" olarak işaretlenir.
+        """
+        if not (generation.get("success") and generation.get("code")):
+            yield self._failed_evaluation(generation)
+            return
+        code = generation["code"]
+        persona_id, persona_name = generation["persona_id"], generation["persona_name"]
+
+        evaluation = self._cached_result(code, persona_id, persona_name)
+        if evaluation is not None:
+            yield self._with_metadata(evaluation, generation)
+            return
+
+        loop = asyncio.get_running_loop()
+        if provisional:
+            evaluation = self._with_metadata(
+                self._evaluate(code, persona_id, persona_name, deadline=deadline, tier=FAST_TIER),
+                generation
+            )
+            yield evaluation
+            future = loop.run_in_executor(executor, _complete_in_worker, dict(evaluation),
+                                          deadline, self.security_backend)
+        else:
+            future = loop.run_in_executor(executor, _evaluate_in_worker, code, persona_id,
+                                          persona_name, None, deadline, self.security_backend)
+        budget = deadline * rounds + PARALLEL_GRACE_SECONDS if deadline else None
+        try:
+            result = self._store_result(await asyncio.wait_for(future, budget))
+        except asyncio.TimeoutError:
+            result = self._unfinished_result(code, persona_id, persona_name, None, deadline)
+            result["abandoned"] = True
+        except Exception as error:
+            result = self._unfinished_result(code, persona_id, persona_name, error, deadline)
+
+        if provisional and result.get("tier", FULL_TIER) < FULL_TIER:
+            # Araçlar tamamlanamadı: Tier 0 metrikleri kalır, sonuç kısmi
+            evaluation["partial"] = True
+            evaluation["issues"] = evaluation["issues"] + result["issues"]
+            evaluation["abandoned"] = result.get("abandoned", False)
+            yield evaluation
+        elif provisional:
+            evaluation.update(result)
+            yield evaluation
+        else:
+            yield self._with_metadata(result, generation)
     
     def get_rankings(self, evaluated_results: List[Dict]) -> Dict:
         """
@@ -849,23 +1559,24 @@ class CodeEvaluator:
         Returns:
             Sıralamalar ve istatistikler
         """
-        # Skor'a göre sırala
-        sorted_results = sorted(
-            evaluated_results,
-            key=lambda x: x.get("total_score", 0),
-            reverse=True
-        )
+        # Skor'a göre sırala. Kısmi (süre aşımı) sonuçların skoru yalnızca
+        # tamamlanan metriklerden gelir; tam sonuçların önüne geçmemeleri için
+        # her zaman onlardan sonra sıralanırlar
+        def rank_key(result: Dict) -> tuple:
+            return (not result.get("partial", False), result.get("total_score", 0))
+
+        sorted_results = sorted(evaluated_results, key=rank_key, reverse=True)
         
         # Kategori bazlı en iyiler
         education_best = max(
             [r for r in evaluated_results if r.get("category") == "education"],
-            key=lambda x: x.get("total_score", 0),
+            key=rank_key,
             default=None
         )
         
         technology_best = max(
             [r for r in evaluated_results if r.get("category") == "technology"],
-            key=lambda x: x.get("total_score", 0),
+            key=rank_key,
             default=None
         )
         
@@ -926,3 +1637,30 @@ print(fibonacci(10))
     print(f"  • Karmaşıklık: {result['complexity_score']:.2f}/100")
     print(f"  • Maintainability: {result['maintainability_index']:.2f}/100")
 
+    # Kademeli değerlendirme: önce geçici skor, sonra Bandit + Pylint
+    provisional = evaluator.evaluate_code("import os\nos.system('ls')\n", "test_2",
+                                          "Shell Persona", tier=FAST_TIER)
+    print(f"\n⏳ Tier 0 (geçici): {provisional['total_score']:.2f} (tier {provisional['tier']})")
+    evaluator.complete_evaluation(provisional)
+    print(f"✅ Tier 1 (tam): {provisional['total_score']:.2f} (tier {provisional['tier']})")
+
+    # Pipeline: farklı sürelerde gelen üretimler geldikleri anda değerlendirilir
+    async def simulated_generations():
+        async def generate(persona_id: str, delay: float) -> Dict:
+            await asyncio.sleep(delay)
+            return {"success": True, "code": test_code, "persona_id": persona_id,
+                    "persona_name": persona_id.title()}
+
+        for next_result in asyncio.as_completed([generate("hizli", 0.5), generate("yavas", 2.0)]):
+            yield await next_result
+
+    async def stream_demo():
+        start = time.perf_counter()
+        async for generation, evaluation in evaluator.evaluate_stream(simulated_generations(),
+                                                                      provisional=True):
+            print(f"  • {time.perf_counter() - start:.2f}s {generation['persona_name']}: "
+                  f"{evaluation['total_score']:.2f} (tier {evaluation['tier']})")
+
+    print("\n🔀 Üretim → değerlendirme pipeline:")
+    asyncio.run(stream_demo())
+
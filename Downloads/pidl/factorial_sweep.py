@@ -0,0 +1,339 @@
+"""
+Faktöriyel Deney Taraması (Factorial Sweep)
+
+Araştırma soruları faktöriyeldir:
+    seviye × domain × skor × AI deneyimi × persona × mod × task_complexity × time_factor
+
+Kullanıcı faktörlerinin kartezyen çarpımı create_user_matrix ile tek U×10
+matrise dönüştürülür; her (task_complexity, time_factor) hücresi ve her
+kullanıcı bloğu için tek bir score_matrix çağrısı U×P×M bloğu üretir.
+Sonuç, boyut adları ve koordinatları taşıyan LabeledArray'dir (xarray
+benzeri): isim ile seçme, dilimleme ve marjinalleştirme desteklenir. RAM'e
+sığmayan ızgaralar için sonuç .npy memmap olarak diske yazılabilir.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from itertools import product
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Union
+
+from recommendation_engine import RecommendationEngine, SCORING_MODES, DREYFUS_LEVELS
+
+try:
+    import xarray
+    XARRAY_AVAILABLE = True
+except ImportError:
+    XARRAY_AVAILABLE = False
+
+
+USER_FACTORS = ("level", "domain", "score", "ai_experience")
+CONDITION_FACTORS = ("task_complexity", "time_factor")
+# Sonuç boyut sırası: kullanıcı faktörleri → koşullar → persona → mod
+# (score_matrix'in U×P×M bloğu son eksenlere contiguous yazılır)
+FACTORS = USER_FACTORS + CONDITION_FACTORS + ("persona", "mode")
+
+
+class LabeledArray:
+    """
+    Boyut adları ve koordinatları olan N boyutlu dizi
+
+    values bir np.ndarray veya np.memmap olabilir; işlemler yeni
+    LabeledArray döndürür. Koordinatlar boyut başına 1-D dizilerdir.
+    """
+
+    def __init__(self, values: np.ndarray, dims: Sequence[str], coords: Dict[str, Sequence]):
+        """
+        Args:
+            values: N-d değerler
+            dims: Boyut adları (values.ndim uzunluğunda)
+            coords: Boyut adı → etiketler (boyut uzunluğunda)
+        """
+        dims = tuple(dims)
+        if len(dims) != values.ndim:
+            raise ValueError(f"{values.ndim} boyutlu dizi için {len(dims)} boyut adı verildi")
+        self.values = values
+        self.dims = dims
+        self.coords = {dim: np.asarray(coords[dim]) for dim in dims}
+        for dim, size in zip(dims, values.shape):
+            if len(self.coords[dim]) != size:
+                raise ValueError(f"'{dim}' koordinat sayısı {len(self.coords[dim])}, boyut {size}")
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def sizes(self) -> Dict[str, int]:
+        return dict(zip(self.dims, self.values.shape))
+
+    def __repr__(self) -> str:
+        sizes = ", ".join(f"{dim}: {size}" for dim, size in self.sizes.items())
+        return f"<LabeledArray ({sizes}) {self.values.dtype}>"
+
+    def _axis(self, dim: str) -> int:
+        if dim not in self.dims:
+            raise KeyError(f"Bilinmeyen boyut: {dim}. {self.dims} olmalı.")
+        return self.dims.index(dim)
+
+    def _label_index(self, dim: str, label) -> int:
+        """Etiketin koordinat indeksi (sayısal etiketlerde float toleranslı)"""
+        coord = self.coords[dim]
+        if coord.dtype.kind in "fiu" and not isinstance(label, (str, bool, np.bool_)):
+            matches = np.flatnonzero(np.isclose(coord.astype(np.float64), float(label)))
+        else:
+            matches = np.flatnonzero(coord == label)
+        if len(matches) == 0:
+            raise KeyError(f"'{dim}' boyutunda {label!r} yok. {coord.tolist()} olmalı.")
+        return int(matches[0])
+
+    def isel(self, **indexers) -> "LabeledArray":
+        """
+        Pozisyon ile seç
+
+        Tam sayı boyutu düşürür; liste/slice boyutu korur.
+        """
+        index = [slice(None)] * self.values.ndim
+        dims, coords = [], {}
+        for dim in self.dims:
+            selector = indexers.get(dim, slice(None))
+            index[self._axis(dim)] = selector
+            if isinstance(selector, (int, np.integer)):
+                continue
+            dims.append(dim)
+            coords[dim] = self.coords[dim][selector]
+        unknown = set(indexers) - set(self.dims)
+        if unknown:
+            raise KeyError(f"Bilinmeyen boyut(lar): {sorted(unknown)}")
+        # Liste seçicileri eksen eksen uygulanır (NumPy'ın birlikte indeksleme kuralı yerine)
+        values = self.values
+        for axis in reversed(range(len(index))):
+            selector = index[axis]
+            if isinstance(selector, (list, np.ndarray)):
+                values = np.take(values, selector, axis=axis)
+                index[axis] = slice(None)
+        return LabeledArray(np.asarray(values[tuple(index)]), dims, coords)
+
+    def sel(self, **labels) -> "LabeledArray":
+        """
+        Etiket ile seç
+
+        Tek etiket boyutu düşürür; etiket listesi boyutu korur.
+        Örnek: result.sel(mode="hybrid", level=["novice", "expert"])
+        """
+        indexers = {}
+        for dim, label in labels.items():
+            self._axis(dim)
+            if isinstance(label, (list, tuple, np.ndarray)):
+                indexers[dim] = [self._label_index(dim, item) for item in label]
+            else:
+                indexers[dim] = self._label_index(dim, label)
+        return self.isel(**indexers)
+
+    def reduce(self, func: Callable, dims: Union[str, Sequence[str], None] = None) -> "LabeledArray":
+        """
+        İsimli boyut(lar) üzerinde indirgeme (marjinalleştirme)
+
+        Args:
+            func: axis= argümanı alan NumPy fonksiyonu (np.mean, np.max, ...)
+            dims: İndirgenecek boyut(lar) (None = hepsi)
+        """
+        dims = self.dims if dims is None else ((dims,) if isinstance(dims, str) else tuple(dims))
+        axes = tuple(self._axis(dim) for dim in dims)
+        kept = [dim for dim in self.dims if dim not in dims]
+        return LabeledArray(np.asarray(func(self.values, axis=axes)), kept,
+                            {dim: self.coords[dim] for dim in kept})
+
+    def mean(self, dims=None) -> "LabeledArray":
+        return self.reduce(np.mean, dims)
+
+    def std(self, dims=None) -> "LabeledArray":
+        return self.reduce(np.std, dims)
+
+    def max(self, dims=None) -> "LabeledArray":
+        return self.reduce(np.max, dims)
+
+    def min(self, dims=None) -> "LabeledArray":
+        return self.reduce(np.min, dims)
+
+    def idxmax(self, dim: str) -> "LabeledArray":
+        """Boyut boyunca en yüksek değerin etiketi (örn. koşul başına en iyi persona)"""
+        axis = self._axis(dim)
+        kept = [name for name in self.dims if name != dim]
+        return LabeledArray(self.coords[dim][np.argmax(self.values, axis=axis)], kept,
+                            {name: self.coords[name] for name in kept})
+
+    def transpose(self, *dims) -> "LabeledArray":
+        """Boyutları verilen sıraya diz (belirtilmeyenler sona)"""
+        order = list(dims) + [dim for dim in self.dims if dim not in dims]
+        return LabeledArray(np.transpose(self.values, [self._axis(dim) for dim in order]),
+                            order, self.coords)
+
+    def to_dataframe(self, name: str = "value") -> pd.DataFrame:
+        """Uzun format DataFrame (her boyut bir sütun)"""
+        index = pd.MultiIndex.from_product([self.coords[dim] for dim in self.dims], names=self.dims)
+        return pd.DataFrame({name: np.asarray(self.values).reshape(-1)}, index=index).reset_index()
+
+    def to_xarray(self):
+        """xarray.DataArray'e dönüştür (xarray kuruluysa)"""
+        if not XARRAY_AVAILABLE:
+            raise ImportError("to_xarray için xarray gerekli (pip install xarray)")
+        return xarray.DataArray(self.values, dims=self.dims, coords=self.coords)
+
+    def save(self, path: Union[str, Path]):
+        """Değerleri .npy, boyut/koordinatları yanındaki .json dosyasına yaz"""
+        path = Path(path)
+        if not (isinstance(self.values, np.memmap) and Path(self.values.filename) == path.resolve()):
+            np.save(path, self.values)
+        with open(_coords_path(path), "w", encoding="utf-8") as f:
+            json.dump({"dims": list(self.dims),
+                       "coords": {dim: self.coords[dim].tolist() for dim in self.dims}},
+                      f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap_mode: Optional[str] = "r") -> "LabeledArray":
+        """save() çıktısını yükle (varsayılan: memmap, RAM'e okunmaz)"""
+        path = Path(path)
+        with open(_coords_path(path), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode=mmap_mode), meta["dims"], meta["coords"])
+
+
+def _coords_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".json")
+
+
+class FactorialSweep:
+    """Faktör ızgaralarının tam kartezyen çarpımını vektörel bloklarla değerlendir"""
+
+    def __init__(self, engine: Optional[RecommendationEngine] = None,
+                 levels: Sequence[str] = DREYFUS_LEVELS,
+                 domains: Sequence[str] = ("technical", "educational"),
+                 scores: Sequence[float] = (50.0,),
+                 ai_experience: Sequence[bool] = (False,),
+                 personas: Optional[Sequence[str]] = None,
+                 modes: Sequence[str] = SCORING_MODES,
+                 task_complexities: Sequence[float] = (0.5,),
+                 time_factors: Sequence[float] = (0.5,)):
+        """
+        Args:
+            engine: Recommendation engine (None = varsayılan ağırlıklar)
+            levels: Dreyfus seviyeleri
+            domains: Dominant domain'ler
+            scores: 0-100 yetkinlik skorları
+            ai_experience: AI deneyimi değerleri
+            personas: Persona id'leri (None = tümü)
+            modes: "similarity", "complementary", "hybrid", "adaptive"
+            task_complexities: Görev karmaşıklığı ızgarası
+            time_factors: Zaman faktörü ızgarası
+        """
+        invalid = [mode for mode in modes if mode not in SCORING_MODES]
+        if invalid:
+            raise ValueError(f"Geçersiz mod: {invalid}. {SCORING_MODES} olmalı.")
+
+        self.engine = engine or RecommendationEngine()
+        self.grid = {
+            "level": list(levels),
+            "domain": list(domains),
+            "score": [float(score) for score in scores],
+            "ai_experience": [bool(value) for value in ai_experience],
+            "task_complexity": [float(value) for value in task_complexities],
+            "time_factor": [float(value) for value in time_factors],
+            "mode": list(modes)
+        }
+        self.personas = list(personas) if personas is not None else list(self.engine.persona_vectors)
+        self.grid["persona"] = self.personas
+
+    @property
+    def shape(self):
+        return tuple(len(self.grid[factor]) for factor in FACTORS)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def user_matrix(self) -> np.ndarray:
+        """Kullanıcı faktörlerinin kartezyen çarpımı → U×10 (C sırası: level en yavaş)"""
+        columns = np.meshgrid(*[np.asarray(self.grid[factor]) for factor in USER_FACTORS],
+                              indexing="ij")
+        level, domain, score, ai_experience = [column.reshape(-1) for column in columns]
+        return self.engine.create_user_matrix(score, level, domain, ai_experience)
+
+    def run(self, out: Union[str, Path, None] = None, user_block: int = 4096,
+            dtype=np.float32) -> LabeledArray:
+        """
+        Tüm hücreleri değerlendir
+
+        Args:
+            out: .npy yolu verilirse sonuç diske memmap olarak yazılır
+                (koordinatlar out + '.json'); None = RAM
+            user_block: Tek score_matrix çağrısındaki kullanıcı sayısı
+            dtype: Sonuç dtype'ı
+
+        Returns:
+            FACTORS sırasıyla boyutlandırılmış toplam skor LabeledArray'i
+        """
+        shape = self.shape
+        if out is not None:
+            out = Path(out)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            values = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape)
+        else:
+            values = np.empty(shape, dtype=dtype)
+
+        users = self.user_matrix()
+        n_users = len(users)
+        n_conditions = [len(self.grid[factor]) for factor in CONDITION_FACTORS]
+        # U × TC × TF × P × M görünümü (kopya değil)
+        flat = values.reshape((n_users, *n_conditions, len(self.personas), len(self.grid["mode"])))
+
+        for (tc_idx, task_complexity), (tf_idx, time_factor) in product(
+                enumerate(self.grid["task_complexity"]), enumerate(self.grid["time_factor"])):
+            for start in range(0, n_users, user_block):
+                block = self.engine.score_matrix(
+                    users[start:start + user_block],
+                    personas=self.personas,
+                    modes=self.grid["mode"],
+                    task_complexity=task_complexity,
+                    time_factor=time_factor
+                )
+                flat[start:start + user_block, tc_idx, tf_idx] = block["total"]
+
+        if isinstance(values, np.memmap):
+            values.flush()
+        result = LabeledArray(values, FACTORS, self.grid)
+        if out is not None:
+            result.save(out)
+        return result
+
+
+# Test için
+if __name__ == "__main__":
+    import time
+
+    sweep = FactorialSweep(
+        scores=np.linspace(0, 100, 11),
+        ai_experience=(False, True),
+        task_complexities=np.linspace(0, 1, 11),
+        time_factors=np.linspace(0, 1, 6)
+    )
+    print(f"🔬 {' × '.join(map(str, sweep.shape))} = {sweep.size:,} hücre")
+
+    start = time.time()
+    result = sweep.run()
+    print(f"✅ {time.time() - start:.2f}s içinde değerlendirildi: {result}")
+
+    # Marjinal: seviye × mod ortalaması (diğer tüm faktörler üzerinden)
+    marginal = result.mean(["domain", "score", "ai_experience", "task_complexity",
+                            "time_factor", "persona"])
+    print("\n📊 Seviye × mod ortalama skor:")
+    print(pd.DataFrame(marginal.values, index=marginal.coords["level"],
+                       columns=marginal.coords["mode"]).round(3))
+
+    # Koşul başına en iyi persona
+    best = result.sel(domain="technical", score=50, ai_experience=True,
+                      task_complexity=0.5, time_factor=0.6, mode="hybrid").idxmax("persona")
+    print("\n🏆 Hybrid modda seviye başına en iyi persona:")
+    for level, persona in zip(best.coords["level"], best.values):
+        print(f"  {level}: {persona}")
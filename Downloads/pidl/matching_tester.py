@@ -1,18 +1,60 @@
 """
 User-Persona Matching Tester
 150 synthetic users × 10 personas = 1,500 matching scenarios test eder
+
+Büyük kohortlar için iter_matchings() sonuçları user chunk'ları halinde
+sütunsal DataFrame olarak üretir; run_to_file() her chunk'ı üretildiği anda
+CSV/Parquet dosyasına ekler ve analyze_results(filepath) dosya üzerinde
+akış halinde (streaming) toplama yapar. Bellek kullanımı kullanıcı
+sayısından bağımsız kalır.
+
+ShardedMatchingRunner kullanıcıları shard'lara bölüp ProcessPoolExecutor
+ile tüm çekirdeklere dağıtır; her shard kendi dosyasını yazar ve shard
+analizleri sonunda birleştirilir.
+
+Hafızadaki sonuçlar MatchingResults'ta sütunsal tutulur (kategorik id/mod
+sütunları, float32 skorlar); best-k ve özet istatistikler tek sıralama ve
+gruplama geçişiyle hesaplanır.
 """
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pandas.api.types import union_categoricals
+from itertools import islice
+from multiprocessing import Manager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Sequence, Union
 import json
 
-from synthetic_user_generator import SyntheticUserGenerator
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from synthetic_user_generator import SyntheticUserGenerator, SyntheticUserColumns
 from recommendation_engine import RecommendationEngine
 from personas import get_all_personas
 
 
+MATCHING_MODES = ('similarity', 'complementary')
+
+# Akış halinde analiz için gereken sütunlar (dosyadan yalnızca bunlar okunur)
+ANALYSIS_COLUMNS = ['user_id', 'user_domain', 'persona_id', 'persona_category',
+                    'mode', 'recommendation_score']
+
+# MatchingResults'ta kategorik ve float32 tutulan sütunlar
+CATEGORICAL_COLUMNS = ['user_id', 'user_level', 'user_domain', 'persona_id', 'persona_name',
+                       'persona_category', 'mode', 'strategy']
+SCORE_COLUMNS = ['user_tech_score', 'user_edu_score', 'recommendation_score', 'similarity',
+                 'complementarity', 'competency_match', 'performance_pred', 'learning_traj']
+
+
 class MatchingTester:
     """User-Persona matching test sistemi"""
     
@@ -20,9 +62,9 @@ class MatchingTester:
         """Matching tester başlat"""
         self.rec_engine = RecommendationEngine()
         self.personas = get_all_personas()
-        self.matching_results = []
+        self.matching_results = MatchingResults()
     
-    def test_all_matchings(self, users: List[Dict]) -> List[Dict]:
+    def test_all_matchings(self, users: List[Dict]) -> 'MatchingResults':
         """
         Tüm user-persona matchings'i test et
         
@@ -30,130 +72,142 @@ class MatchingTester:
             users: Synthetic user list
             
         Returns:
-            Matching results
+            Matching results (MatchingResults; satır dict'leri üzerinde
+            liste gibi iterasyon ve indeksleme destekler)
         """
-        total = len(users) * len(self.personas) * 2  # 2 modes
-        print(f"🔬 Testing: {len(users)} users × {len(self.personas)} personas × 2 modes = {total} matchings")
+        total = len(users) * len(self.personas) * len(MATCHING_MODES)
+        print(f"🔬 Testing: {len(users)} users × {len(self.personas)} personas × {len(MATCHING_MODES)} modes = {total} matchings")
         
-        count = 0
-        
-        for user in users:
-            # User vector oluştur
-            user_vec = self.rec_engine.create_user_vector(user)
-            
-            for persona in self.personas:
-                persona_vec = self.rec_engine.persona_vectors[persona.id]
-                
-                # Her iki mod için de test
-                for mode in ['similarity', 'complementary']:
-                    
-                    count += 1
-                    if count % 100 == 0:
-                        print(f"  Progress: {count}/{total} ({count/total*100:.1f}%)")
-                    
-                    # Recommendation score hesapla
-                    score_dict = self.rec_engine.calculate_recommendation_score(
-                        user_vec,
-                        persona_vec,
-                        mode=mode
-                    )
-                    
-                    # Kaydet
-                    matching = {
-                        'user_id': user['id'],
-                        'user_level': user['level'],
-                        'user_domain': user['dominant_domain'],
-                        'user_tech_score': user['technical_score'],
-                        'user_edu_score': user['educational_score'],
-                        'persona_id': persona.id,
-                        'persona_name': persona.name,
-                        'persona_category': persona.category,
-                        'mode': mode,
-                        'recommendation_score': score_dict['total_score'],
-                        'similarity': score_dict['components']['similarity'],
-                        'complementarity': score_dict['components'].get('complementarity', 0),
-                        'competency_match': score_dict['components']['competency_match'],
-                        'performance_pred': score_dict['components']['performance_prediction'],
-                        'learning_traj': score_dict['components']['learning_trajectory'],
-                        'strategy': score_dict.get('strategy', mode)
-                    }
-                    
-                    self.matching_results.append(matching)
+        for chunk in self.iter_matchings(users):
+            self.matching_results.append(chunk)
         
         print(f"\n✅ {len(self.matching_results)} matching tamamlandı!")
         
         return self.matching_results
     
-    def analyze_results(self) -> Dict:
-        """Matching sonuçlarını analiz et"""
-        df = pd.DataFrame(self.matching_results)
+    def iter_matchings(self, users: Iterable[Dict], chunk_size: int = 1000,
+                       modes: Sequence[str] = MATCHING_MODES,
+                       task_complexity: float = 0.5) -> Iterator[pd.DataFrame]:
+        """
+        Matching sonuçlarını user chunk'ları halinde sütunsal üret
         
-        analysis = {
-            'total_matchings': len(df),
+        Satırlar test_all_matchings ile aynı sırada (user → persona → mode) ve
+        aynı sütunlarla gelir. users bir generator olabilir (örn.
+        SyntheticUserColumns.iter_users()); bellekte aynı anda yalnızca bir
+        chunk tutulur.
+        
+        Args:
+            users: User dict'leri (liste veya iterator)
+            chunk_size: Bir chunk'taki kullanıcı sayısı
+            modes: Skorlama modları
+            task_complexity: Görev karmaşıklığı
             
-            # Mode comparison
-            'similarity_mode': {
-                'mean_score': df[df['mode']=='similarity']['recommendation_score'].mean(),
-                'std': df[df['mode']=='similarity']['recommendation_score'].std()
-            },
-            'complementary_mode': {
-                'mean_score': df[df['mode']=='complementary']['recommendation_score'].mean(),
-                'std': df[df['mode']=='complementary']['recommendation_score'].std()
-            },
+        Yields:
+            chunk_size × P × M satırlık DataFrame
+        """
+        persona_ids = np.array([persona.id for persona in self.personas], dtype=object)
+        persona_names = np.array([persona.name for persona in self.personas], dtype=object)
+        persona_categories = np.array([persona.category for persona in self.personas], dtype=object)
+        mode_names = np.array(modes, dtype=object)
+        strategies = np.array([self.rec_engine.MODE_STRATEGIES.get(mode, mode) for mode in modes],
+                              dtype=object)
+        n_personas, n_modes = len(persona_ids), len(mode_names)
+        
+        users = iter(users)
+        while True:
+            chunk = list(islice(users, chunk_size))
+            if not chunk:
+                return
             
-            # Best matches per user
-            'best_similarity_matches': self._find_best_matches(df, 'similarity'),
-            'best_complementary_matches': self._find_best_matches(df, 'complementary'),
+            # Tüm chunk tek batch çağrısında skorlanır
+            scores = self.rec_engine.score_matrix(
+                [self.rec_engine.create_user_vector(user) for user in chunk],
+                personas=persona_ids.tolist(),
+                modes=modes,
+                task_complexity=task_complexity
+            )
             
-            # Persona popularity
-            'persona_selection_frequency': df.groupby('persona_id').size().to_dict(),
+            n_users = len(chunk)
+            user_rows = np.repeat(np.arange(n_users), n_personas * n_modes)
+            persona_rows = np.tile(np.repeat(np.arange(n_personas), n_modes), n_users)
+            mode_rows = np.tile(np.arange(n_modes), n_users * n_personas)
             
-            # Category preference by user domain
-            'tech_users_prefer': self._category_preference(df, 'technical'),
-            'edu_users_prefer': self._category_preference(df, 'educational')
-        }
-        
-        return analysis
+            def user_column(key):
+                return np.array([user[key] for user in chunk], dtype=object)[user_rows]
+            
+            def pair_column(name):
+                # U×P bileşen → her mode için tekrar
+                return np.repeat(scores[name].reshape(-1), n_modes)
+            
+            yield pd.DataFrame({
+                'user_id': user_column('id'),
+                'user_level': user_column('level'),
+                'user_domain': user_column('dominant_domain'),
+                'user_tech_score': user_column('technical_score').astype(np.float64),
+                'user_edu_score': user_column('educational_score').astype(np.float64),
+                'persona_id': persona_ids[persona_rows],
+                'persona_name': persona_names[persona_rows],
+                'persona_category': persona_categories[persona_rows],
+                'mode': mode_names[mode_rows],
+                'recommendation_score': scores['total'].reshape(-1),
+                'similarity': pair_column('similarity'),
+                'complementarity': pair_column('complementarity'),
+                'competency_match': pair_column('competency_match'),
+                'performance_pred': pair_column('performance_prediction'),
+                'learning_traj': pair_column('learning_trajectory'),
+                'strategy': strategies[mode_rows]
+            })
     
-    def _find_best_matches(self, df: pd.DataFrame, mode: str, top_k: int = 3) -> Dict:
-        """Her user için en iyi top-k persona'ları bul"""
-        mode_df = df[df['mode'] == mode]
+    def run_to_file(self, users: Iterable[Dict], filepath: str = 'data/matching_results.csv',
+                    chunk_size: int = 1000, modes: Sequence[str] = MATCHING_MODES) -> int:
+        """
+        Matching'leri hafızada biriktirmeden dosyaya yaz
         
-        best_matches = {}
-        for user_id in mode_df['user_id'].unique():
-            user_matches = mode_df[mode_df['user_id'] == user_id].nlargest(top_k, 'recommendation_score')
-            best_matches[user_id] = user_matches['persona_id'].tolist()
+        Args:
+            users: User dict'leri (liste veya iterator)
+            filepath: .csv veya .parquet dosya yolu
+            chunk_size: Bir chunk'taki kullanıcı sayısı
+            modes: Skorlama modları
+            
+        Returns:
+            Yazılan satır sayısı
+        """
+        with MatchingResultSink(filepath) as sink:
+            for chunk in self.iter_matchings(users, chunk_size=chunk_size, modes=modes):
+                sink.write(chunk)
         
-        return best_matches
+        print(f"💾 {sink.rows_written} matching kaydedildi: {filepath}")
+        return sink.rows_written
     
-    def _category_preference(self, df: pd.DataFrame, user_domain: str) -> Dict:
-        """Bir domain'deki kullanıcılar hangi category'yi tercih eder?"""
-        user_df = df[df['user_domain'] == user_domain]
+    def analyze_results(self, source: Union[str, Sequence[str], None] = None,
+                        chunk_size: int = 200_000) -> Dict:
+        """
+        Matching sonuçlarını analiz et
         
-        # Her mode için
-        sim_df = user_df[user_df['mode'] == 'similarity']
-        comp_df = user_df[user_df['mode'] == 'complementary']
+        Args:
+            source: None (self.matching_results), run_to_file çıktısı
+                CSV/Parquet dosyası veya shard dosyaları listesi (chunk'lar
+                halinde okunur)
+            chunk_size: Dosyadan tek seferde okunan satır sayısı
+        """
+        if source is None:
+            return self.matching_results.analyze()
         
-        return {
-            'similarity_mode': {
-                'education_personas': (sim_df['persona_category']=='education').sum(),
-                'technology_personas': (sim_df['persona_category']=='technology').sum()
-            },
-            'complementary_mode': {
-                'education_personas': (comp_df['persona_category']=='education').sum(),
-                'technology_personas': (comp_df['persona_category']=='technology').sum()
-            }
-        }
+        analysis = StreamingMatchingAnalysis()
+        for filepath in ([source] if isinstance(source, (str, Path)) else source):
+            for chunk in read_matching_chunks(filepath, chunk_size=chunk_size):
+                analysis.update(chunk)
+        return analysis.result()
     
     def export_results(self, filepath='data/matching_results.csv'):
         """CSV olarak export"""
-        df = pd.DataFrame(self.matching_results)
+        df = self.matching_results.to_frame()
         df.to_csv(filepath, index=False, encoding='utf-8-sig')  # UTF-8 with BOM (Excel için)
         print(f"💾 Matching results kaydedildi: {filepath}")
     
-    def generate_summary_report(self) -> str:
-        """Özet rapor üret"""
-        analysis = self.analyze_results()
+    def generate_summary_report(self, source: Union[str, Sequence[str], None] = None) -> str:
+        """Özet rapor üret (source: analyze_results ile aynı)"""
+        analysis = self.analyze_results(source)
         
         report = f"""
         📊 MATCHING TEST SUMMARY REPORT
@@ -178,6 +232,520 @@ class MatchingTester:
         return report
 
 
+class MatchingResults:
+    """
+    Sütunsal matching sonuç deposu
+    
+    id/mod/kategori sütunları kategorik, skorlar float32 tutulur (satır
+    başına dict yerine ~60 byte). Chunk'lar eklenirken sıkıştırılır ve ilk
+    erişimde tek DataFrame'de birleştirilir. Liste gibi davranır: len(),
+    iterasyon ve indeksleme satır dict'leri döndürür.
+    """
+    
+    def __init__(self, frame: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            frame: iter_matchings formatında başlangıç DataFrame'i (opsiyonel)
+        """
+        self._chunks = []
+        self._frame = None
+        if frame is not None:
+            self.append(frame)
+    
+    @staticmethod
+    def _compact(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Kategorik ve float32 dtype'lara dönüştür"""
+        dtypes = {name: 'category' for name in CATEGORICAL_COLUMNS if name in chunk}
+        dtypes.update({name: np.float32 for name in SCORE_COLUMNS if name in chunk})
+        return chunk.astype(dtypes)
+    
+    def append(self, chunk: pd.DataFrame):
+        """iter_matchings chunk'ı ekle"""
+        if len(chunk):
+            self._chunks.append(self._compact(chunk))
+            self._frame = None
+    
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Tüm sonuçlar tek DataFrame olarak (kategorikler birleştirilmiş)"""
+        if self._frame is None:
+            if not self._chunks:
+                self._frame = self._compact(pd.DataFrame(columns=CATEGORICAL_COLUMNS + SCORE_COLUMNS))
+            elif len(self._chunks) == 1:
+                self._frame = self._chunks[0]
+            else:
+                columns = {}
+                for name in self._chunks[0].columns:
+                    parts = [chunk[name] for chunk in self._chunks]
+                    if isinstance(parts[0].dtype, pd.CategoricalDtype):
+                        columns[name] = union_categoricals(parts, sort_categories=True)
+                    else:
+                        columns[name] = np.concatenate([part.to_numpy() for part in parts])
+                self._frame = pd.DataFrame(columns)
+            self._chunks = [self._frame]
+        return self._frame
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Sonuçları DataFrame olarak döndür"""
+        return self.frame
+    
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks)
+    
+    def __getitem__(self, index: int) -> Dict:
+        return self.frame.iloc[index].to_dict()
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.frame.to_dict('records'))
+    
+    def best_k(self, mode: str, top_k: int = 3) -> Dict:
+        """
+        Her user için en iyi top-k persona (tek lexsort)
+        
+        nlargest(keep='first') ile aynı eşitlik kuralı: skor azalan, eşitlikte
+        önce gelen satır. Kullanıcılar ilk görülme sırasıyla döner.
+        
+        Args:
+            mode: Skorlama modu
+            top_k: Kullanıcı başına persona sayısı
+            
+        Returns:
+            {user_id: [persona_id, ...]}
+        """
+        frame = self.frame
+        mode_code = frame['mode'].cat.categories.get_indexer([mode])[0]
+        if mode_code < 0:
+            return {}
+        rows = np.flatnonzero(frame['mode'].cat.codes.to_numpy() == mode_code)
+        users = frame['user_id'].cat.codes.to_numpy()[rows]
+        scores = frame['recommendation_score'].to_numpy()[rows]
+        
+        # Kullanıcı → skor azalan; lexsort kararlı olduğu için eşitlikte satır sırası
+        order = np.lexsort((-scores, users))
+        sorted_users = users[order]
+        positions = np.arange(len(order))
+        group_start = np.maximum.accumulate(
+            np.where(np.r_[True, sorted_users[1:] != sorted_users[:-1]], positions, 0)
+        )
+        keep = order[positions - group_start < top_k]
+        
+        # Kullanıcıları ilk görülme sırasına diz (grup içi sıra korunur)
+        unique_users, first_seen = np.unique(users, return_index=True)
+        appearance = np.empty(len(frame['user_id'].cat.categories), dtype=np.int64)
+        appearance[unique_users] = np.argsort(np.argsort(first_seen))
+        keep = keep[np.argsort(appearance[users[keep]], kind='stable')]
+        
+        user_names = frame['user_id'].cat.categories.to_numpy()
+        persona_names = frame['persona_id'].cat.categories.to_numpy()
+        persona_codes = frame['persona_id'].cat.codes.to_numpy()[rows]
+        best_matches = {}
+        for user_id, persona_id in zip(user_names[users[keep]].tolist(),
+                                       persona_names[persona_codes[keep]].tolist()):
+            best_matches.setdefault(user_id, []).append(persona_id)
+        return best_matches
+    
+    def analyze(self, top_k: int = 3, modes: Sequence[str] = MATCHING_MODES) -> Dict:
+        """
+        analyze_results formatında özet (mod başına tek gruplama geçişi)
+        
+        Args:
+            top_k: Best-k için K
+            modes: Raporlanacak modlar
+        """
+        frame = self.frame
+        mode_stats = (frame['recommendation_score'].astype(np.float64)
+                      .groupby(frame['mode'], observed=True).agg(['mean', 'std']))
+        category_counts = frame.groupby(['user_domain', 'mode', 'persona_category'],
+                                        observed=True).size()
+        persona_counts = frame.groupby('persona_id', observed=True).size()
+        
+        def category_preference(user_domain):
+            def count(mode, category):
+                return int(category_counts.get((user_domain, mode, category), 0))
+            
+            return {
+                f'{mode}_mode': {
+                    'education_personas': count(mode, 'education'),
+                    'technology_personas': count(mode, 'technology')
+                }
+                for mode in modes
+            }
+        
+        return {
+            'total_matchings': len(frame),
+            
+            # Mode comparison
+            **{
+                f'{mode}_mode': {
+                    'mean_score': mode_stats['mean'].get(mode, np.nan),
+                    'std': mode_stats['std'].get(mode, np.nan)
+                }
+                for mode in modes
+            },
+            
+            # Best matches per user
+            **{f'best_{mode}_matches': self.best_k(mode, top_k) for mode in modes},
+            
+            # Persona popularity
+            'persona_selection_frequency': {
+                persona_id: int(count) for persona_id, count in persona_counts.items()
+            },
+            
+            # Category preference by user domain
+            'tech_users_prefer': category_preference('technical'),
+            'edu_users_prefer': category_preference('educational')
+        }
+
+
+class MatchingResultSink:
+    """
+    Matching chunk'larını üretildikleri anda dosyaya ekleyen sink
+    
+    .parquet uzantısı pyarrow ile tek bir Parquet dosyasına row group olarak,
+    diğer uzantılar UTF-8 BOM'lu (Excel için) CSV olarak yazılır.
+    """
+    
+    def __init__(self, filepath: Union[str, Path]):
+        """
+        Args:
+            filepath: Çıktı dosyası (varsa üzerine yazılır)
+        """
+        self.filepath = Path(filepath)
+        self.format = 'parquet' if self.filepath.suffix == '.parquet' else 'csv'
+        if self.format == 'parquet' and not PYARROW_AVAILABLE:
+            raise ImportError("Parquet çıktısı için pyarrow gerekli (pip install pyarrow)")
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.rows_written = 0
+        self._handle = None
+        self._writer = None
+    
+    def write(self, chunk: pd.DataFrame):
+        """Bir chunk'ı dosyanın sonuna ekle"""
+        if self.format == 'parquet':
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.filepath, table.schema)
+            self._writer.write_table(table)
+        else:
+            header = self._handle is None
+            if header:
+                # BOM yalnızca dosya başına yazılır
+                self._handle = open(self.filepath, 'w', encoding='utf-8-sig', newline='')
+            chunk.to_csv(self._handle, index=False, header=header)
+        self.rows_written += len(chunk)
+    
+    def close(self):
+        """Dosyayı kapat"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_matching_chunks(filepath: Union[str, Path], chunk_size: int = 200_000,
+                         columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    run_to_file çıktısını chunk'lar halinde oku
+    
+    Args:
+        filepath: .csv veya .parquet dosyası
+        chunk_size: Chunk başına satır sayısı
+        columns: Okunacak sütunlar (None = ANALYSIS_COLUMNS)
+        
+    Yields:
+        DataFrame chunk'ları
+    """
+    columns = columns or ANALYSIS_COLUMNS
+    if Path(filepath).suffix == '.parquet':
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet okumak için pyarrow gerekli (pip install pyarrow)")
+        for batch in pq.ParquetFile(filepath).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(filepath, usecols=columns, chunksize=chunk_size, encoding='utf-8-sig')
+
+
+class StreamingMatchingAnalysis:
+    """
+    analyze_results toplamlarını chunk chunk biriktiren analiz
+    
+    Mode istatistikleri (n, ortalama, M2) birleştirme ile, frekanslar sayaç
+    olarak tutulur. Best-k için her chunk'ta yalnızca kullanıcı başına ilk k
+    satır saklanır; böylece bellek matching sayısıyla değil çıktı boyutu
+    (U×k) ile büyür.
+    """
+    
+    def __init__(self, top_k: int = 3, modes: Sequence[str] = MATCHING_MODES):
+        self.top_k = top_k
+        self.modes = tuple(modes)
+        self.total_matchings = 0
+        self._moments = {mode: (0, 0.0, 0.0) for mode in self.modes}
+        self._candidates = {mode: [] for mode in self.modes}
+        self._persona_counts = Counter()
+        self._category_counts = Counter()
+    
+    def update(self, chunk: pd.DataFrame):
+        """Bir chunk'ı toplamlara ekle"""
+        order = np.arange(self.total_matchings, self.total_matchings + len(chunk))
+        chunk = chunk.assign(_order=order)
+        self.total_matchings += len(chunk)
+        
+        for mode, mode_df in chunk.groupby('mode', sort=False):
+            if mode not in self._moments:
+                continue
+            scores = mode_df['recommendation_score'].to_numpy(dtype=np.float64)
+            self._moments[mode] = self._merge_moments(
+                self._moments[mode], (len(scores), scores.mean(), ((scores - scores.mean()) ** 2).sum())
+            )
+            # nlargest(keep='first') ile aynı: skor azalan, eşitlikte önce gelen
+            top = (mode_df.sort_values(['recommendation_score', '_order'], ascending=[False, True])
+                          .groupby('user_id', sort=False).head(self.top_k))
+            self._candidates[mode].append(top[['user_id', 'persona_id', 'recommendation_score', '_order']])
+        
+        self._persona_counts.update(chunk.groupby('persona_id').size().to_dict())
+        self._category_counts.update(
+            chunk.groupby(['user_domain', 'mode', 'persona_category']).size().to_dict()
+        )
+    
+    def merge(self, other: 'StreamingMatchingAnalysis') -> 'StreamingMatchingAnalysis':
+        """
+        Sonraki shard'ın analizini ekle
+        
+        Shard'lar dosya sırasıyla birleştirilirse sonuç, tüm satırların tek
+        analizden geçmesiyle aynıdır (eşitlik bozma ve ilk görülme sırası dahil).
+        """
+        for mode in self.modes:
+            self._moments[mode] = self._merge_moments(self._moments[mode], other._moments[mode])
+            self._candidates[mode].extend(
+                candidates.assign(_order=candidates['_order'] + self.total_matchings)
+                for candidates in other._candidates[mode]
+            )
+        self._persona_counts.update(other._persona_counts)
+        self._category_counts.update(other._category_counts)
+        self.total_matchings += other.total_matchings
+        return self
+    
+    @staticmethod
+    def _merge_moments(a, b):
+        """Chan et al. paralel varyans birleştirmesi: (n, mean, M2)"""
+        n_a, mean_a, m2_a = a
+        n_b, mean_b, m2_b = b
+        n = n_a + n_b
+        if n == 0:
+            return a
+        delta = mean_b - mean_a
+        return n, mean_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    
+    def _best_matches(self, mode: str) -> Dict:
+        """Chunk adaylarından kullanıcı başına final top-k (ilk görülme sırasıyla)"""
+        if not self._candidates[mode]:
+            return {}
+        candidates = pd.concat(self._candidates[mode], ignore_index=True)
+        first_seen = candidates.groupby('user_id', sort=False)['_order'].transform('min')
+        top = (candidates.assign(_first=first_seen)
+                         .sort_values(['recommendation_score', '_order'], ascending=[False, True])
+                         .groupby('user_id', sort=False).head(self.top_k)
+                         .sort_values('_first', kind='stable'))
+        # Grup başına dilimleme yerine tek geçiş
+        best_matches = {}
+        for user_id, persona_id in zip(top['user_id'].tolist(), top['persona_id'].tolist()):
+            best_matches.setdefault(user_id, []).append(persona_id)
+        return best_matches
+    
+    def _category_preference(self, user_domain: str) -> Dict:
+        counts = self._category_counts
+        
+        def count(mode, category):
+            return counts[(user_domain, mode, category)]
+        
+        return {
+            f'{mode}_mode': {
+                'education_personas': count(mode, 'education'),
+                'technology_personas': count(mode, 'technology')
+            }
+            for mode in self.modes
+        }
+    
+    def result(self) -> Dict:
+        """analyze_results ile aynı formatta analiz"""
+        mode_stats = {}
+        for mode, (n, mean, m2) in self._moments.items():
+            mode_stats[f'{mode}_mode'] = {
+                'mean_score': mean if n > 0 else np.nan,
+                'std': np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+            }
+        
+        return {
+            'total_matchings': self.total_matchings,
+            **mode_stats,
+            **{f'best_{mode}_matches': self._best_matches(mode) for mode in self.modes},
+            'persona_selection_frequency': dict(sorted(self._persona_counts.items())),
+            'tech_users_prefer': self._category_preference('technical'),
+            'edu_users_prefer': self._category_preference('educational')
+        }
+
+
+# Worker process başına tek MatchingTester (kendi RecommendationEngine'i ile)
+_WORKER_TESTER = None
+
+
+def _run_shard(shard_index: int, users, filepath: str, chunk_size: int,
+               modes: Sequence[str], task_complexity: float,
+               progress_queue) -> 'StreamingMatchingAnalysis':
+    """
+    Bir shard'ı skorla, dosyasına yaz ve analizini döndür (process pool işçisi)
+    
+    Her chunk sonrası progress_queue'ya (shard_index, kullanıcı sayısı) yazılır.
+    """
+    global _WORKER_TESTER
+    if _WORKER_TESTER is None:
+        _WORKER_TESTER = MatchingTester()
+    
+    if isinstance(users, SyntheticUserColumns):
+        users = users.iter_users()
+    
+    analysis = StreamingMatchingAnalysis(modes=modes)
+    n_personas_modes = len(_WORKER_TESTER.personas) * len(modes)
+    with MatchingResultSink(filepath) as sink:
+        for chunk in _WORKER_TESTER.iter_matchings(users, chunk_size=chunk_size, modes=modes,
+                                                   task_complexity=task_complexity):
+            sink.write(chunk)
+            analysis.update(chunk)
+            progress_queue.put((shard_index, len(chunk) // n_personas_modes))
+    return analysis
+
+
+class _DirectProgress:
+    """Tek process modunda progress_queue yerine doğrudan callback"""
+    
+    def __init__(self, handler: Callable):
+        self.put = handler
+
+
+class ShardedMatchingRunner:
+    """
+    MatchingTester'ı kullanıcı shard'ları halinde çok çekirdekte çalıştırır
+    
+    Her worker process kendi MatchingTester/RecommendationEngine'ini kurar,
+    shard'ını kendi dosyasına (shard_0000.csv, ...) yazar ve bir
+    StreamingMatchingAnalysis döndürür; analizler shard sırasıyla
+    birleştirilir. İlerleme self.progress'te tutulur ve her güncellemede
+    progress callback'i ana thread'de çağrılır (Streamlit progress bar için).
+    """
+    
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 1000,
+                 modes: Sequence[str] = MATCHING_MODES, task_complexity: float = 0.5):
+        """
+        Args:
+            workers: Process sayısı (None = os.cpu_count(), 1 = mevcut process)
+            chunk_size: Worker içindeki user chunk boyutu
+            modes: Skorlama modları
+            task_complexity: Görev karmaşıklığı
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.modes = tuple(modes)
+        self.task_complexity = task_complexity
+        self.progress = {'done_users': 0, 'total_users': 0, 'finished_shards': 0, 'total_shards': 0}
+    
+    def _shards(self, users, n_shards: int) -> List:
+        """Kullanıcıları ardışık, yaklaşık eşit shard'lara böl"""
+        if not isinstance(users, (SyntheticUserColumns, list)):
+            users = list(users)
+        bounds = np.linspace(0, len(users), n_shards + 1).astype(int)
+        return [
+            users.subset(start, stop) if isinstance(users, SyntheticUserColumns) else users[start:stop]
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+    
+    def run(self, users, output_dir: str = 'data/matching_shards', n_shards: Optional[int] = None,
+            file_format: str = 'csv', progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Sharded matching çalıştır
+        
+        Args:
+            users: User dict listesi/iterator'ı veya SyntheticUserColumns
+                (kolonlar shard'lara kopyasız bölünür, dict'ler worker'da üretilir)
+            output_dir: Shard dosyalarının yazılacağı klasör
+            n_shards: Shard sayısı (None = workers × 4, yük dengesi için)
+            file_format: 'csv' veya 'parquet'
+            progress: self.progress dict'ini alan callback
+            
+        Returns:
+            {
+                "shard_files": shard dosya yolları (sıralı),
+                "rows_written": toplam satır,
+                "analysis": birleştirilmiş analyze_results çıktısı,
+                "elapsed": saniye
+            }
+        """
+        start_time = time.time()
+        shards = self._shards(users, n_shards or self.workers * 4)
+        output_dir = Path(output_dir)
+        shard_files = [str(output_dir / f'shard_{index:04d}.{file_format}') for index in range(len(shards))]
+        
+        self.progress = {
+            'done_users': 0,
+            'total_users': sum(len(shard) for shard in shards),
+            'finished_shards': 0,
+            'total_shards': len(shards)
+        }
+        
+        def report(update=None):
+            # update: worker'dan (shard_index, kullanıcı sayısı); None = shard bitti
+            if update is None:
+                self.progress['finished_shards'] += 1
+            else:
+                self.progress['done_users'] += update[1]
+            if progress:
+                progress(self.progress)
+        
+        def task(index, queue):
+            return (index, shards[index], shard_files[index], self.chunk_size,
+                    self.modes, self.task_complexity, queue)
+        
+        analyses = [None] * len(shards)
+        if self.workers == 1 or len(shards) <= 1:
+            direct = _DirectProgress(report)
+            for index in range(len(shards)):
+                analyses[index] = _run_shard(*task(index, direct))
+                report()
+        else:
+            with Manager() as manager, ProcessPoolExecutor(max_workers=self.workers) as executor:
+                queue = manager.Queue()
+                futures = {executor.submit(_run_shard, *task(index, queue)): index
+                           for index in range(len(shards))}
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    while not queue.empty():
+                        report(queue.get())
+                    for future in done:
+                        analyses[futures[future]] = future.result()
+                        report()
+                while not queue.empty():
+                    report(queue.get())
+        
+        merged = StreamingMatchingAnalysis(modes=self.modes)
+        for analysis in analyses:
+            merged.merge(analysis)
+        
+        return {
+            'shard_files': shard_files,
+            'rows_written': merged.total_matchings,
+            'analysis': merged.result(),
+            'elapsed': time.time() - start_time
+        }
+
+
 # Test için
 if __name__ == "__main__":
     print("🧪 Matching Tester - Quick Test\n")
@@ -198,6 +766,27 @@ if __name__ == "__main__":
     # Export
     tester.export_results('data/matching_test_small.csv')
     
+    # Streaming: 20k user, sabit bellek
+    import time
+    cohort = SyntheticUserGenerator(seed=42).generate_columns(n_per_stratum=2_000)
+    start = time.time()
+    rows = MatchingTester().run_to_file(cohort.iter_users(), 'data/matching_stream.csv', chunk_size=2000)
+    print(f"⚡ {rows:,} satır {time.time() - start:.1f}s içinde yazıldı")
+    start = time.time()
+    streamed = tester.analyze_results('data/matching_stream.csv')
+    print(f"📊 Streaming analiz {time.time() - start:.1f}s: "
+          f"similarity M={streamed['similarity_mode']['mean_score']:.3f}, "
+          f"complementary M={streamed['complementary_mode']['mean_score']:.3f}")
+    
+    # Sharded: tüm çekirdekler, shard başına dosya
+    runner = ShardedMatchingRunner()
+    sharded = runner.run(
+        cohort, output_dir='data/matching_shards',
+        progress=lambda p: print(f"\r  ⏳ {p['done_users']:,}/{p['total_users']:,} user", end='')
+    )
+    print(f"\n⚡ {runner.workers} worker, {len(sharded['shard_files'])} shard: "
+          f"{sharded['rows_written']:,} satır {sharded['elapsed']:.1f}s içinde")
+    
     print("\n✅ Test tamamlandı!")
 
 
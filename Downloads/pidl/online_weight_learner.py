@@ -0,0 +1,387 @@
+"""
+Çevrimiçi Ağırlık Öğrenici (Online Feedback Learner)
+
+optimize_persona_weights her çağrıda tüm feedback listesini yeniden tarar.
+Bu modül ise puanlar (ör. AICodeEvaluation satırları) geldikçe α, β, γ, δ'yı
+artımlı olarak günceller ve segment (kullanıcı / Dreyfus seviyesi) başına
+yalnızca sabit boyutlu yeterli istatistikleri tutar:
+
+    f = [S|1-S, C|D, P, L]   (mod'a göre özellikler, bkz. weight_sweep.mode_features)
+    r ∈ [0, 1]               (normalize edilmiş puan)
+
+    Üstel ağırlıklı (EW) momentler:  T, E[f], E[r], E[ffᵀ], E[fr], E[r²]
+
+Amaç fonksiyonu weight_sweep.rating_objective ile aynıdır: tahmin edilen
+skor (w·f) ile puan arasındaki Pearson korelasyonu
+
+    ρ(w) = wᵀc / √(wᵀΣw · σ²_r),   Σ = Cov(f),  c = Cov(f, r)
+
+Her puanda momentler O(1) güncellenir ve simplex üzerinde birkaç
+exponentiated-gradient adımı atılır; geçmiş hiçbir zaman yeniden okunmaz.
+Durum snapshot() ile JSON'a alınıp restore edilebilir.
+
+Öğrenici thread-safe'tir (güncelleme, okuma ve kaydetme tek lock altında);
+save() önce geçici dosyaya yazar, sonra os.replace ile atomik olarak
+değiştirir, böylece yarım yazılmış dosya okunmaz.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from recommendation_engine import RecommendationEngine, UserVector, SCORING_MODES
+from weight_sweep import WEIGHT_NAMES, mode_features
+
+
+GLOBAL_SEGMENT = "global"
+
+# AICodeEvaluation'daki 1-10 Likert maddeleri
+EVALUATION_ITEMS = (
+    "code_understandability",
+    "explanation_quality",
+    "educational_value",
+    "perceived_code_quality",
+    "perceived_security"
+)
+
+
+@dataclass
+class SegmentState:
+    """Bir segmentin sabit boyutlu yeterli istatistikleri"""
+    log_weights: np.ndarray  # (4,) simplex ağırlıklarının logaritması
+    total: float = 0.0  # EW örnek ağırlığı (etkin örnek sayısı)
+    sum_features: np.ndarray = field(default_factory=lambda: np.zeros(4))
+    sum_rating: float = 0.0
+    sum_outer: np.ndarray = field(default_factory=lambda: np.zeros((4, 4)))
+    sum_cross: np.ndarray = field(default_factory=lambda: np.zeros(4))
+    sum_rating_sq: float = 0.0
+    n_updates: int = 0
+
+    @property
+    def weights(self) -> np.ndarray:
+        w = np.exp(self.log_weights - self.log_weights.max())
+        return w / w.sum()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "log_weights": self.log_weights.tolist(),
+            "total": self.total,
+            "sum_features": self.sum_features.tolist(),
+            "sum_rating": self.sum_rating,
+            "sum_outer": self.sum_outer.tolist(),
+            "sum_cross": self.sum_cross.tolist(),
+            "sum_rating_sq": self.sum_rating_sq,
+            "n_updates": self.n_updates
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentState":
+        return cls(
+            log_weights=np.array(data["log_weights"], dtype=np.float64),
+            total=float(data["total"]),
+            sum_features=np.array(data["sum_features"], dtype=np.float64),
+            sum_rating=float(data["sum_rating"]),
+            sum_outer=np.array(data["sum_outer"], dtype=np.float64),
+            sum_cross=np.array(data["sum_cross"], dtype=np.float64),
+            sum_rating_sq=float(data["sum_rating_sq"]),
+            n_updates=int(data["n_updates"])
+        )
+
+
+def rating_from_evaluation(evaluation) -> float:
+    """
+    AICodeEvaluation satırını (veya save_ai_evaluation response dict'ini) [0, 1] puana çevir
+
+    Beş 1-10 maddenin ortalaması: (ortalama - 1) / 9
+    """
+    if isinstance(evaluation, dict):
+        values = [evaluation.get(item) for item in EVALUATION_ITEMS]
+    else:
+        values = [getattr(evaluation, item, None) for item in EVALUATION_ITEMS]
+    values = [v for v in values if v is not None]
+    if not values:
+        raise ValueError("Değerlendirmede puan maddesi yok")
+    return (float(np.mean(values)) - 1) / 9
+
+
+def level_segment(user_vector: UserVector) -> str:
+    """Varsayılan segment: technical_skill'e karşılık gelen Dreyfus seviyesi"""
+    for level, value in RecommendationEngine.LEVEL_MAPPING.items():
+        if user_vector.technical_skill == value:
+            return level
+    return GLOBAL_SEGMENT
+
+
+class OnlineWeightLearner:
+    """Puan akışından α, β, γ, δ'yı artımlı öğrenen sabit bellekli öğrenici"""
+
+    def __init__(self, engine: RecommendationEngine, mode: str = "adaptive",
+                 learning_rate: float = 0.5, decay: float = 0.99, steps: int = 3,
+                 prior_pull: float = 0.01, min_weight: float = 0.02,
+                 min_segment_count: float = 10.0,
+                 segment_fn: Optional[Callable[[UserVector], str]] = level_segment):
+        """
+        Args:
+            engine: Recommendation engine (özellikler ve prior ağırlıklar)
+            mode: Varsayılan skorlama modu (update'te değiştirilebilir)
+            learning_rate: Exponentiated-gradient adım boyu
+            decay: EW unutma katsayısı (etkin pencere ≈ 1 / (1 - decay) puan)
+            steps: Puan başına gradient adımı
+            prior_pull: Her adımda engine ağırlıklarına doğru çekme oranı
+            min_weight: Hiçbir bileşen bu değerin altına düşmez
+            min_segment_count: Segment ağırlıkları bu etkin sayıya ulaşana kadar
+                global ağırlıklar kullanılır
+            segment_fn: UserVector → segment anahtarı (None = yalnızca global)
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Geçersiz mod: {mode}. {SCORING_MODES} olmalı.")
+
+        self.engine = engine
+        self.mode = mode
+        self.learning_rate = learning_rate
+        self.decay = decay
+        self.steps = steps
+        self.prior_pull = prior_pull
+        self.min_weight = min_weight
+        self.min_segment_count = min_segment_count
+        self.segment_fn = segment_fn
+
+        self.prior = np.array([getattr(engine, name) for name in WEIGHT_NAMES], dtype=np.float64)
+        self.prior = self.prior / self.prior.sum()
+        self.segments: Dict[str, SegmentState] = {}
+        # Paylaşılan öğrenici (ör. Streamlit cache_resource) için
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Özellikler
+    # ------------------------------------------------------------------
+
+    def features(self, user_vector: UserVector, persona_id: str,
+                 mode: Optional[str] = None, task_complexity: float = 0.5) -> np.ndarray:
+        """Tek (kullanıcı, persona) çifti için (4,) özellik vektörü"""
+        components = self.engine.score_components([user_vector], personas=[persona_id],
+                                                  task_complexity=task_complexity)
+        return mode_features(components, components["learning_goal"], mode or self.mode)[0, 0]
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+
+    def _state(self, segment: str) -> SegmentState:
+        if segment not in self.segments:
+            self.segments[segment] = SegmentState(log_weights=np.log(self.prior))
+        return self.segments[segment]
+
+    def _gradient(self, state: SegmentState, weights: np.ndarray) -> np.ndarray:
+        """EW momentlerden Pearson korelasyonunun ağırlıklara göre gradyanı"""
+        mean_features = state.sum_features / state.total
+        mean_rating = state.sum_rating / state.total
+        covariance = state.sum_outer / state.total - np.outer(mean_features, mean_features)
+        cross = state.sum_cross / state.total - mean_features * mean_rating
+        rating_var = state.sum_rating_sq / state.total - mean_rating ** 2
+
+        score_var = weights @ covariance @ weights
+        if score_var <= 1e-12 or rating_var <= 1e-12:
+            return np.zeros_like(weights)
+        score_std = np.sqrt(score_var)
+        covariance_wr = weights @ cross
+        # ∇ρ = c / (σ_s σ_r) - (wᵀc) Σw / (σ_s³ σ_r)
+        return (cross / score_std - covariance_wr * (covariance @ weights) / score_var ** 1.5) / np.sqrt(rating_var)
+
+    def _update_state(self, state: SegmentState, features: np.ndarray, rating: float):
+        """Momentleri O(1) güncelle ve simplex üzerinde EG adımları at"""
+        state.total = self.decay * state.total + 1.0
+        state.sum_features = self.decay * state.sum_features + features
+        state.sum_rating = self.decay * state.sum_rating + rating
+        state.sum_outer = self.decay * state.sum_outer + np.outer(features, features)
+        state.sum_cross = self.decay * state.sum_cross + features * rating
+        state.sum_rating_sq = self.decay * state.sum_rating_sq + rating ** 2
+        state.n_updates += 1
+
+        if state.n_updates < 2:
+            return
+        log_prior = np.log(self.prior)
+        for _ in range(self.steps):
+            log_weights = state.log_weights + self.learning_rate * self._gradient(state, state.weights)
+            log_weights = (1 - self.prior_pull) * log_weights + self.prior_pull * log_prior
+            weights = np.exp(log_weights - log_weights.max())
+            weights = np.maximum(weights / weights.sum(), self.min_weight)
+            state.log_weights = np.log(weights / weights.sum())
+
+    def update_features(self, features: np.ndarray, rating: float,
+                        segment: Optional[str] = None) -> Dict[str, float]:
+        """
+        Hazır özellik vektörüyle güncelle (global + segment)
+
+        Args:
+            features: (4,) mod özellikleri
+            rating: [0, 1] puan
+            segment: Segment anahtarı (None = yalnızca global)
+
+        Returns:
+            Segmentin güncel ağırlıkları
+        """
+        features = np.asarray(features, dtype=np.float64)
+        with self._lock:
+            self._update_state(self._state(GLOBAL_SEGMENT), features, float(rating))
+            if segment is not None and segment != GLOBAL_SEGMENT:
+                self._update_state(self._state(segment), features, float(rating))
+            return self.weights(segment)
+
+    def update(self, user_vector: UserVector, persona_id: str, rating: float,
+               mode: Optional[str] = None, task_complexity: float = 0.5,
+               segment: Optional[str] = None) -> Dict[str, float]:
+        """
+        Tek puanla artımlı güncelleme
+
+        Args:
+            user_vector: Puanı veren kullanıcının vektörü
+            persona_id: Puanlanan persona
+            rating: [0, 1] aralığında puan
+            mode: Persona'nın atandığı mod (None = öğrenicinin modu)
+            task_complexity: Görev karmaşıklığı
+            segment: Segment anahtarı (None = segment_fn ile belirlenir)
+
+        Returns:
+            Segmentin güncel ağırlıkları
+        """
+        if segment is None and self.segment_fn is not None:
+            segment = self.segment_fn(user_vector)
+        return self.update_features(
+            self.features(user_vector, persona_id, mode, task_complexity), rating, segment
+        )
+
+    def update_from_evaluation(self, user_vector: UserVector, persona_id: str, evaluation,
+                               mode: Optional[str] = None,
+                               task_complexity: float = 0.5) -> Dict[str, float]:
+        """AICodeEvaluation satırı (veya response dict'i) ile güncelle"""
+        return self.update(user_vector, persona_id, rating_from_evaluation(evaluation),
+                           mode=mode, task_complexity=task_complexity)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    def weights(self, segment: Optional[str] = None) -> Dict[str, float]:
+        """Segmentin güncel ağırlıkları (yeterli veri yoksa global, o da yoksa prior)"""
+        with self._lock:
+            state = self.segments.get(segment) if segment is not None else None
+            if state is None or state.total < self.min_segment_count:
+                state = self.segments.get(GLOBAL_SEGMENT)
+            weights = state.weights if state is not None else self.prior
+            return dict(zip(WEIGHT_NAMES, weights.tolist()))
+
+    def weights_for(self, user_vector: UserVector) -> Dict[str, float]:
+        """Kullanıcının segmentine göre ağırlıklar"""
+        segment = self.segment_fn(user_vector) if self.segment_fn is not None else None
+        return self.weights(segment)
+
+    def apply(self, segment: Optional[str] = None):
+        """
+        Güncel ağırlıkları engine'e uygula
+
+        Not: Engine fingerprint'i değişir; bağlı RecommendationTable'lar
+        otomatik olarak devre dışı kalır.
+        """
+        for name, value in self.weights(segment).items():
+            setattr(self.engine, name, value)
+
+    # ------------------------------------------------------------------
+    # Snapshot / restore
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON'a yazılabilir tam durum"""
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """snapshot gövdesi (lock tutulurken çağrılır)"""
+        return {
+            "config": {
+                "mode": self.mode,
+                "learning_rate": self.learning_rate,
+                "decay": self.decay,
+                "steps": self.steps,
+                "prior_pull": self.prior_pull,
+                "min_weight": self.min_weight,
+                "min_segment_count": self.min_segment_count
+            },
+            "prior": self.prior.tolist(),
+            "segments": {name: state.to_dict() for name, state in self.segments.items()}
+        }
+
+    def restore(self, snapshot: Dict[str, Any]):
+        """snapshot() çıktısından durumu geri yükle"""
+        segments = {
+            name: SegmentState.from_dict(data) for name, data in snapshot["segments"].items()
+        }
+        with self._lock:
+            for key, value in snapshot["config"].items():
+                setattr(self, key, value)
+            self.prior = np.array(snapshot["prior"], dtype=np.float64)
+            self.segments = segments
+
+    def save(self, filepath: str = 'data/weight_learner.json'):
+        """
+        Snapshot'ı JSON olarak atomik kaydet
+
+        Aynı dizinde geçici dosyaya yazılır ve os.replace ile asıl dosyanın
+        yerine konur; eşzamanlı okuyucular eski ya da yeni dosyayı tam görür.
+        Lock yazma boyunca tutulur, böylece kayıtlar sırayla uygulanır.
+        """
+        directory = os.path.dirname(filepath) or "."
+        with self._lock:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".weight_learner.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self._snapshot(), f, indent=2)
+                os.replace(temp_path, filepath)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    @classmethod
+    def load(cls, engine: RecommendationEngine,
+             filepath: str = 'data/weight_learner.json', **kwargs) -> "OnlineWeightLearner":
+        """Kaydedilmiş öğreniciyi yükle"""
+        learner = cls(engine, **kwargs)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            learner.restore(json.load(f))
+        return learner
+
+
+# Test için
+if __name__ == "__main__":
+    from synthetic_user_generator import SyntheticUserGenerator
+
+    engine = RecommendationEngine()
+    users = SyntheticUserGenerator(seed=42).generate_users(n_per_stratum=30)
+    user_vecs = [engine.create_user_vector(u) for u in users]
+
+    # Gizli "gerçek" ağırlıklarla üretilmiş puan akışı
+    true_weights = np.array([0.10, 0.20, 0.30, 0.40])
+    learner = OnlineWeightLearner(engine, mode="similarity", decay=0.995)
+    rng = np.random.default_rng(0)
+    persona_ids = list(engine.persona_vectors)
+
+    for step in range(3000):
+        user_vec = user_vecs[rng.integers(len(user_vecs))]
+        persona_id = persona_ids[rng.integers(len(persona_ids))]
+        features = learner.features(user_vec, persona_id)
+        rating = float(np.clip(features @ true_weights * 1.5 + rng.normal(0, 0.05), 0, 1))
+        learner.update_features(features, rating, segment=level_segment(user_vec))
+
+    print("✅ 3000 puan işlendi")
+    print(f"  Gerçek: {dict(zip(WEIGHT_NAMES, true_weights.tolist()))}")
+    print(f"  Öğrenilen (global): { {k: round(v, 3) for k, v in learner.weights().items()} }")
+    print(f"  Segment sayısı: {len(learner.segments)}")
+
+    restored = OnlineWeightLearner(engine)
+    restored.restore(json.loads(json.dumps(learner.snapshot())))
+    assert restored.weights() == learner.weights()
+    print("  Snapshot / restore: OK")
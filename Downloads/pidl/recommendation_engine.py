@@ -10,9 +10,11 @@ Teorik Temeller:
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from collections.abc import Mapping
+from typing import Dict, List, Tuple, Optional, Sequence, Union, Iterator
+from dataclasses import dataclass, field, fields
 import json
+import hashlib
 
 # Scipy yerine numpy ile kendi fonksiyonlarımız
 def cosine_similarity(a, b):
@@ -44,9 +46,15 @@ class UserVector:
     abstraction_level: float  # Soyutlama seviyesi
 
 
-@dataclass
+@dataclass(frozen=True)
 class PersonaVector:
-    """Persona karakteristik vektörü"""
+    """
+    Persona karakteristik vektörü
+
+    Değiştirilemez (frozen): PersonaStore matrisi ve fingerprint'i vektörlerden
+    bir kez türetilir; değişiklik için dataclasses.replace ile yeni vektör
+    oluşturulup yeni store kurulur.
+    """
     persona_id: str
     
     # Kod özellikleri
@@ -66,6 +74,484 @@ class PersonaVector:
     innovation_factor: float  # Yenilikçilik
 
 
+# Vektör boyutlarının matris kolon sırası (batch hesaplamalar için)
+USER_VECTOR_FIELDS = tuple(f.name for f in fields(UserVector))
+PERSONA_VECTOR_FIELDS = tuple(f.name for f in fields(PersonaVector) if f.name != "persona_id")
+
+# Batch skorlamada desteklenen modlar ve mod'dan bağımsız bileşenler
+SCORING_MODES = ("similarity", "complementary", "hybrid", "adaptive")
+SCORE_COMPONENTS = (
+    "similarity",
+    "competency_match",
+    "performance_prediction",
+    "learning_trajectory",
+    "complementarity"
+)
+
+# Persona id'lerinden (ör. "edu_competent", "tech_expert_v12") kategori ve seviye
+DREYFUS_LEVELS = ('novice', 'advanced_beginner', 'competent', 'proficient', 'expert')
+PERSONA_CATEGORY_PREFIXES = {"edu": "education", "tech": "technology"}
+
+
+def persona_metadata(persona_id: str) -> Tuple[str, str]:
+    """
+    Persona id'sinden (category, dreyfus_level) çıkar
+
+    Bilinmeyen önek veya seviye için boş string döner (filtrelerde eşleşmez).
+    """
+    prefix, _, rest = persona_id.partition("_")
+    category = PERSONA_CATEGORY_PREFIXES.get(prefix, "")
+    level = next(
+        (level for level in DREYFUS_LEVELS if rest == level or rest.startswith(level + "_")),
+        ""
+    )
+    return category, level
+
+
+def select_top_k(scores: np.ndarray, top_k: int,
+                 mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Skor vektöründen (P,) veya matrisinden (U×P) azalan sırada top-k indeks
+
+    np.argpartition ile O(P) seçim yapılır, yalnızca seçilen k eleman
+    sıralanır. Eşit skorlarda düşük indeks önce gelir; sonuç
+    np.argsort(-scores, kind="stable")[..., :top_k] ile birebir aynıdır.
+
+    Args:
+        scores: (P,) veya U×P skorlar
+        top_k: En iyi K
+        mask: (P,) boolean persona maskesi (False olanlar seçilmez)
+
+    Returns:
+        (k,) veya U×k persona indeksleri, k = min(top_k, maskelenmiş persona sayısı)
+    """
+    scores = np.asarray(scores)
+    columns = np.arange(scores.shape[-1]) if mask is None else np.flatnonzero(mask)
+    if mask is not None:
+        scores = scores[..., columns]
+
+    n_candidates = scores.shape[-1]
+    top_k = max(0, min(top_k, n_candidates))
+    if top_k == 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    if top_k == n_candidates:
+        return columns[np.argsort(-scores, axis=-1, kind="stable")]
+
+    selected = np.argpartition(-scores, top_k - 1, axis=-1)[..., :top_k]
+    selected_scores = np.take_along_axis(scores, selected, axis=-1)
+    # Seçilenler içinde (skor ↓, indeks ↑) sıralaması
+    order = np.lexsort((selected, -selected_scores), axis=-1)
+    selected = np.take_along_axis(selected, order, axis=-1)
+
+    # k. sınırda seçilmeyen eşit skor varsa argpartition'ın seçimi keyfidir;
+    # yalnızca bu satırlar tam stable sıralama ile yeniden hesaplanır
+    kth = np.take_along_axis(scores, selected[..., -1:], axis=-1)
+    ambiguous = (scores >= kth).sum(axis=-1) > top_k
+    if np.any(ambiguous):
+        if scores.ndim == 1:
+            selected = np.argsort(-scores, kind="stable")[:top_k]
+        else:
+            selected[ambiguous] = np.argsort(-scores[ambiguous], axis=-1, kind="stable")[:, :top_k]
+    return columns[selected]
+
+
+def user_vectors_to_array(users: Union[Sequence[UserVector], np.ndarray]) -> np.ndarray:
+    """
+    UserVector listesini U×10 matrise çevir
+
+    Kolon sırası USER_VECTOR_FIELDS ile aynıdır. Zaten matris verilirse
+    kopyalanmadan float64'e çevrilip döndürülür.
+    """
+    if isinstance(users, np.ndarray):
+        matrix = np.asarray(users, dtype=np.float64)
+    else:
+        matrix = np.array(
+            [[getattr(user, name) for name in USER_VECTOR_FIELDS] for user in users],
+            dtype=np.float64
+        )
+    matrix = matrix.reshape(-1, len(USER_VECTOR_FIELDS))
+    return matrix
+
+
+def persona_vectors_to_array(personas: Sequence[PersonaVector]) -> np.ndarray:
+    """PersonaVector listesini P×10 matrise çevir (kolon sırası PERSONA_VECTOR_FIELDS)"""
+    matrix = np.array(
+        [[getattr(persona, name) for name in PERSONA_VECTOR_FIELDS] for persona in personas],
+        dtype=np.float64
+    )
+    return matrix.reshape(-1, len(PERSONA_VECTOR_FIELDS))
+
+
+def persona_similarity_projection(persona_matrix: np.ndarray) -> np.ndarray:
+    """
+    P×10 persona matrisini similarity uzayına (P×6) projekte et
+
+    calculate_similarity_score'daki persona vektörünün karşılığı:
+    [technical_depth, technical_depth, innovation_factor,
+     1 - production_readiness, 1 - code_complexity, code_complexity]
+    """
+    col = dict(zip(PERSONA_VECTOR_FIELDS, persona_matrix.T))
+    return np.stack([
+        col["technical_depth"],  # Domain proxy
+        col["technical_depth"],
+        col["innovation_factor"],  # AI exp proxy
+        1 - col["production_readiness"],  # Learning goal inverse
+        1 - col["code_complexity"],  # Cognitive capacity inverse
+        col["code_complexity"]  # Abstraction proxy
+    ], axis=1)
+
+
+def user_similarity_projection(user_matrix: np.ndarray) -> np.ndarray:
+    """U×10 kullanıcı matrisini similarity uzayına (U×6) projekte et"""
+    col = dict(zip(USER_VECTOR_FIELDS, user_matrix.T))
+    return np.stack([
+        col["technical_skill"],
+        col["domain_knowledge"],
+        col["ai_experience"],
+        col["learning_goal"],
+        col["cognitive_capacity"],
+        col["abstraction_level"]
+    ], axis=1)
+
+
+def persona_extraneous_load(persona_matrix: np.ndarray) -> np.ndarray:
+    """
+    Extraneous load (Sweller, 1988) - persona başına (P,)
+
+    calculate_extraneous_load'un vektörize karşılığı; kullanıcıdan bağımsız
+    olduğu için persona store'da bir kez hesaplanır.
+    """
+    col = dict(zip(PERSONA_VECTOR_FIELDS, persona_matrix.T))
+    verbosity = col["verbosity"]
+    excessive_verbosity = np.where(
+        verbosity < 0.3, 0.3 - verbosity,
+        np.where(verbosity > 0.8, verbosity - 0.8, 0.0)
+    )
+    extraneous_load = (
+        (1 - col["modularity"]) * 0.4 +
+        excessive_verbosity * 0.3 +
+        col["code_complexity"] * 0.5 * 0.3
+    )
+    return np.clip(extraneous_load, 0, 1)
+
+
+class PersonaStore(Mapping):
+    """
+    Array tabanlı persona deposu
+
+    Engine başına bir kez oluşturulur; persona boyutlarını tek bir contiguous
+    matriste, similarity projeksiyonunu ve L2 normlarını önceden hesaplanmış
+    olarak tutar. Mapping arayüzü sayesinde eski persona_vectors dict'inin
+    yerine geçer (persona_id → PersonaVector).
+
+    Not: Dönen PersonaVector nesneleri değiştirilemez (frozen) ve matrisin
+    satırlarıyla aynı değerleri taşır; persona değiştirmek için
+    dataclasses.replace ile yeni vektörlerden yeni bir store oluşturulmalıdır.
+    """
+
+    def __init__(self, persona_vectors: Sequence[PersonaVector], dtype=np.float64,
+                 categories: Optional[Sequence[str]] = None,
+                 levels: Optional[Sequence[str]] = None):
+        """
+        Args:
+            persona_vectors: PersonaVector listesi (sıra = satır sırası)
+            dtype: Matris tipi (np.float64 veya np.float32)
+            categories: Persona kategorileri (None = id'den çıkarılır)
+            levels: Persona Dreyfus seviyeleri (None = id'den çıkarılır)
+        """
+        self._views = list(persona_vectors)
+        self.persona_ids = [p.persona_id for p in self._views]
+        self.index = {pid: row for row, pid in enumerate(self.persona_ids)}
+
+        # Filtre maskeleri için kategori / seviye kolonları (P,)
+        metadata = [persona_metadata(pid) for pid in self.persona_ids]
+        self.categories = np.array(
+            [m[0] for m in metadata] if categories is None else list(categories), dtype=str
+        )
+        self.levels = np.array(
+            [m[1] for m in metadata] if levels is None else list(levels), dtype=str
+        )
+
+        # Ham boyutlar (P×10)
+        self.matrix = np.ascontiguousarray(persona_vectors_to_array(self._views), dtype=dtype)
+
+        # Türetilmiş, kullanıcıdan bağımsız büyüklükler
+        self.similarity_projection = np.ascontiguousarray(persona_similarity_projection(self.matrix))
+        self.similarity_norms = np.linalg.norm(self.similarity_projection, axis=1)
+        self.extraneous_load = persona_extraneous_load(self.matrix)
+
+    def __getitem__(self, persona_id: str) -> PersonaVector:
+        return self._views[self.index[persona_id]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.persona_ids)
+
+    def __len__(self) -> int:
+        return len(self.persona_ids)
+
+    def row_of(self, persona: PersonaVector) -> Optional[int]:
+        """Persona bu store'un görünümüyse satır indeksini döndür, değilse None"""
+        row = self.index.get(persona.persona_id)
+        if row is not None and self._views[row] is persona:
+            return row
+        return None
+
+    def rows(self, personas) -> np.ndarray:
+        """Persona id veya PersonaVector listesinden satır indeksleri"""
+        return np.array([
+            self.index[p] if isinstance(p, str) else self.index[p.persona_id]
+            for p in personas
+        ], dtype=np.intp)
+
+    def take(self, rows: Sequence[int]) -> "PersonaStore":
+        """Seçilen satırlardan (yeniden hesaplama yapmadan) alt store oluştur"""
+        rows = np.asarray(rows, dtype=np.intp)
+        subset = PersonaStore.__new__(PersonaStore)
+        subset._views = [self._views[r] for r in rows]
+        subset.persona_ids = [self.persona_ids[r] for r in rows]
+        subset.index = {pid: row for row, pid in enumerate(subset.persona_ids)}
+        subset.categories = self.categories[rows]
+        subset.levels = self.levels[rows]
+        subset.matrix = self.matrix[rows]
+        subset.similarity_projection = self.similarity_projection[rows]
+        subset.similarity_norms = self.similarity_norms[rows]
+        subset.extraneous_load = self.extraneous_load[rows]
+        return subset
+
+    def mask(self, categories: Optional[Union[str, Sequence[str]]] = None,
+             levels: Optional[Union[str, Sequence[str]]] = None) -> np.ndarray:
+        """
+        Kategori ve seviye filtrelerinden (P,) boolean persona maskesi
+
+        Args:
+            categories: "education" / "technology" (tek değer veya liste, None = hepsi)
+            levels: Dreyfus seviyeleri (tek değer veya liste, None = hepsi)
+        """
+        mask = np.ones(len(self.persona_ids), dtype=bool)
+        if categories is not None:
+            categories = [categories] if isinstance(categories, str) else list(categories)
+            mask &= np.isin(self.categories, categories)
+        if levels is not None:
+            levels = [levels] if isinstance(levels, str) else list(levels)
+            mask &= np.isin(self.levels, levels)
+        return mask
+
+
+def clt_messages(is_overloaded: bool, is_underloaded: bool, is_in_optimal_zone: bool,
+                 overload_amount: float, extraneous: float,
+                 germane: float) -> Tuple[List[str], List[str]]:
+    """
+    CLT uyarı ve öneri metinleri
+
+    Returns:
+        (warnings, recommendations)
+    """
+    warnings = []
+    recommendations = []
+
+    if is_overloaded:
+        warnings.append(f"⚠️ Cognitive Overload! ({overload_amount:.2f} over capacity)")
+        recommendations.append("Consider easier persona or simpler task")
+
+    if is_underloaded:
+        warnings.append("ℹ️ Underutilized capacity - task may be too easy")
+        recommendations.append("Consider more challenging persona")
+
+    if extraneous > 0.5:
+        warnings.append(f"⚠️ High Extraneous Load ({extraneous:.2f})")
+        recommendations.append("Persona may have poor organization or excessive verbosity")
+
+    if germane < 0.3:
+        warnings.append(f"ℹ️ Low Germane Load ({germane:.2f})")
+        recommendations.append("Limited learning support - consider pedagogical persona")
+
+    if is_in_optimal_zone:
+        recommendations.append("✅ Optimal Learning Zone - ideal match!")
+
+    return warnings, recommendations
+
+
+@dataclass
+class CognitiveLoadBatch:
+    """
+    Batch Cognitive Load Theory sonuçları (N users × P personas × T task complexity)
+
+    Tüm yükler ve maskeler N×P×T array'lerdir. Uyarı/öneri metinleri yalnızca
+    analysis() / rankings() ile istenen satırlar için üretilir.
+    """
+    persona_ids: List[str]
+    task_complexities: np.ndarray  # (T,)
+    cognitive_capacity: np.ndarray  # (N,)
+    intrinsic_load: np.ndarray
+    extraneous_load: np.ndarray
+    germane_load: np.ndarray
+    total_load: np.ndarray
+    productive_load: np.ndarray
+    load_efficiency: np.ndarray
+    overload_amount: np.ndarray
+    is_in_optimal_zone: np.ndarray
+    is_overloaded: np.ndarray
+    is_underloaded: np.ndarray
+    clt_score: np.ndarray
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.total_load.shape
+
+    def messages(self, user_idx: int, persona_idx: int,
+                 t_idx: int = 0) -> Tuple[List[str], List[str]]:
+        """Tek hücre için (warnings, recommendations)"""
+        cell = (user_idx, persona_idx, t_idx)
+        return clt_messages(
+            bool(self.is_overloaded[cell]),
+            bool(self.is_underloaded[cell]),
+            bool(self.is_in_optimal_zone[cell]),
+            float(self.overload_amount[cell]),
+            float(self.extraneous_load[cell]),
+            float(self.germane_load[cell])
+        )
+
+    def analysis(self, user_idx: int, persona_idx: int, t_idx: int = 0,
+                 with_messages: bool = True) -> Dict:
+        """Tek hücre için calculate_total_cognitive_load formatında dict"""
+        cell = (user_idx, persona_idx, t_idx)
+        result = {
+            "intrinsic_load": float(self.intrinsic_load[cell]),
+            "extraneous_load": float(self.extraneous_load[cell]),
+            "germane_load": float(self.germane_load[cell]),
+            "total_load": float(self.total_load[cell]),
+            "productive_load": float(self.productive_load[cell]),
+            "cognitive_capacity": float(self.cognitive_capacity[user_idx]),
+            "load_efficiency": float(self.load_efficiency[cell]),
+            "is_in_optimal_zone": bool(self.is_in_optimal_zone[cell]),
+            "is_overloaded": bool(self.is_overloaded[cell]),
+            "is_underloaded": bool(self.is_underloaded[cell]),
+            "overload_amount": float(self.overload_amount[cell])
+        }
+        if with_messages:
+            result["warnings"], result["recommendations"] = self.messages(*cell)
+        return result
+
+    def rankings(self, user_idx: int = 0, t_idx: int = 0, top_k: int = 5,
+                 with_messages: bool = True,
+                 mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Bir kullanıcı ve task complexity için get_clt_optimal_personas formatında sıralama
+
+        Dict'ler yalnızca seçilen top-k persona için üretilir; mask (P,)
+        verilirse yalnızca maskelenmiş persona'lar arasından seçilir.
+        """
+        scores = self.clt_score[user_idx, :, t_idx]
+        order = select_top_k(scores, top_k, mask)
+        return [
+            {
+                "persona_id": self.persona_ids[idx],
+                "clt_score": float(scores[idx]),
+                "clt_analysis": self.analysis(user_idx, idx, t_idx, with_messages)
+            }
+            for idx in order
+        ]
+
+
+def recommendation_explanation(components: Dict[str, float], total_score: float) -> str:
+    """
+    Bileşenlerden tavsiye açıklaması (explain_recommendation metni)
+
+    Args:
+        components: rank_personas / calculate_recommendation_score bileşen dict'i
+        total_score: Toplam skor
+    """
+    # En yüksek katkıyı bulan bileşen
+    max_component = max(components.items(), key=lambda x: x[1])
+
+    explanations = {
+        "similarity": f"Sizin yetkinlik profilinize çok benziyor (benzerlik: {components['similarity']:.2f})",
+        "competency_match": f"Seviyenize tam uygun - optimal challenge (uyum: {components['competency_match']:.2f})",
+        "performance_prediction": f"Yüksek performans beklentisi (tahmin: {components['performance_prediction']:.2f})",
+        "learning_trajectory": f"Güçlü öğrenme potansiyeli (yörünge: {components['learning_trajectory']:.2f})"
+    }
+
+    main_reason = explanations.get(max_component[0], "Genel uyumluluk")
+
+    return f"{main_reason}. Toplam skor: {total_score:.2f}"
+
+
+@dataclass
+class RankingResult:
+    """
+    Bir kullanıcının sıralama sonucu (top-k persona)
+
+    Skorlama sırasında hesaplanan bileşen array'lerini, modu ve ağırlıkları
+    taşır; açıklamalar ve matematiksel detaylar yeniden skorlama yapmadan
+    buradan üretilir.
+    """
+    persona_ids: List[str]
+    scores: np.ndarray  # (k,)
+    components: Dict[str, np.ndarray]  # SCORE_COMPONENTS → (k,)
+    mode: str
+    weights: Dict[str, float]
+    learning_goal: float
+    task_complexity: float = 0.5
+    entries: List[Dict] = field(default_factory=list)  # rank_personas satırları
+
+    @classmethod
+    def from_rankings(cls, rankings: List[Dict], mode: str, weights: Dict[str, float],
+                      learning_goal: float, task_complexity: float = 0.5) -> "RankingResult":
+        """rank_personas çıktısından (dict'ler zaten hesaplanmış) sonuç nesnesi"""
+        return cls(
+            persona_ids=[r["persona_id"] for r in rankings],
+            scores=np.array([r["score"] for r in rankings], dtype=np.float64),
+            components={
+                name: np.array([r["components"][name] for r in rankings], dtype=np.float64)
+                for name in SCORE_COMPONENTS
+            },
+            mode=mode,
+            weights=dict(weights),
+            learning_goal=float(learning_goal),
+            task_complexity=float(task_complexity),
+            entries=rankings
+        )
+
+    def __len__(self) -> int:
+        return len(self.persona_ids)
+
+    @property
+    def resolved_mode(self) -> str:
+        """Adaptive mod için learning goal'e göre seçilen gerçek mod"""
+        if self.mode == "adaptive":
+            return RecommendationEngine._resolve_adaptive_mode(self.learning_goal)
+        return self.mode
+
+    def index(self, persona_id: str) -> Optional[int]:
+        """Persona sonuçta varsa sırası, yoksa None"""
+        try:
+            return self.persona_ids.index(persona_id)
+        except ValueError:
+            return None
+
+    def component_dict(self, idx: int) -> Dict[str, float]:
+        """Tek persona için bileşen dict'i (rank_personas formatı)"""
+        if self.entries:
+            return self.entries[idx]["components"]
+        similarity = float(self.components["similarity"][idx])
+        return {
+            "similarity": similarity,
+            "dissimilarity": 1 - similarity,
+            "competency_match": float(self.components["competency_match"][idx]),
+            "complementarity": float(self.components["complementarity"][idx]),
+            "performance_prediction": float(self.components["performance_prediction"][idx]),
+            "learning_trajectory": float(self.components["learning_trajectory"][idx])
+        }
+
+    def explanation(self, idx: int) -> str:
+        """idx. persona için açıklama (yeniden skorlama yok)"""
+        return recommendation_explanation(self.component_dict(idx), float(self.scores[idx]))
+
+    def explanations(self) -> List[str]:
+        """Tüm persona'lar için açıklamalar (tek geçiş)"""
+        return [self.explanation(idx) for idx in range(len(self))]
+
+
 class RecommendationEngine:
     """
     Matematiksel Tavsiye Motoru
@@ -81,6 +567,23 @@ class RecommendationEngine:
     - L(u,t): Learning trajectory (öğrenme yörüngesi)
     - α, β, γ, δ: Ağırlık katsayıları (Σ = 1)
     """
+
+    # Dreyfus seviyeleri ve technical skill karşılıkları (create_user_vector)
+    LEVELS = DREYFUS_LEVELS
+    LEVEL_MAPPING = {
+        'novice': 0.1,
+        'advanced_beginner': 0.3,
+        'competent': 0.5,
+        'proficient': 0.7,
+        'expert': 0.9
+    }
+
+    # Mod → strateji açıklaması
+    MODE_STRATEGIES = {
+        "similarity": "Benzerlik Bazlı (Rahat Çalışma)",
+        "complementary": "Tamamlayıcı (Eksik Kapatma)",
+        "hybrid": "Hibrit (Adaptif)"
+    }
     
     def __init__(self, alpha=0.30, beta=0.35, gamma=0.25, delta=0.10):
         """
@@ -97,8 +600,15 @@ class RecommendationEngine:
         self.gamma = gamma
         self.delta = delta
         
-        # Persona vektörlerini başlat
-        self.persona_vectors = self._initialize_persona_vectors()
+        # Persona vektörlerini başlat (array tabanlı store; dict gibi kullanılır)
+        self.persona_store = PersonaStore(list(self._initialize_persona_vectors().values()))
+        self.persona_vectors = self.persona_store
+
+        # Önceden hesaplanmış tavsiye tabloları (opsiyonel, bkz. recommendation_table.py)
+        self.recommendation_tables = []
+
+        # Puan akışından artımlı ağırlık öğrenici (opsiyonel, bkz. online_weight_learner.py)
+        self.weight_learner = None
     
     def _initialize_persona_vectors(self) -> Dict[str, PersonaVector]:
         """
@@ -276,15 +786,7 @@ class RecommendationEngine:
         responses = competency_profile.get('responses', {})
         
         # Dreyfus model mapping
-        level_mapping = {
-            'novice': 0.1,
-            'advanced_beginner': 0.3,
-            'competent': 0.5,
-            'proficient': 0.7,
-            'expert': 0.9
-        }
-        
-        technical_skill = level_mapping.get(level, 0.5)
+        technical_skill = self.LEVEL_MAPPING.get(level, 0.5)
         
         # Domain knowledge
         domain_knowledge = 0.8 if domain == 'technical' else 0.7
@@ -324,6 +826,79 @@ class RecommendationEngine:
             abstraction_level=abstraction_level
         )
     
+    def create_user_matrix(self, scores, levels, domains, ai_experience) -> np.ndarray:
+        """
+        Profil kolonlarından U×10 kullanıcı matrisi oluştur
+
+        create_user_vector'un vektörize karşılığı (aynı satır = aynı UserVector).
+
+        Args:
+            scores: (U,) 0-100 skorlar
+            levels: (U,) seviye isimleri veya LEVELS indeksleri (bilinmeyen = -1)
+            domains: (U,) domain isimleri veya "technical mi?" boolean'ları
+            ai_experience: (U,) AI deneyimi var mı?
+
+        Returns:
+            U×10 matris (USER_VECTOR_FIELDS sırası)
+        """
+        score = np.asarray(scores, dtype=np.float64) / 100
+        levels = np.asarray(levels)
+        if levels.dtype.kind in 'iu':
+            level_codes = levels.astype(np.intp)
+        else:
+            level_codes = np.array([
+                self.LEVELS.index(level) if level in self.LEVEL_MAPPING else -1
+                for level in levels.tolist()
+            ], dtype=np.intp)
+        domains = np.asarray(domains)
+        is_technical = domains if domains.dtype == bool else (domains == 'technical')
+
+        known = level_codes >= 0
+        level_values = np.array([self.LEVEL_MAPPING[level] for level in self.LEVELS])
+        technical_skill = np.where(known, level_values[np.where(known, level_codes, 0)], 0.5)
+        learning_goal = np.where(known & (level_codes <= 1), 0.9,
+                                 np.where(level_codes == 2, 0.6, 0.3))
+
+        columns = {
+            "technical_skill": technical_skill,
+            "domain_knowledge": np.where(is_technical, 0.8, 0.7),
+            "ai_experience": np.where(np.asarray(ai_experience, dtype=bool), 0.7, 0.2),
+            "learning_goal": learning_goal,
+            "procedural_knowledge": np.minimum(1.0, score * 1.2),
+            "declarative_knowledge": score,
+            "conditional_knowledge": np.maximum(0.3, score - 0.2),
+            "cognitive_capacity": 0.5 + (score * 0.5),
+            "pattern_recognition": np.maximum(0.3, score - 0.1),
+            "abstraction_level": score
+        }
+        return np.stack(
+            [np.broadcast_to(columns[name], score.shape) for name in USER_VECTOR_FIELDS],
+            axis=1
+        ).astype(np.float64)
+
+    def fingerprint(self) -> str:
+        """
+        Ağırlıklar ve persona vektörlerinin özeti (SHA-256)
+
+        Önceden hesaplanmış tablolar/cache'ler bu değer değiştiğinde geçersiz olur.
+        """
+        digest = hashlib.sha256()
+        digest.update(np.array([self.alpha, self.beta, self.gamma, self.delta],
+                               dtype=np.float64).tobytes())
+        digest.update("\x00".join(self.persona_store.persona_ids).encode("utf-8"))
+        digest.update(np.ascontiguousarray(self.persona_store.matrix, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def update_persona_vectors(self, persona_vectors: Sequence[PersonaVector]):
+        """
+        Persona vektörlerini değiştir (store yeniden oluşturulur)
+
+        Bağlı recommendation tabloları fingerprint değiştiği için otomatik
+        olarak devre dışı kalır.
+        """
+        self.persona_store = PersonaStore(list(persona_vectors))
+        self.persona_vectors = self.persona_store
+
     def calculate_similarity_score(self, user: UserVector, persona: PersonaVector, 
                                    focus_dimension: str = "all") -> float:
         """
@@ -351,18 +926,17 @@ class RecommendationEngine:
             user.abstraction_level
         ])
         
-        # Persona vektörünü numpy array'e çevir
-        persona_vec = np.array([
-            persona.technical_depth,
-            persona.technical_depth,  # Domain proxy
-            persona.innovation_factor,  # AI exp proxy
-            1 - persona.production_readiness,  # Learning goal inverse
-            1 - persona.code_complexity,  # Cognitive capacity inverse
-            persona.code_complexity  # Abstraction proxy
-        ])
+        # Persona vektörü: store'daki önceden hesaplanmış projeksiyon ve norm
+        row = self.persona_store.row_of(persona)
+        if row is not None:
+            persona_vec = self.persona_store.similarity_projection[row]
+            persona_norm = self.persona_store.similarity_norms[row]
+        else:
+            persona_vec = persona_similarity_projection(persona_vectors_to_array([persona]))[0]
+            persona_norm = np.linalg.norm(persona_vec)
         
         # Cosine similarity (yön benzerliği)
-        cos_sim = cosine_similarity(user_vec, persona_vec)
+        cos_sim = np.dot(user_vec, persona_vec) / (np.linalg.norm(user_vec) * persona_norm)
         
         # Normalized Euclidean distance (mesafe benzerliği)
         euclidean_dist = euclidean_distance(user_vec, persona_vec)
@@ -621,6 +1195,11 @@ class RecommendationEngine:
         Returns:
             Extraneous load (0-1)
         """
+        # Store'daki persona'lar için önceden hesaplanmış değer
+        row = self.persona_store.row_of(persona)
+        if row is not None:
+            return float(self.persona_store.extraneous_load[row])
+
         # Kötü organizasyon (düşük modularity = yüksek yük)
         poor_organization = 1 - persona.modularity
 
@@ -745,27 +1324,10 @@ class RecommendationEngine:
             load_efficiency = 0
 
         # Recommendations
-        warnings = []
-        recommendations = []
-
-        if is_overloaded:
-            warnings.append(f"⚠️ Cognitive Overload! ({overload_amount:.2f} over capacity)")
-            recommendations.append("Consider easier persona or simpler task")
-
-        if is_underloaded:
-            warnings.append("ℹ️ Underutilized capacity - task may be too easy")
-            recommendations.append("Consider more challenging persona")
-
-        if extraneous > 0.5:
-            warnings.append(f"⚠️ High Extraneous Load ({extraneous:.2f})")
-            recommendations.append("Persona may have poor organization or excessive verbosity")
-
-        if germane < 0.3:
-            warnings.append(f"ℹ️ Low Germane Load ({germane:.2f})")
-            recommendations.append("Limited learning support - consider pedagogical persona")
-
-        if is_in_optimal_zone:
-            recommendations.append("✅ Optimal Learning Zone - ideal match!")
+        warnings, recommendations = clt_messages(
+            is_overloaded, is_underloaded, is_in_optimal_zone,
+            overload_amount, extraneous, germane
+        )
 
         return {
             "intrinsic_load": intrinsic,
@@ -784,7 +1346,9 @@ class RecommendationEngine:
         }
 
     def get_clt_optimal_personas(self, user: UserVector, task_complexity: float = 0.5,
-                                  top_k: int = 5) -> List[Dict]:
+                                  top_k: int = 5,
+                                  categories: Optional[Union[str, Sequence[str]]] = None,
+                                  levels: Optional[Union[str, Sequence[str]]] = None) -> List[Dict]:
         """
         CLT bazlı optimal persona tavsiyesi
 
@@ -798,43 +1362,109 @@ class RecommendationEngine:
             user: Kullanıcı vektörü
             task_complexity: Görev karmaşıklığı
             top_k: Kaç tane persona
+            categories: Kategori filtresi (None = hepsi)
+            levels: Dreyfus seviye filtresi (None = hepsi)
 
         Returns:
             CLT skorlarına göre sıralı persona listesi
         """
-        clt_rankings = []
+        batch = self.calculate_cognitive_load_batch([user], task_complexities=[task_complexity])
+        return batch.rankings(0, 0, top_k=top_k, mask=self.persona_mask(categories, levels))
 
-        for persona_id, persona_vec in self.persona_vectors.items():
-            clt_analysis = self.calculate_total_cognitive_load(user, persona_vec, task_complexity)
+    def calculate_cognitive_load_batch(self, users: Union[Sequence[UserVector], np.ndarray],
+                                       personas=None,
+                                       task_complexities: Sequence[float] = (0.5,)) -> CognitiveLoadBatch:
+        """
+        Batch Cognitive Load Theory (Sweller, 1988)
 
-            # CLT Score hesaplama
-            # Yüksek germane + Düşük extraneous + Optimal zone
-            clt_score = (
-                clt_analysis["germane_load"] * 0.35 +
-                (1 - clt_analysis["extraneous_load"]) * 0.30 +
-                clt_analysis["load_efficiency"] * 0.20 +
-                (1.0 if clt_analysis["is_in_optimal_zone"] else 0.0) * 0.15
-            )
+        calculate_total_cognitive_load ve get_clt_optimal_personas skorunun
+        N users × P personas × T task complexity için vektörize karşılığı.
+
+        Args:
+            users: UserVector listesi veya N×10 matris
+            personas: None (tümü), persona id listesi veya PersonaVector listesi
+            task_complexities: Görev karmaşıklığı ızgarası (T,)
 
-            # Penalty for overload
-            if clt_analysis["is_overloaded"]:
-                clt_score *= (1 - clt_analysis["overload_amount"] * 0.5)
+        Returns:
+            CognitiveLoadBatch (N×P×T array'ler)
+        """
+        user_matrix = user_vectors_to_array(users)
+        store = self.persona_subset(personas)
+        task_complexities = np.atleast_1d(np.asarray(task_complexities, dtype=np.float64))
 
-            clt_rankings.append({
-                "persona_id": persona_id,
-                "clt_score": clt_score,
-                "clt_analysis": clt_analysis
-            })
+        u = dict(zip(USER_VECTOR_FIELDS, user_matrix.T[:, :, None, None]))  # (N,1,1)
+        p = dict(zip(PERSONA_VECTOR_FIELDS, store.matrix.T[:, None, :, None]))  # (1,P,1)
+        task = task_complexities[None, None, :]  # (1,1,T)
+        shape = (len(user_matrix), len(store), len(task_complexities))
 
-        # CLT score'a göre sırala
-        clt_rankings.sort(key=lambda x: x["clt_score"], reverse=True)
+        # IL(u,t) = task_complexity × (1 - user_expertise)
+        user_expertise = (
+            u["technical_skill"] * 0.4 +
+            u["domain_knowledge"] * 0.3 +
+            u["procedural_knowledge"] * 0.3
+        )
+        intrinsic = np.clip(task * (1 - user_expertise), 0, 1)
 
-        return clt_rankings[:top_k]
+        # EL(p): store'da önceden hesaplanmış
+        extraneous = store.extraneous_load[None, :, None]
+
+        # GL(u,p)
+        learning_capacity = (
+            u["cognitive_capacity"] * 0.4 +
+            u["pattern_recognition"] * 0.3 +
+            u["learning_goal"] * 0.3
+        )
+        germane = np.clip(
+            p["learning_support"] * 0.35 +
+            p["pedagogical_focus"] * 0.30 +
+            learning_capacity * 0.20 +
+            p["example_richness"] * 0.15,
+            0, 1
+        )
+
+        intrinsic, extraneous, germane = (np.broadcast_to(arr, shape)
+                                          for arr in (intrinsic, extraneous, germane))
+        capacity = u["cognitive_capacity"]
+
+        total = np.clip(intrinsic + extraneous - germane, 0, 2)
+        productive = intrinsic + germane
+        is_in_optimal_zone = (productive <= capacity) & (extraneous < 0.3)
+        is_overloaded = total > capacity
+        overload_amount = np.maximum(0, total - capacity)
+        is_underloaded = total < (capacity * 0.4)
+        load_efficiency = np.where(total > 0, germane / (intrinsic + extraneous + 0.001), 0.0)
+
+        # CLT Score (get_clt_optimal_personas)
+        clt_score = (
+            germane * 0.35 +
+            (1 - extraneous) * 0.30 +
+            load_efficiency * 0.20 +
+            is_in_optimal_zone * 0.15
+        )
+        clt_score = np.where(is_overloaded, clt_score * (1 - overload_amount * 0.5), clt_score)
+
+        return CognitiveLoadBatch(
+            persona_ids=list(store.persona_ids),
+            task_complexities=task_complexities,
+            cognitive_capacity=user_matrix[:, USER_VECTOR_FIELDS.index("cognitive_capacity")],
+            intrinsic_load=intrinsic,
+            extraneous_load=extraneous,
+            germane_load=germane,
+            total_load=total,
+            productive_load=productive,
+            load_efficiency=load_efficiency,
+            overload_amount=overload_amount,
+            is_in_optimal_zone=is_in_optimal_zone,
+            is_overloaded=is_overloaded,
+            is_underloaded=is_underloaded,
+            clt_score=clt_score
+        )
 
     def calculate_recommendation_score(self, user: UserVector, persona: PersonaVector,
                                       task_complexity: float = 0.5,
                                       time_factor: float = 0.5,
-                                      mode: str = "adaptive") -> Dict:
+                                      mode: str = "adaptive",
+                                      uncertainty=None) -> Dict:
         """
         R(u,p): Ana Tavsiye Skoru Hesaplama (DUAL-MODE)
         
@@ -855,6 +1485,8 @@ class RecommendationEngine:
             task_complexity: Görev karmaşıklığı
             time_factor: Zaman faktörü
             mode: "similarity", "complementary", veya "adaptive"
+            uncertainty: MonteCarloUncertainty (veya True = varsayılan ayarlar);
+                verilirse confidence_interval Monte Carlo örneklerinden hesaplanır
             
         Returns:
             Detaylı skor breakdown'u
@@ -868,12 +1500,7 @@ class RecommendationEngine:
         
         # Mod belirleme
         if mode == "adaptive":
-            if user.learning_goal > 0.7:
-                actual_mode = "complementary"
-            elif user.learning_goal < 0.3:
-                actual_mode = "similarity"
-            else:
-                actual_mode = "hybrid"
+            actual_mode = self._resolve_adaptive_mode(user.learning_goal)
         else:
             actual_mode = mode
         
@@ -886,7 +1513,7 @@ class RecommendationEngine:
                 self.gamma * performance +
                 self.delta * learning
             )
-            strategy = "Benzerlik Bazlı (Rahat Çalışma)"
+            strategy = self.MODE_STRATEGIES["similarity"]
             
         elif actual_mode == "complementary":
             # Learning/Eksik kapatma modu
@@ -897,7 +1524,7 @@ class RecommendationEngine:
                 self.gamma * performance +
                 self.delta * learning
             )
-            strategy = "Tamamlayıcı (Eksik Kapatma)"
+            strategy = self.MODE_STRATEGIES["complementary"]
             
         else:  # hybrid
             # Her ikisinin ortalaması
@@ -921,12 +1548,7 @@ class RecommendationEngine:
                 user.learning_goal * complementary_score +
                 (1 - user.learning_goal) * similarity_score
             )
-            strategy = "Hibrit (Adaptif)"
-        
-        # Confidence interval (95% CI)
-        std_dev = 0.05
-        ci_lower = max(0, total_score - 1.96 * std_dev)
-        ci_upper = min(1, total_score + 1.96 * std_dev)
+            strategy = self.MODE_STRATEGIES["hybrid"]
         
         return {
             "total_score": total_score,
@@ -946,84 +1568,480 @@ class RecommendationEngine:
                 "gamma": self.gamma,
                 "delta": self.delta
             },
-            "confidence_interval": {
-                "lower": ci_lower,
-                "upper": ci_upper,
-                "std_dev": std_dev
+            "confidence_interval": (
+                self._monte_carlo(uncertainty).simulate(
+                    user, mode=mode, task_complexity=task_complexity,
+                    time_factor=time_factor, personas=[persona]
+                ).confidence_interval(0)
+                if uncertainty is not None else self._confidence_interval(total_score)
+            )
+        }
+
+    def _monte_carlo(self, uncertainty):
+        """uncertainty=True için varsayılan MonteCarloUncertainty (lazy import)"""
+        if uncertainty is True:
+            from recommendation_uncertainty import MonteCarloUncertainty
+            return MonteCarloUncertainty(self)
+        return uncertainty
+
+    @staticmethod
+    def _resolve_adaptive_mode(learning_goal: float) -> str:
+        """Adaptive mod: learning goal'e göre gerçek modu seç"""
+        if learning_goal > 0.7:
+            return "complementary"
+        if learning_goal < 0.3:
+            return "similarity"
+        return "hybrid"
+
+    @classmethod
+    def ranking_entry(cls, persona_id: str, total_score: float,
+                       components: Dict[str, float]) -> Dict:
+        """rank_personas çıktısındaki tek persona satırı"""
+        total_score = float(total_score)
+        similarity = float(components["similarity"])
+        return {
+            "persona_id": persona_id,
+            "score": total_score,
+            "components": {
+                "similarity": similarity,
+                "dissimilarity": 1 - similarity,
+                "competency_match": float(components["competency_match"]),
+                "complementarity": float(components["complementarity"]),
+                "performance_prediction": float(components["performance_prediction"]),
+                "learning_trajectory": float(components["learning_trajectory"])
+            },
+            "confidence_interval": cls._confidence_interval(total_score)
+        }
+
+    @staticmethod
+    def _confidence_interval(total_score: float, std_dev: float = 0.05) -> Dict[str, float]:
+        """Toplam skor etrafında 95% CI"""
+        return {
+            "lower": max(0, total_score - 1.96 * std_dev),
+            "upper": min(1, total_score + 1.96 * std_dev),
+            "std_dev": std_dev
+        }
+
+    # ============================================================================
+    # BATCH SKORLAMA - Users × Personas × Modes
+    # ============================================================================
+
+    def persona_subset(self, personas=None) -> PersonaStore:
+        """
+        Batch skorlama için persona store'u (veya alt kümesini) döndür
+
+        Args:
+            personas: None (tümü), persona id listesi veya PersonaVector listesi
+        """
+        if personas is None:
+            return self.persona_store
+        personas = list(personas)
+        if all(isinstance(p, str) or self.persona_store.row_of(p) is not None for p in personas):
+            return self.persona_store.take(self.persona_store.rows(personas))
+        # Store dışı (özel) persona vektörleri
+        return PersonaStore([
+            self.persona_store[p] if isinstance(p, str) else p
+            for p in personas
+        ])
+
+    def _score_components(self, user_matrix: np.ndarray, personas: PersonaStore,
+                          task_complexity: float = 0.5,
+                          time_factor: float = 0.5,
+                          persona_matrix: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        S, C, P, L, D bileşenlerini U×P matrisler olarak hesapla
+
+        Skaler calculate_* fonksiyonlarının birebir vektörize karşılığıdır.
+
+        Args:
+            user_matrix: U×10 kullanıcı matrisi (USER_VECTOR_FIELDS sırası)
+            personas: Persona store (veya alt kümesi)
+            task_complexity: Görev karmaşıklığı
+            time_factor: Zaman faktörü
+            persona_matrix: Kullanıcı başına persona değerleri (U×P×10, ör.
+                Monte Carlo örnekleri); None ise store değerleri kullanılır
+
+        Returns:
+            Bileşen adı → U×P array
+        """
+        user_proj = user_similarity_projection(user_matrix)
+        user_norms = np.linalg.norm(user_proj, axis=1)[:, None]
+
+        # Kolonlar: user alanları (U,1), persona alanları (1,P) şeklinde broadcast edilir
+        u = dict(zip(USER_VECTOR_FIELDS, user_matrix.T[:, :, None]))
+        if persona_matrix is None:
+            p = dict(zip(PERSONA_VECTOR_FIELDS, personas.matrix.T[:, None, :]))
+            persona_proj = personas.similarity_projection
+            dot = user_proj @ persona_proj.T
+            norms = user_norms * personas.similarity_norms[None, :]
+            diff = user_proj[:, None, :] - persona_proj[None, :, :]
+        else:
+            # Kullanıcı satırı başına ayrı persona değerleri (U,P)
+            p = dict(zip(PERSONA_VECTOR_FIELDS, np.moveaxis(persona_matrix, -1, 0)))
+            persona_proj = persona_similarity_projection(
+                persona_matrix.reshape(-1, len(PERSONA_VECTOR_FIELDS))
+            ).reshape(persona_matrix.shape[:2] + (-1,))
+            dot = np.einsum('uk,upk->up', user_proj, persona_proj)
+            norms = user_norms * np.linalg.norm(persona_proj, axis=2)
+            diff = user_proj[:, None, :] - persona_proj
+
+        # S(u,p): Cosine + normalized Euclidean (calculate_similarity_score)
+        cos_sim = dot / norms
+        euclidean_sim = 1 - np.sqrt(np.einsum('upk,upk->up', diff, diff)) / np.sqrt(user_proj.shape[1])
+        similarity = np.clip(0.6 * cos_sim + 0.4 * euclidean_sim, 0, 1)
+
+        # C(u,p): ZPD Gaussian + alignment + bilgi türü uyumu (calculate_competency_match)
+        persona_difficulty = (p["code_complexity"] + p["technical_depth"]) / 2
+        user_skill = (u["technical_skill"] + u["domain_knowledge"]) / 2
+        gaussian_match = np.exp(-2.0 * (np.abs(user_skill - persona_difficulty) ** 2))
+        alignment = np.where(u["learning_goal"] > 0.7,
+                             p["pedagogical_focus"], p["production_readiness"])
+        knowledge_match = (
+            u["procedural_knowledge"] * p["modularity"] * 0.4 +
+            u["declarative_knowledge"] * p["verbosity"] * 0.3 +
+            u["conditional_knowledge"] * p["learning_support"] * 0.3
+        )
+        competency = np.clip(gaussian_match * 0.5 + alignment * 0.3 + knowledge_match * 0.2, 0, 1)
+
+        # P(u,p,g): Sigmoid regresyon (predict_performance)
+        persona_quality = (p["production_readiness"] + p["learning_support"]) / 2
+        z = (0.3 +
+             0.4 * user_skill +
+             0.3 * persona_quality +
+             0.25 * similarity +
+             -0.2 * task_complexity)
+        performance = np.clip(1 / (1 + np.exp(-z)), 0, 1)
+
+        # L(u,t): Öğrenme yörüngesi (calculate_learning_trajectory)
+        time_learning = 1.0 * (1 - np.exp(-2.0 * time_factor))
+        learning_capacity = (
+            u["cognitive_capacity"] * 0.4 +
+            u["pattern_recognition"] * 0.3 +
+            (1 - u["abstraction_level"]) * 0.3
+        )
+        learning = np.clip(time_learning * (p["learning_support"] * learning_capacity), 0, 1)
+
+        # D(u,p): Tamamlayıcılık (calculate_complementarity)
+        domain_strength = np.where(u["learning_goal"] > 0.5,
+                                   p["pedagogical_focus"], p["production_readiness"])
+        complementarity = np.clip((
+            p["technical_depth"] * (1 - u["technical_skill"]) +
+            domain_strength * (1 - u["domain_knowledge"]) +
+            p["innovation_factor"] * (1 - u["ai_experience"]) +
+            p["code_complexity"] * (1 - u["abstraction_level"])
+        ) / 4, 0, 1)
+
+        return {
+            "similarity": similarity,
+            "competency_match": competency,
+            "performance_prediction": performance,
+            "learning_trajectory": learning,
+            "complementarity": complementarity
+        }
+
+    def _combine_modes(self, components: Dict[str, np.ndarray], learning_goal: np.ndarray,
+                       modes: Sequence[str]) -> np.ndarray:
+        """
+        Bileşenlerden mod bazlı toplam skorları hesapla
+
+        Args:
+            components: _score_components çıktısı (U×P)
+            learning_goal: (U,) kullanıcı learning goal değerleri
+            modes: Mod listesi
+
+        Returns:
+            U×P×M toplam skor tensörü
+        """
+        similarity_score = (
+            self.alpha * components["similarity"] +
+            self.beta * components["competency_match"] +
+            self.gamma * components["performance_prediction"] +
+            self.delta * components["learning_trajectory"]
+        )
+        complementary_score = (
+            self.alpha * (1 - components["similarity"]) +
+            self.beta * components["complementarity"] +
+            self.gamma * components["performance_prediction"] +
+            self.delta * components["learning_trajectory"]
+        )
+        goal = learning_goal[:, None]
+        hybrid_score = goal * complementary_score + (1 - goal) * similarity_score
+
+        by_mode = {
+            "similarity": similarity_score,
+            "complementary": complementary_score,
+            "hybrid": hybrid_score
+        }
+        totals = []
+        for mode in modes:
+            if mode == "adaptive":
+                totals.append(np.where(goal > 0.7, complementary_score,
+                                       np.where(goal < 0.3, similarity_score, hybrid_score)))
+            elif mode in by_mode:
+                totals.append(by_mode[mode])
+            else:
+                raise ValueError(f"Geçersiz mod: {mode}. {SCORING_MODES} olmalı.")
+        return np.stack(totals, axis=-1)
+
+    def score_matrix(self, users: Union[Sequence[UserVector], np.ndarray],
+                     personas=None,
+                     modes: Sequence[str] = ("similarity", "complementary", "hybrid"),
+                     task_complexity: float = 0.5,
+                     time_factor: float = 0.5,
+                     persona_matrix: Optional[np.ndarray] = None) -> Dict:
+        """
+        Batch R(u,p): Users × Personas × Modes skor tensörü
+
+        calculate_recommendation_score'un vektörize karşılığı; tek çağrıda
+        tüm kullanıcı-persona-mod kombinasyonlarını skorlar.
+
+        Args:
+            users: UserVector listesi veya U×10 matris
+            personas: None (tümü), persona id listesi veya PersonaVector listesi
+            modes: "similarity", "complementary", "hybrid", "adaptive"
+            task_complexity: Görev karmaşıklığı
+            time_factor: Zaman faktörü
+            persona_matrix: Kullanıcı başına persona değerleri (U×P×10, opsiyonel)
+
+        Returns:
+            {
+                "persona_ids": P persona id,
+                "modes": M mod,
+                "total": U×P×M toplam skor,
+                "similarity", "competency_match", "performance_prediction",
+                "learning_trajectory", "complementarity": U×P bileşenler
             }
+        """
+        modes = tuple(modes)
+        result = self.score_components(users, personas, task_complexity, time_factor,
+                                       persona_matrix)
+        learning_goal = result.pop("learning_goal")
+        total = self._combine_modes(result, learning_goal, modes)
+
+        return {
+            "persona_ids": result.pop("persona_ids"),
+            "modes": modes,
+            "total": total,
+            **result
+        }
+
+    def score_components(self, users: Union[Sequence[UserVector], np.ndarray],
+                         personas=None,
+                         task_complexity: float = 0.5,
+                         time_factor: float = 0.5,
+                         persona_matrix: Optional[np.ndarray] = None) -> Dict:
+        """
+        Ağırlıktan bağımsız bileşen matrisleri (S, C, P, L, D)
+
+        Ağırlık taraması gibi aynı bileşenlerin farklı α, β, γ, δ ile tekrar
+        tekrar birleştirildiği durumlar için. persona_matrix (U×P×10) verilirse
+        her kullanıcı satırı kendi persona değerleriyle skorlanır (persona
+        sırası personas ile aynı olmalıdır).
+
+        Returns:
+            {"persona_ids", "learning_goal": (U,), bileşen adı → U×P array}
+        """
+        user_matrix = user_vectors_to_array(users)
+        store = self.persona_subset(personas)
+        components = self._score_components(user_matrix, store,
+                                            task_complexity, time_factor,
+                                            persona_matrix)
+        return {
+            "persona_ids": list(store.persona_ids),
+            "learning_goal": user_matrix[:, USER_VECTOR_FIELDS.index("learning_goal")],
+            **components
         }
     
+    def persona_mask(self, categories: Optional[Union[str, Sequence[str]]] = None,
+                     levels: Optional[Union[str, Sequence[str]]] = None) -> Optional[np.ndarray]:
+        """Kategori / seviye filtresi için (P,) maske; filtre yoksa None"""
+        if categories is None and levels is None:
+            return None
+        return self.persona_store.mask(categories, levels)
+
+    def top_k_personas(self, users: Union[Sequence[UserVector], np.ndarray],
+                       top_k: int = 5, mode: str = "adaptive",
+                       task_complexity: float = 0.5, time_factor: float = 0.5,
+                       categories: Optional[Union[str, Sequence[str]]] = None,
+                       levels: Optional[Union[str, Sequence[str]]] = None) -> Dict:
+        """
+        Batch top-k: her kullanıcı için en iyi K persona (argpartition ile)
+
+        Args:
+            users: UserVector listesi veya U×10 matris
+            top_k: En iyi K persona
+            mode: Skorlama modu
+            task_complexity: Görev karmaşıklığı
+            time_factor: Zaman faktörü
+            categories: Kategori filtresi (None = hepsi)
+            levels: Dreyfus seviye filtresi (None = hepsi)
+
+        Returns:
+            {
+                "persona_ids": P persona id'si,
+                "indices": U×k persona indeksleri (skora göre azalan),
+                "scores": U×k toplam skorlar,
+                + SCORE_COMPONENTS: U×k bileşenler
+            }
+        """
+        matrix = self.score_matrix(users, modes=(mode,), task_complexity=task_complexity,
+                                   time_factor=time_factor)
+        totals = matrix["total"][:, :, 0]
+        indices = select_top_k(totals, top_k, self.persona_mask(categories, levels))
+        return {
+            "persona_ids": matrix["persona_ids"],
+            "indices": indices,
+            "scores": np.take_along_axis(totals, indices, axis=1),
+            **{name: np.take_along_axis(matrix[name], indices, axis=1) for name in SCORE_COMPONENTS}
+        }
+
+    def lookup_recommendation_tables(self, user_vector: UserVector,
+                                     task_complexity: float = 0.5, top_k: int = 5,
+                                     mode: str = "adaptive",
+                                     mask: Optional[np.ndarray] = None) -> Optional[List[Dict]]:
+        """Bağlı RecommendationTable'lardan O(1) sonuç; geçerli tablo/hücre yoksa None"""
+        if not self.recommendation_tables:
+            return None
+        fingerprint = self.fingerprint()
+        for table in self.recommendation_tables:
+            cached = table.lookup(user_vector, task_complexity=task_complexity,
+                                  top_k=top_k, mode=mode, fingerprint=fingerprint,
+                                  mask=mask)
+            if cached is not None:
+                return cached
+        return None
+
     def rank_personas(self, user_vector: UserVector, 
                      task_complexity: float = 0.5,
-                     top_k: int = 5) -> List[Dict]:
+                     top_k: int = 5,
+                     mode: str = "adaptive",
+                     categories: Optional[Union[str, Sequence[str]]] = None,
+                     levels: Optional[Union[str, Sequence[str]]] = None,
+                     uncertainty=None) -> List[Dict]:
         """
         Tüm persona'ları skorla ve sırala
         
-        Multi-Criteria Decision Analysis (MCDA) yaklaşımı
+        Multi-Criteria Decision Analysis (MCDA) yaklaşımı. Bağlı ve geçerli bir
+        RecommendationTable varsa sonuç O(1) tablodan okunur. Aksi halde
+        skorlar tek batch'te hesaplanır, top-k argpartition ile seçilir ve
+        dict'ler yalnızca seçilen K persona için üretilir.
         
         Args:
             user_vector: Kullanıcı vektörü
             task_complexity: Görev karmaşıklığı
             top_k: En iyi K persona
+            mode: "similarity", "complementary", "hybrid" veya "adaptive"
+            categories: Kategori filtresi, ör. "technology" (None = hepsi)
+            levels: Dreyfus seviye filtresi, ör. ["competent", "proficient"] (None = hepsi)
+            uncertainty: MonteCarloUncertainty (veya True = varsayılan ayarlar);
+                verilirse her satıra ampirik CI, rank_stability ve
+                component_variance eklenir
             
         Returns:
             Sıralı persona listesi
         """
-        rankings = []
-        
-        for persona_id, persona_vec in self.persona_vectors.items():
-            scores = self.calculate_recommendation_score(
-                user_vector, 
-                persona_vec,
-                task_complexity
-            )
+        mask = self.persona_mask(categories, levels)
+
+        rankings = self.lookup_recommendation_tables(user_vector, task_complexity, top_k, mode, mask)
+        if rankings is None:
+            matrix = self.score_matrix([user_vector], modes=(mode,),
+                                       task_complexity=task_complexity)
+            totals = matrix["total"][0, :, 0]
             
-            rankings.append({
-                "persona_id": persona_id,
-                "score": scores["total_score"],
-                "components": scores["components"],
-                "confidence_interval": scores["confidence_interval"]
-            })
-        
-        # Skora göre sırala (descending)
-        rankings.sort(key=lambda x: x["score"], reverse=True)
-        
-        return rankings[:top_k]
+            # Skora göre azalan top-k (eşitlikte orijinal sıra korunur)
+            rankings = [
+                self.ranking_entry(
+                    matrix["persona_ids"][idx],
+                    totals[idx],
+                    {name: matrix[name][0, idx] for name in SCORE_COMPONENTS}
+                )
+                for idx in select_top_k(totals, top_k, mask)
+            ]
+
+        if uncertainty is not None and rankings:
+            # Sıra kararlılığı filtrelenmiş aday kümesi içinde hesaplanır
+            candidates = None if mask is None else [
+                pid for pid, keep in zip(self.persona_store.persona_ids, mask) if keep
+            ]
+            result = self._monte_carlo(uncertainty).simulate(
+                user_vector, mode=mode, task_complexity=task_complexity,
+                personas=candidates, top_k=len(rankings)
+            )
+            for ranking in rankings:
+                idx = result.index(ranking["persona_id"])
+                ranking["confidence_interval"] = result.confidence_interval(idx)
+                ranking["rank_stability"] = result.rank_stability(idx)
+                ranking["component_variance"] = result.component_variance(idx)
+
+        return rankings
     
-    def explain_recommendation(self, user_vector: UserVector, persona_id: str) -> str:
+    def ranking_result(self, user_vector: UserVector,
+                       task_complexity: float = 0.5,
+                       top_k: int = 5,
+                       mode: str = "adaptive",
+                       **kwargs) -> RankingResult:
+        """
+        rank_personas + bileşen array'leri, mod ve ağırlıklarla RankingResult
+
+        Args:
+            user_vector: Kullanıcı vektörü
+            task_complexity: Görev karmaşıklığı
+            top_k: En iyi K persona
+            mode: Skorlama modu
+            **kwargs: rank_personas'a iletilir (categories, levels, uncertainty)
+
+        Returns:
+            RankingResult
+        """
+        rankings = self.rank_personas(user_vector, task_complexity=task_complexity,
+                                      top_k=top_k, mode=mode, **kwargs)
+        return RankingResult.from_rankings(
+            rankings,
+            mode=mode,
+            weights={
+                "alpha": self.alpha,
+                "beta": self.beta,
+                "gamma": self.gamma,
+                "delta": self.delta
+            },
+            learning_goal=user_vector.learning_goal,
+            task_complexity=task_complexity
+        )
+
+    def explain_recommendation(self, user_vector: UserVector, persona_id: str,
+                               ranking: Optional[RankingResult] = None) -> str:
         """
         Tavsiye açıklaması üret (Explainable AI)
         
         Args:
             user_vector: Kullanıcı vektörü
             persona_id: Persona ID
+            ranking: Persona'yı içeren RankingResult varsa bileşenler
+                oradan okunur (yeniden skorlama yapılmaz)
             
         Returns:
             Açıklama metni
         """
+        if ranking is not None:
+            idx = ranking.index(persona_id)
+            if idx is not None:
+                return ranking.explanation(idx)
+
         persona = self.persona_vectors.get(persona_id)
         if not persona:
             return "Persona bulunamadı"
         
         scores = self.calculate_recommendation_score(user_vector, persona)
-        components = scores["components"]
-        
-        # En yüksek katkıyı bulan bileşen
-        max_component = max(components.items(), key=lambda x: x[1])
-        
-        explanations = {
-            "similarity": f"Sizin yetkinlik profilinize çok benziyor (benzerlik: {components['similarity']:.2f})",
-            "competency_match": f"Seviyenize tam uygun - optimal challenge (uyum: {components['competency_match']:.2f})",
-            "performance_prediction": f"Yüksek performans beklentisi (tahmin: {components['performance_prediction']:.2f})",
-            "learning_trajectory": f"Güçlü öğrenme potansiyeli (yörünge: {components['learning_trajectory']:.2f})"
-        }
-        
-        main_reason = explanations.get(max_component[0], "Genel uyumluluk")
-        
-        return f"{main_reason}. Toplam skor: {scores['total_score']:.2f}"
+        return recommendation_explanation(scores["components"], scores["total_score"])
+
+    def explain_recommendations(self, ranking: RankingResult) -> List[str]:
+        """RankingResult'taki tüm persona'lar için açıklamalar (tek geçiş)"""
+        return ranking.explanations()
     
     def optimize_persona_weights(self, user_vector: UserVector, 
-                                 feedback_data: Optional[List[Dict]] = None) -> Dict[str, float]:
+                                 feedback_data: Optional[List[Dict]] = None,
+                                 method: str = "auto",
+                                 resolution: int = 20) -> Dict[str, float]:
         """
         Bayesian Optimization ile persona ağırlıklarını optimize et
         
@@ -1035,13 +2053,29 @@ class RecommendationEngine:
         θ = {α, β, γ, δ}: Parametreler
         D: Feedback data
         
+        Üç yöntem:
+        - "online": Bağlı weight_learner'ın (OnlineWeightLearner) puan akışıyla
+          artımlı güncellenen durumundan okunur; feedback_data taranmaz
+        - "sweep": Persona bazlı puanlar ({"persona_id", "rating"}) varsa tüm
+          simplex ızgarası taranır, puanlarla en uyumlu ağırlıklar seçilir
+        - "heuristic": Başarı oranına göre sabit adımlı ayarlama
+        "auto" weight_learner bağlıysa online, değilse persona bazlı puan
+        varsa sweep, yoksa heuristic kullanır.
+        
         Args:
             user_vector: Kullanıcı vektörü
             feedback_data: Kullanıcı feedback verileri
+            method: "auto", "online", "sweep" veya "heuristic"
+            resolution: Sweep ızgara çözünürlüğü (adım = 1/resolution)
             
         Returns:
             Optimize edilmiş ağırlıklar
         """
+        if method == "online" or (method == "auto" and self.weight_learner is not None):
+            if self.weight_learner is None:
+                raise ValueError("method='online' için engine.weight_learner bağlı olmalı")
+            return self.weight_learner.weights_for(user_vector)
+
         if feedback_data is None or len(feedback_data) == 0:
             # Prior: Varsayılan ağırlıklar
             return {
@@ -1050,6 +2084,11 @@ class RecommendationEngine:
                 "gamma": self.gamma,
                 "delta": self.delta
             }
+
+        if method in ("auto", "sweep"):
+            swept = self._optimize_weights_by_sweep(user_vector, feedback_data, resolution)
+            if swept is not None:
+                return swept
         
         # Basit Bayesian update (gerçek uygulamada MCMC kullanılır)
         # Feedback'den learning rate hesapla
@@ -1091,6 +2130,29 @@ class RecommendationEngine:
         }
 
 
+    def _optimize_weights_by_sweep(self, user_vector: UserVector, feedback_data: List[Dict],
+                                   resolution: int = 20) -> Optional[Dict[str, float]]:
+        """
+        Persona bazlı puanlara göre simplex taraması
+
+        Returns:
+            En iyi ağırlıklar; yeterli persona bazlı puan yoksa None
+        """
+        from weight_sweep import WeightSweep, simplex_grid, rating_objective
+
+        ratings = np.full((1, len(self.persona_store)), np.nan)
+        for feedback in feedback_data:
+            row = self.persona_store.index.get(feedback.get('persona_id'))
+            if row is not None and feedback.get('rating') is not None:
+                ratings[0, row] = feedback['rating']
+        if np.count_nonzero(~np.isnan(ratings)) < 2:
+            return None
+
+        sweep = WeightSweep(self, [user_vector])
+        result = sweep.evaluate(simplex_grid(resolution), objective=rating_objective(ratings))
+        return result["best_weights"]
+
+
 # Test için
 if __name__ == "__main__":
     engine = RecommendationEngine()
@@ -1106,10 +2168,11 @@ if __name__ == "__main__":
     user_vec = engine.create_user_vector(test_profile)
     
     # Rank personas
-    rankings = engine.rank_personas(user_vec, task_complexity=0.5, top_k=5)
+    result = engine.ranking_result(user_vec, task_complexity=0.5, top_k=5)
+    explanations = engine.explain_recommendations(result)
     
-    print("🎯 Top 5 Persona Tavsiyeleri:\n")
-    for idx, ranking in enumerate(rankings, 1):
+    print(f"🎯 Top 5 Persona Tavsiyeleri (mod: {result.resolved_mode}):\n")
+    for idx, (ranking, explanation) in enumerate(zip(result.entries, explanations), 1):
         persona_id = ranking["persona_id"]
         score = ranking["score"]
         components = ranking["components"]
@@ -1119,5 +2182,6 @@ if __name__ == "__main__":
         print(f"   Yetkinlik Uyumu: {components['competency_match']:.3f}")
         print(f"   Performans Tahmini: {components['performance_prediction']:.3f}")
         print(f"   Öğrenme Yörüngesi: {components['learning_trajectory']:.3f}")
+        print(f"   💡 {explanation}")
         print()
 
@@ -0,0 +1,392 @@
+"""
+Mikro-Batch Tavsiye Servisi (Micro-batching Recommendation Service)
+
+Çok sayıda katılımcı yetkinlik aşamasını aynı anda bitirdiğinde her oturumun
+rank_personas'ı ayrı ayrı çağırması yerine, istekler kısa bir pencere
+(varsayılan 2 ms veya max_batch_size istek) boyunca toplanır ve tek bir
+score_matrix çağrısı ile birlikte skorlanır. Her çağıran kendi Future'ını
+alır.
+
+Akış:
+    submit() → kuyruk → worker thread (pencere dolana kadar topla)
+             → RecommendationTable lookup (O(1), varsa)
+             → kalanlar (mode, task_complexity) grubuna göre tek batch skorlama
+             → her isteğe kendi top-k'sı (argpartition + maske)
+
+Birden fazla uygulama worker'ı aynı engine'i paylaşabilsin diye servis
+küçük bir yerel HTTP endpoint'i (stdlib http.server) olarak da açılabilir:
+    POST /recommend   {"profile": {...}, "top_k": 5, "mode": "adaptive", ...}
+    GET  /health      servis istatistikleri
+"""
+
+import json
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from recommendation_engine import (
+    RecommendationEngine,
+    UserVector,
+    SCORING_MODES,
+    SCORE_COMPONENTS,
+    select_top_k,
+    user_vectors_to_array
+)
+
+
+@dataclass
+class _RecommendationRequest:
+    """Kuyruktaki tek tavsiye isteği"""
+    user_vector: UserVector
+    top_k: int
+    mode: str
+    task_complexity: float
+    mask: Optional[np.ndarray]
+    future: Future
+
+
+class RecommendationService:
+    """Eşzamanlı istekleri toplayıp tek batch'te skorlayan uzun ömürlü servis"""
+
+    def __init__(self, engine: Optional[RecommendationEngine] = None,
+                 max_batch_size: int = 64, max_wait: float = 0.002):
+        """
+        Args:
+            engine: Paylaşılan recommendation engine (None = yeni engine)
+            max_batch_size: Bir batch'teki en fazla istek sayısı
+            max_wait: İlk istekten sonra batch'in beklediği süre (saniye)
+        """
+        self.engine = engine or RecommendationEngine()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self.stats = {"requests": 0, "batches": 0, "table_hits": 0, "max_batch_size": 0}
+
+    # ------------------------------------------------------------------
+    # Yaşam döngüsü
+    # ------------------------------------------------------------------
+
+    def start(self) -> "RecommendationService":
+        """Worker thread'i başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="recommendation-service",
+                                                daemon=True)
+                self._worker.start()
+        return self
+
+    def close(self, timeout: Optional[float] = None):
+        """Kuyruktaki istekleri bitir ve worker'ı durdur"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout)
+
+    def __enter__(self) -> "RecommendationService":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # İstemci API'si
+    # ------------------------------------------------------------------
+
+    def submit(self, user_vector: UserVector, top_k: int = 5, mode: str = "adaptive",
+               task_complexity: float = 0.5,
+               categories: Optional[Union[str, Sequence[str]]] = None,
+               levels: Optional[Union[str, Sequence[str]]] = None) -> Future:
+        """
+        Tavsiye isteğini kuyruğa ekle
+
+        Args:
+            user_vector: Kullanıcı vektörü
+            top_k: En iyi K persona
+            mode: "similarity", "complementary", "hybrid" veya "adaptive"
+            task_complexity: Görev karmaşıklığı
+            categories: Kategori filtresi (None = hepsi)
+            levels: Dreyfus seviye filtresi (None = hepsi)
+
+        Returns:
+            Sonucu rank_personas formatında liste olan Future
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Geçersiz mod: {mode}. {SCORING_MODES} olmalı.")
+        if self._worker is None:
+            self.start()
+
+        future = Future()
+        self._queue.put(_RecommendationRequest(
+            user_vector=user_vector,
+            top_k=int(top_k),
+            mode=mode,
+            task_complexity=float(task_complexity),
+            mask=self.engine.persona_mask(categories, levels),
+            future=future
+        ))
+        return future
+
+    def recommend(self, user_vector: UserVector, top_k: int = 5, mode: str = "adaptive",
+                  task_complexity: float = 0.5,
+                  categories: Optional[Union[str, Sequence[str]]] = None,
+                  levels: Optional[Union[str, Sequence[str]]] = None,
+                  timeout: Optional[float] = 5.0) -> List[Dict]:
+        """submit() + sonucu bekle (rank_personas ile aynı çıktı)"""
+        return self.submit(user_vector, top_k, mode, task_complexity,
+                           categories, levels).result(timeout)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        """İlk istekten sonra max_wait veya max_batch_size dolana kadar topla"""
+        running = True
+        while running:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    running = False
+                    break
+                batch.append(request)
+
+            self._process(batch)
+
+    def _process(self, batch: List[_RecommendationRequest]):
+        """Bir batch'i skorla ve Future'ları tamamla"""
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+
+        # 1) Önceden hesaplanmış tablolar
+        groups: Dict[tuple, List[_RecommendationRequest]] = {}
+        for request in batch:
+            try:
+                cached = self.engine.lookup_recommendation_tables(
+                    request.user_vector, request.task_complexity, request.top_k,
+                    request.mode, request.mask
+                )
+            except Exception as e:
+                request.future.set_exception(e)
+                continue
+            if cached is not None:
+                self.stats["table_hits"] += 1
+                request.future.set_result(cached)
+            else:
+                groups.setdefault((request.mode, request.task_complexity), []).append(request)
+
+        # 2) Kalanlar: (mode, task_complexity) başına tek score_matrix çağrısı
+        for (mode, task_complexity), requests in groups.items():
+            try:
+                matrix = self.engine.score_matrix(
+                    user_vectors_to_array([r.user_vector for r in requests]),
+                    modes=(mode,),
+                    task_complexity=task_complexity
+                )
+                totals = matrix["total"][:, :, 0]
+                components = np.stack([matrix[name] for name in SCORE_COMPONENTS], axis=-1)
+
+                # Aynı filtreyi kullanan istekler için tek U×k seçim; top-k'nın
+                # ilk k' elemanı top-k' ile aynı olduğundan en büyük k yeterli
+                by_mask: Dict[Optional[bytes], List[int]] = {}
+                for row, request in enumerate(requests):
+                    key = None if request.mask is None else request.mask.tobytes()
+                    by_mask.setdefault(key, []).append(row)
+
+                for rows in by_mask.values():
+                    rows = np.asarray(rows)
+                    top_k = max(requests[row].top_k for row in rows)
+                    selected = select_top_k(totals[rows], top_k, requests[rows[0]].mask)
+                    scores = np.take_along_axis(totals[rows], selected, axis=1).tolist()
+                    selected_components = components[rows[:, None], selected].tolist()
+                    for i, row in enumerate(rows):
+                        request = requests[row]
+                        request.future.set_result([
+                            self.engine.ranking_entry(
+                                matrix["persona_ids"][idx],
+                                scores[i][rank],
+                                dict(zip(SCORE_COMPONENTS, selected_components[i][rank]))
+                            )
+                            for rank, idx in enumerate(selected[i, :request.top_k].tolist())
+                        ])
+            except Exception as e:
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+
+# ============================================================================
+# YEREL HTTP ENDPOINT
+# ============================================================================
+
+def _make_handler(service: RecommendationService):
+    """Servise bağlı HTTP request handler sınıfı"""
+
+    class RecommendationHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok", **service.stats})
+            else:
+                self._send_json(404, {"error": f"Bilinmeyen endpoint: {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/recommend":
+                self._send_json(404, {"error": f"Bilinmeyen endpoint: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if "user_vector" in payload:
+                    user_vector = UserVector(**payload["user_vector"])
+                else:
+                    user_vector = service.engine.create_user_vector(payload["profile"])
+                rankings = service.recommend(
+                    user_vector,
+                    top_k=payload.get("top_k", 5),
+                    mode=payload.get("mode", "adaptive"),
+                    task_complexity=payload.get("task_complexity", 0.5),
+                    categories=payload.get("categories"),
+                    levels=payload.get("levels")
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            self._send_json(200, {"rankings": rankings})
+
+        def log_message(self, format, *args):
+            # Her istek için stderr'e log basma
+            pass
+
+    return RecommendationHandler
+
+
+def serve_http(service: RecommendationService, host: str = "127.0.0.1",
+               port: int = 8765, background: bool = True) -> ThreadingHTTPServer:
+    """
+    Servisi yerel HTTP endpoint'i olarak aç
+
+    Her HTTP isteği kendi thread'inde submit() çağırır; eşzamanlı istekler
+    servis tarafında aynı batch'e düşer.
+
+    Args:
+        service: Recommendation service
+        host: Dinlenecek adres (varsayılan yalnızca localhost)
+        port: Port (0 = boş port seç)
+        background: True ise server daemon thread'de çalışır
+
+    Returns:
+        ThreadingHTTPServer (durdurmak için shutdown())
+    """
+    service.start()
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, name="recommendation-http",
+                         daemon=True).start()
+    else:
+        server.serve_forever()
+    return server
+
+
+class RecommendationClient:
+    """Uzak RecommendationService için HTTP istemcisi (recommend() aynı imza)"""
+
+    def __init__(self, base_url: str = "http://127.0.0.1:8765", timeout: float = 5.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def recommend(self, user_vector: UserVector, top_k: int = 5, mode: str = "adaptive",
+                  task_complexity: float = 0.5,
+                  categories: Optional[Union[str, Sequence[str]]] = None,
+                  levels: Optional[Union[str, Sequence[str]]] = None,
+                  timeout: Optional[float] = None) -> List[Dict]:
+        """POST /recommend ve rank_personas formatında sonuç"""
+        payload = {
+            "user_vector": asdict(user_vector),
+            "top_k": top_k,
+            "mode": mode,
+            "task_complexity": task_complexity,
+            "categories": categories,
+            "levels": levels
+        }
+        request = urllib.request.Request(
+            f"{self.base_url}/recommend",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+            return json.loads(response.read())["rankings"]
+
+
+# Test için
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    engine = RecommendationEngine()
+    rng = np.random.default_rng(42)
+    profiles = [
+        {
+            "score": float(rng.uniform(0, 100)),
+            "level": engine.LEVELS[rng.integers(len(engine.LEVELS))],
+            "domain": "technical" if rng.random() < 0.5 else "educational",
+            "responses": {"ai_experience": bool(rng.random() < 0.5)}
+        }
+        for _ in range(500)
+    ]
+    user_vecs = [engine.create_user_vector(p) for p in profiles]
+
+    with RecommendationService(engine) as service:
+        def timed(user_vec):
+            start = time.perf_counter()
+            service.recommend(user_vec, top_k=3, mode="hybrid")
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=64) as pool:
+            latencies = np.array(list(pool.map(timed, user_vecs))) * 1000
+
+        print(f"✅ {service.stats['requests']} istek, {service.stats['batches']} batch "
+              f"(en büyük batch: {service.stats['max_batch_size']})")
+        print(f"⏱️ p50={np.percentile(latencies, 50):.2f}ms, p99={np.percentile(latencies, 99):.2f}ms")
+
+        server = serve_http(service, port=0)
+        client = RecommendationClient(f"http://127.0.0.1:{server.server_address[1]}")
+        for idx, ranking in enumerate(client.recommend(user_vecs[0], top_k=3,
+                                                       categories="education"), 1):
+            print(f"  {idx}. {ranking['persona_id']}: {ranking['score']:.3f}")
+        server.shutdown()
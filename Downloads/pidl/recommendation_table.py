@@ -0,0 +1,290 @@
+"""
+Önceden Hesaplanmış Tavsiye Tablosu (Recommendation Lookup Table)
+
+create_user_vector yalnızca 4 girdiye bağlıdır:
+- level (5 Dreyfus seviyesi)
+- domain (technical / diğer)
+- responses['ai_experience'] (bool)
+- score (0-100 tam sayı)
+
+Bu nedenle tüm girdi uzayı 5 × 2 × 2 × 101 = 2,020 hücreden ibarettir ve her
+hücrenin tavsiyesi tek bir batch skorlama ile önceden hesaplanabilir.
+Tablo top-k persona'yı ve skor bileşenlerini kompakt array'lerde tutar,
+.npz olarak saklanır ve rank_personas'ı O(1) lookup'a çevirir.
+
+Ağırlıklar veya persona vektörleri değişince engine fingerprint'i değişir
+ve tablo otomatik olarak devre dışı kalır.
+"""
+
+import os
+import json
+import numpy as np
+from typing import Dict, List, Optional
+
+from recommendation_engine import (
+    RecommendationEngine,
+    UserVector,
+    USER_VECTOR_FIELDS,
+    SCORE_COMPONENTS,
+    SCORING_MODES
+)
+
+
+class RecommendationTable:
+    """Ayrık profil uzayı için önceden hesaplanmış top-k tavsiye tablosu"""
+
+    # Profil uzayı eksenleri (hücre indeksi bu sırayla hesaplanır)
+    LEVELS = RecommendationEngine.LEVELS
+    DOMAINS = (False, True)  # domain == 'technical' mi?
+    AI_EXPERIENCE = (False, True)
+    SCORES = np.arange(101)
+
+    def __init__(self, persona_ids: List[str], user_matrix: np.ndarray,
+                 top_indices: np.ndarray, top_scores: np.ndarray,
+                 top_components: np.ndarray, params: Dict, fingerprint: str):
+        """
+        Args:
+            persona_ids: Persona id listesi (top_indices bu listeye işaret eder)
+            user_matrix: C×10 hücre kullanıcı matrisi
+            top_indices: C×k persona indeksleri (skora göre azalan)
+            top_scores: C×k toplam skorlar
+            top_components: C×k×5 bileşenler (SCORE_COMPONENTS sırası)
+            params: mode, task_complexity, time_factor, top_k
+            fingerprint: Tablonun üretildiği engine'in fingerprint'i
+        """
+        self.persona_ids = list(persona_ids)
+        self.user_matrix = user_matrix
+        self.top_indices = top_indices
+        self.top_scores = top_scores
+        self.top_components = top_components
+        self.params = params
+        self.fingerprint = fingerprint
+
+        # UserVector → hücre çözümlemesi için ters eşlemeler
+        self._level_codes = {
+            RecommendationEngine.LEVEL_MAPPING[level]: code
+            for code, level in enumerate(self.LEVELS)
+        }
+
+    @classmethod
+    def shape(cls) -> tuple:
+        """(level, domain, ai_experience, score) eksen boyutları"""
+        return (len(cls.LEVELS), len(cls.DOMAINS), len(cls.AI_EXPERIENCE), len(cls.SCORES))
+
+    @classmethod
+    def build(cls, engine: RecommendationEngine, mode: str = "adaptive",
+              task_complexity: float = 0.5, time_factor: float = 0.5,
+              top_k: Optional[int] = None) -> "RecommendationTable":
+        """
+        Tüm profil uzayını tek batch'te skorla ve tabloyu oluştur
+
+        Args:
+            engine: Recommendation engine
+            mode: Skorlama modu
+            task_complexity: Görev karmaşıklığı
+            time_factor: Zaman faktörü
+            top_k: Hücre başına saklanacak persona sayısı (None = tümü)
+
+        Returns:
+            RecommendationTable
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Geçersiz mod: {mode}. {SCORING_MODES} olmalı.")
+
+        # Izgara: level × domain × ai × score (C ≈ 2,020 hücre)
+        level_codes, is_technical, ai_experience, scores = (
+            axis.ravel() for axis in np.meshgrid(
+                np.arange(len(cls.LEVELS)),
+                np.array(cls.DOMAINS),
+                np.array(cls.AI_EXPERIENCE),
+                cls.SCORES,
+                indexing="ij"
+            )
+        )
+        user_matrix = engine.create_user_matrix(scores, level_codes, is_technical, ai_experience)
+
+        matrix = engine.score_matrix(user_matrix, modes=(mode,),
+                                     task_complexity=task_complexity,
+                                     time_factor=time_factor)
+        totals = matrix["total"][:, :, 0]
+        n_personas = totals.shape[1]
+        top_k = n_personas if top_k is None else min(top_k, n_personas)
+
+        # rank_personas ile aynı sıralama (eşitlikte orijinal sıra korunur)
+        order = np.argsort(-totals, axis=1, kind="stable")[:, :top_k]
+        components = np.stack([matrix[name] for name in SCORE_COMPONENTS], axis=-1)
+
+        return cls(
+            persona_ids=matrix["persona_ids"],
+            user_matrix=user_matrix,
+            top_indices=order.astype(np.int16),
+            top_scores=np.take_along_axis(totals, order, axis=1),
+            top_components=np.take_along_axis(components, order[:, :, None], axis=1),
+            params={
+                "mode": mode,
+                "task_complexity": float(task_complexity),
+                "time_factor": float(time_factor),
+                "top_k": int(top_k)
+            },
+            fingerprint=engine.fingerprint()
+        )
+
+    def matches(self, fingerprint: str, mode: str = "adaptive",
+                task_complexity: float = 0.5, time_factor: float = 0.5,
+                top_k: int = 5) -> bool:
+        """Tablo bu engine durumu ve parametreler için geçerli mi?"""
+        return (
+            fingerprint == self.fingerprint and
+            mode == self.params["mode"] and
+            float(task_complexity) == self.params["task_complexity"] and
+            float(time_factor) == self.params["time_factor"] and
+            top_k <= self.params["top_k"]
+        )
+
+    def cell_of(self, user_vector: UserVector) -> Optional[int]:
+        """
+        UserVector'ün tablo hücresini bul
+
+        Hücrenin kullanıcı satırı vektörle birebir aynı değilse (ör. tam sayı
+        olmayan skor veya bilinmeyen seviye) None döner.
+        """
+        level_code = self._level_codes.get(user_vector.technical_skill)
+        if level_code is None:
+            return None
+        score = int(round(user_vector.declarative_knowledge * 100))
+        if not 0 <= score < len(self.SCORES):
+            return None
+
+        cell = np.ravel_multi_index((
+            level_code,
+            int(user_vector.domain_knowledge == 0.8),
+            int(user_vector.ai_experience == 0.7),
+            score
+        ), self.shape())
+
+        row = np.array([getattr(user_vector, name) for name in USER_VECTOR_FIELDS])
+        if not np.array_equal(row, self.user_matrix[cell]):
+            return None
+        return int(cell)
+
+    def lookup(self, user_vector: UserVector, task_complexity: float = 0.5,
+               top_k: int = 5, mode: str = "adaptive", time_factor: float = 0.5,
+               fingerprint: Optional[str] = None,
+               mask: Optional[np.ndarray] = None) -> Optional[List[Dict]]:
+        """
+        O(1) tavsiye lookup'ı
+
+        Args:
+            user_vector: Kullanıcı vektörü
+            task_complexity: Görev karmaşıklığı
+            top_k: En iyi K persona
+            mode: Skorlama modu
+            time_factor: Zaman faktörü
+            fingerprint: Güncel engine fingerprint'i
+            mask: (P,) boolean persona filtresi (yalnızca tüm sıralamayı tutan tablolarda)
+
+        Returns:
+            rank_personas formatında liste; tablo geçersizse veya hücre yoksa None
+        """
+        if not self.matches(fingerprint, mode, task_complexity, time_factor, top_k):
+            return None
+        # Filtreli sorgu, kısaltılmış top-k tablosundan cevaplanamaz
+        if mask is not None and self.params["top_k"] < len(self.persona_ids):
+            return None
+        cell = self.cell_of(user_vector)
+        if cell is None:
+            return None
+
+        if mask is None:
+            ranks = range(top_k)
+        else:
+            ranks = np.flatnonzero(mask[self.top_indices[cell]])[:top_k]
+
+        return [
+            RecommendationEngine.ranking_entry(
+                self.persona_ids[self.top_indices[cell, rank]],
+                self.top_scores[cell, rank],
+                dict(zip(SCORE_COMPONENTS, self.top_components[cell, rank]))
+            )
+            for rank in ranks
+        ]
+
+    def save(self, filepath: str = 'data/recommendation_table.npz'):
+        """Tabloyu .npz olarak kaydet"""
+        np.savez_compressed(
+            filepath,
+            persona_ids=np.array(self.persona_ids),
+            user_matrix=self.user_matrix,
+            top_indices=self.top_indices,
+            top_scores=self.top_scores,
+            top_components=self.top_components,
+            params=np.array(json.dumps(self.params)),
+            fingerprint=np.array(self.fingerprint)
+        )
+
+    @classmethod
+    def load(cls, filepath: str = 'data/recommendation_table.npz') -> "RecommendationTable":
+        """Kaydedilmiş tabloyu yükle"""
+        with np.load(filepath, allow_pickle=False) as data:
+            return cls(
+                persona_ids=data["persona_ids"].tolist(),
+                user_matrix=data["user_matrix"],
+                top_indices=data["top_indices"],
+                top_scores=data["top_scores"],
+                top_components=data["top_components"],
+                params=json.loads(str(data["params"])),
+                fingerprint=str(data["fingerprint"])
+            )
+
+    @classmethod
+    def load_or_build(cls, engine: RecommendationEngine,
+                      filepath: str = 'data/recommendation_table.npz',
+                      mode: str = "adaptive", task_complexity: float = 0.5,
+                      time_factor: float = 0.5,
+                      top_k: Optional[int] = None) -> "RecommendationTable":
+        """
+        Diskteki tablo güncel engine ile uyumluysa yükle, değilse yeniden oluştur ve kaydet
+
+        Returns:
+            Geçerli RecommendationTable
+        """
+        wanted_k = len(engine.persona_vectors) if top_k is None else top_k
+        if os.path.exists(filepath):
+            try:
+                table = cls.load(filepath)
+                if table.matches(engine.fingerprint(), mode, task_complexity,
+                                 time_factor, wanted_k):
+                    return table
+            except (OSError, ValueError, KeyError):
+                pass
+
+        table = cls.build(engine, mode=mode, task_complexity=task_complexity,
+                          time_factor=time_factor, top_k=top_k)
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table.save(filepath)
+        return table
+
+
+# Test için
+if __name__ == "__main__":
+    import time
+
+    engine = RecommendationEngine()
+
+    start = time.time()
+    table = RecommendationTable.build(engine)
+    print(f"✅ {len(table.top_indices)} hücre {time.time() - start:.3f}s içinde hesaplandı")
+
+    engine.recommendation_tables.append(table)
+
+    user_vec = engine.create_user_vector({
+        "score": 50,
+        "level": "competent",
+        "domain": "technical",
+        "responses": {"ai_experience": True}
+    })
+
+    for idx, ranking in enumerate(engine.rank_personas(user_vec, top_k=3), 1):
+        print(f"{idx}. {ranking['persona_id']}: {ranking['score']:.3f}")
@@ -0,0 +1,302 @@
+"""
+Monte Carlo Belirsizlik Analizi (Recommendation Uncertainty)
+
+Sabit std_dev = 0.05 yerine, kullanıcı vektörünün (ve isteğe bağlı olarak
+persona vektörlerinin) ölçüm belirsizliği gürültü modeliyle örneklenir ve
+tüm örnekler tek bir batch skorlama ile değerlendirilir:
+
+    S örnek kullanıcı (S×10)  [+ S×P×10 örnek persona]
+        → score_matrix → S×P toplam skor + S×P×5 bileşen
+
+Çıktılar:
+- Ampirik güven aralıkları (persona başına quantile'lar)
+- Sıra kararlılığı: "persona X örneklerin %87'sinde top-1"
+- Bileşen başına varyans (belirsizliğin hangi bileşenden geldiği)
+
+Aynı seed ile aynı girdi her zaman aynı sonucu verir.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from recommendation_engine import (
+    RecommendationEngine,
+    UserVector,
+    USER_VECTOR_FIELDS,
+    PERSONA_VECTOR_FIELDS,
+    SCORING_MODES,
+    SCORE_COMPONENTS,
+    user_vectors_to_array
+)
+
+
+NOISE_DISTRIBUTIONS = ("gaussian", "uniform", "beta")
+
+
+@dataclass
+class NoiseModel:
+    """
+    Vektör boyutları için gürültü modeli
+
+    Std değerleri tek sayı (tüm boyutlar) veya alan adı → std dict'i
+    olabilir; dict'te olmayan boyutlar gürültüsüz kalır. Örnekler [0, 1]
+    aralığında tutulur.
+
+    distribution:
+        gaussian: x + N(0, σ²), [0, 1]'e kırpılır
+        uniform:  x + U(-√3σ, √3σ), [0, 1]'e kırpılır
+        beta:     Ortalaması x, std'si σ olan Beta (sınırlarda kırpma gerekmez)
+    """
+    user_std: Union[float, Dict[str, float]] = 0.05
+    persona_std: Union[float, Dict[str, float]] = 0.0
+    distribution: str = "gaussian"
+
+    def __post_init__(self):
+        if self.distribution not in NOISE_DISTRIBUTIONS:
+            raise ValueError(f"Geçersiz dağılım: {self.distribution}. {NOISE_DISTRIBUTIONS} olmalı.")
+
+    @staticmethod
+    def std_vector(std: Union[float, Dict[str, float]], field_names) -> np.ndarray:
+        """Std tanımını alan sırasına göre vektöre çevir"""
+        if isinstance(std, dict):
+            unknown = set(std) - set(field_names)
+            if unknown:
+                raise ValueError(f"Bilinmeyen alan(lar): {sorted(unknown)}")
+            return np.array([std.get(name, 0.0) for name in field_names], dtype=np.float64)
+        return np.full(len(field_names), float(std))
+
+    def perturb(self, values: np.ndarray, std: np.ndarray,
+                rng: np.random.Generator) -> np.ndarray:
+        """
+        values etrafında örnekle (std son eksen boyunca broadcast edilir)
+
+        Args:
+            values: Tekrarlanmış merkez değerleri (..., D)
+            std: (D,) std vektörü
+            rng: NumPy Generator
+
+        Returns:
+            values ile aynı şekilde örnekler
+        """
+        std = np.broadcast_to(std, values.shape)
+        if self.distribution == "gaussian":
+            samples = values + rng.standard_normal(values.shape) * std
+        elif self.distribution == "uniform":
+            half_width = np.sqrt(3.0) * std
+            samples = values + rng.uniform(-1.0, 1.0, values.shape) * half_width
+        else:
+            # Moment eşleme: mean = m, var = σ² → α = m·κ, β = (1-m)·κ
+            mean = np.clip(values, 1e-6, 1 - 1e-6)
+            variance = np.minimum(std ** 2, 0.99 * mean * (1 - mean))
+            noisy = variance > 0
+            concentration = np.where(noisy, mean * (1 - mean) / np.where(noisy, variance, 1.0) - 1, 1.0)
+            draws = rng.beta(mean * concentration, (1 - mean) * concentration)
+            samples = np.where(noisy, draws, values)
+        return np.clip(samples, 0.0, 1.0)
+
+
+@dataclass
+class UncertaintyResult:
+    """Tek kullanıcı için Monte Carlo sonuçları (P persona)"""
+    persona_ids: List[str]
+    mode: str
+    n_samples: int
+    seed: Optional[int]
+    confidence: float
+    top_k: int
+    mean: np.ndarray  # (P,)
+    std: np.ndarray  # (P,)
+    lower: np.ndarray  # (P,) ampirik alt quantile
+    upper: np.ndarray  # (P,) ampirik üst quantile
+    top1_probability: np.ndarray  # (P,)
+    topk_probability: np.ndarray  # (P,)
+    rank_probabilities: np.ndarray  # P×P: [persona, sıra] olasılığı
+    component_mean: Dict[str, np.ndarray]  # bileşen → (P,)
+    component_std: Dict[str, np.ndarray]  # bileşen → (P,)
+
+    def index(self, persona_id: str) -> int:
+        return self.persona_ids.index(persona_id)
+
+    def confidence_interval(self, persona_idx: int) -> Dict[str, float]:
+        """calculate_recommendation_score formatında ampirik CI"""
+        return {
+            "lower": float(self.lower[persona_idx]),
+            "upper": float(self.upper[persona_idx]),
+            "std_dev": float(self.std[persona_idx]),
+            "mean": float(self.mean[persona_idx]),
+            "confidence": self.confidence,
+            "n_samples": self.n_samples
+        }
+
+    def rank_stability(self, persona_idx: int) -> Dict[str, float]:
+        """Persona'nın top-1 / top-k olma olasılıkları"""
+        return {
+            "top1_probability": float(self.top1_probability[persona_idx]),
+            "topk_probability": float(self.topk_probability[persona_idx]),
+            "top_k": self.top_k
+        }
+
+    def component_variance(self, persona_idx: int) -> Dict[str, float]:
+        """Bileşen başına varyans"""
+        return {name: float(self.component_std[name][persona_idx] ** 2) for name in SCORE_COMPONENTS}
+
+    def summary(self, top_n: int = 5) -> List[Dict]:
+        """Top-1 olasılığına göre sıralı özet"""
+        order = np.argsort(-self.top1_probability, kind="stable")[:top_n]
+        return [
+            {
+                "persona_id": self.persona_ids[idx],
+                "mean_score": float(self.mean[idx]),
+                "confidence_interval": self.confidence_interval(idx),
+                **self.rank_stability(idx)
+            }
+            for idx in order
+        ]
+
+
+class MonteCarloUncertainty:
+    """Vektörize Monte Carlo belirsizlik motoru"""
+
+    def __init__(self, engine: RecommendationEngine, noise: Optional[NoiseModel] = None,
+                 n_samples: int = 2000, seed: Optional[int] = 42,
+                 confidence: float = 0.95):
+        """
+        Args:
+            engine: Recommendation engine
+            noise: Gürültü modeli (None = kullanıcı boyutlarında σ=0.05 Gaussian)
+            n_samples: Kullanıcı başına örnek sayısı
+            seed: RNG seed (None = her çağrıda farklı örnekler)
+            confidence: Güven düzeyi (ör. 0.95 → 2.5% / 97.5% quantile'lar)
+        """
+        self.engine = engine
+        self.noise = noise or NoiseModel()
+        self.n_samples = n_samples
+        self.seed = seed
+        self.confidence = confidence
+
+        self._user_std = NoiseModel.std_vector(self.noise.user_std, USER_VECTOR_FIELDS)
+        self._persona_std = NoiseModel.std_vector(self.noise.persona_std, PERSONA_VECTOR_FIELDS)
+
+    def _rng(self) -> np.random.Generator:
+        # Her simülasyon aynı seed'den başlar → aynı girdi, aynı sonuç
+        return np.random.default_rng(self.seed)
+
+    def sample_users(self, user_vector: UserVector,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Kullanıcı vektörü etrafında S×10 örnek"""
+        rng = rng or self._rng()
+        center = np.broadcast_to(user_vectors_to_array([user_vector]),
+                                 (self.n_samples, len(USER_VECTOR_FIELDS)))
+        return self.noise.perturb(center, self._user_std, rng)
+
+    def sample_personas(self, persona_matrix: np.ndarray,
+                        rng: Optional[np.random.Generator] = None) -> Optional[np.ndarray]:
+        """Persona matrisi (P×10) etrafında S×P×10 örnek; persona gürültüsü yoksa None"""
+        if not np.any(self._persona_std > 0):
+            return None
+        rng = rng or self._rng()
+        center = np.broadcast_to(persona_matrix, (self.n_samples,) + persona_matrix.shape)
+        return self.noise.perturb(center, self._persona_std, rng)
+
+    def simulate(self, user_vector: UserVector, mode: str = "adaptive",
+                 task_complexity: float = 0.5, time_factor: float = 0.5,
+                 personas=None, top_k: int = 3) -> UncertaintyResult:
+        """
+        Tek kullanıcı için tüm örnekleri tek batch'te skorla
+
+        Args:
+            user_vector: Kullanıcı vektörü
+            mode: Skorlama modu
+            task_complexity: Görev karmaşıklığı
+            time_factor: Zaman faktörü
+            personas: None (tümü), persona id listesi veya PersonaVector listesi
+            top_k: Kararlılık için K
+
+        Returns:
+            UncertaintyResult
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Geçersiz mod: {mode}. {SCORING_MODES} olmalı.")
+
+        rng = self._rng()
+        user_samples = self.sample_users(user_vector, rng)
+        store = self.engine.persona_subset(personas)
+        persona_samples = self.sample_personas(store.matrix, rng)
+
+        matrix = self.engine.score_matrix(
+            user_samples,
+            personas=personas,
+            modes=(mode,),
+            task_complexity=task_complexity,
+            time_factor=time_factor,
+            persona_matrix=persona_samples
+        )
+        totals = matrix["total"][:, :, 0]  # S×P
+        n_samples, n_personas = totals.shape
+        top_k = min(top_k, n_personas)
+
+        # Sıra dağılımı: ranks[s, p] = persona p'nin s. örnekteki sırası
+        order = np.argsort(-totals, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(n_personas), axis=1)
+        rank_counts = np.bincount(
+            (np.arange(n_personas)[None, :] * n_personas + ranks).ravel(),
+            minlength=n_personas * n_personas
+        ).reshape(n_personas, n_personas)
+        rank_probabilities = rank_counts / n_samples
+
+        tail = (1 - self.confidence) / 2
+        lower, upper = np.quantile(totals, [tail, 1 - tail], axis=0)
+
+        return UncertaintyResult(
+            persona_ids=matrix["persona_ids"],
+            mode=mode,
+            n_samples=n_samples,
+            seed=self.seed,
+            confidence=self.confidence,
+            top_k=top_k,
+            mean=totals.mean(axis=0),
+            std=totals.std(axis=0, ddof=1) if n_samples > 1 else np.zeros(n_personas),
+            lower=lower,
+            upper=upper,
+            top1_probability=rank_probabilities[:, 0],
+            topk_probability=rank_probabilities[:, :top_k].sum(axis=1),
+            rank_probabilities=rank_probabilities,
+            component_mean={name: matrix[name].mean(axis=0) for name in SCORE_COMPONENTS},
+            component_std={
+                name: matrix[name].std(axis=0, ddof=1) if n_samples > 1 else np.zeros(n_personas)
+                for name in SCORE_COMPONENTS
+            }
+        )
+
+
+# Test için
+if __name__ == "__main__":
+    import time
+
+    engine = RecommendationEngine()
+    user_vec = engine.create_user_vector({
+        "score": 55,
+        "level": "competent",
+        "domain": "technical",
+        "responses": {"ai_experience": True}
+    })
+
+    mc = MonteCarloUncertainty(engine, NoiseModel(user_std=0.05, persona_std=0.02),
+                               n_samples=5000, seed=42)
+    start = time.time()
+    result = mc.simulate(user_vec, mode="hybrid")
+    print(f"✅ {result.n_samples} örnek {time.time() - start:.3f}s içinde skorlandı\n")
+
+    for row in result.summary(top_n=5):
+        ci = row["confidence_interval"]
+        print(f"  {row['persona_id']}: M={row['mean_score']:.3f} "
+              f"[{ci['lower']:.3f}, {ci['upper']:.3f}] → "
+              f"top-1 %{row['top1_probability'] * 100:.0f}, "
+              f"top-3 %{row['topk_probability'] * 100:.0f}")
+
+    print("\n📊 rank_personas + belirsizlik:")
+    for ranking in engine.rank_personas(user_vec, top_k=3, mode="hybrid", uncertainty=mc):
+        print(f"  {ranking['persona_id']}: {ranking['score']:.3f} "
+              f"(top-1 %{ranking['rank_stability']['top1_probability'] * 100:.0f})")
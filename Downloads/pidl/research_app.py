@@ -15,6 +15,9 @@ from dotenv import load_dotenv
 from competency_assessment import CompetencyAssessment, CompetencyProfile
 from personas import get_persona_by_id, get_personas_by_level, ALL_PERSONAS, get_persona_details
 from recommendation_engine import RecommendationEngine
+from recommendation_table import RecommendationTable
+from recommendation_service import RecommendationService, RecommendationClient
+from online_weight_learner import OnlineWeightLearner
 from content_analyzer import ContentAnalyzer
 
 # Araştırma modülleri
@@ -93,6 +96,104 @@ def init_session_state():
         st.session_state.session_start_time = datetime.now()
 
 
+@st.cache_resource
+def get_recommendation_engine() -> RecommendationEngine:
+    """
+    Tüm oturumların paylaştığı recommendation engine
+
+    Similar, complementary ve (CompetencyAssessment'ın kullandığı) adaptive
+    modlar için tüm profil uzayı önceden hesaplanır (RecommendationTable);
+    katılımcının kritik yolunda skorlama yapılmaz.
+    """
+    engine = RecommendationEngine()
+    for mode in ("similarity", "complementary", "adaptive"):
+        engine.recommendation_tables.append(RecommendationTable.load_or_build(
+            engine,
+            filepath=f"data/recommendation_table_{mode}.npz",
+            mode=mode,
+            task_complexity=0.5
+        ))
+    return engine
+
+
+@st.cache_resource
+def get_recommendation_service():
+    """
+    Eşzamanlı katılımcı isteklerini tek batch'te skorlayan paylaşılan servis
+
+    RECOMMENDATION_SERVICE_URL tanımlıysa birden fazla uygulama worker'ının
+    paylaştığı yerel HTTP servisi kullanılır (bkz. recommendation_service.py).
+    """
+    service_url = os.getenv("RECOMMENDATION_SERVICE_URL")
+    if service_url:
+        return RecommendationClient(service_url)
+    return RecommendationService(get_recommendation_engine()).start()
+
+
+WEIGHT_LEARNER_PATH = "data/weight_learner.json"
+
+
+@st.cache_resource
+def get_weight_learner() -> OnlineWeightLearner:
+    """
+    AI değerlendirme puanlarından artımlı ağırlık öğrenici (tüm oturumlar paylaşır)
+
+    Tavsiye ağırlıkları çalışma sırasında değişmesin diye yalnızca öğrenir;
+    engine'e uygulanmaz (analiz için snapshot diske yazılır).
+    """
+    engine = RecommendationEngine()
+    if os.path.exists(WEIGHT_LEARNER_PATH):
+        try:
+            return OnlineWeightLearner.load(engine, WEIGHT_LEARNER_PATH)
+        except (OSError, ValueError, KeyError):
+            pass
+    return OnlineWeightLearner(engine)
+
+
+def record_ai_evaluation_feedback(persona_id: str, ai_type: str, responses: dict):
+    """
+    Kaydedilen AI değerlendirmesini öğreniciye tek adım olarak ver
+
+    Öğrenme yalnızca analiz içindir: öğrenici veya disk hatası veri toplama
+    akışını (görevin tamamlanmasını) durdurmaz.
+    """
+    try:
+        _update_weight_learner(persona_id, ai_type, responses)
+    except Exception as e:
+        print(f"⚠️ Ağırlık öğrenici güncellenemedi: {e}")
+
+
+def _update_weight_learner(persona_id: str, ai_type: str, responses: dict):
+    """record_ai_evaluation_feedback gövdesi"""
+    profile = st.session_state.get("competency_profile")
+    if profile is None:
+        return
+    learner = get_weight_learner()
+    # Gerçek profil: segment (Dreyfus seviyesi) ve gradyan kullanıcı özellikleri buna bağlı
+    user_vector = learner.engine.create_user_vector(profile.engine_profile())
+    mode = "similarity" if ai_type == "Similar" else "complementary"
+    learner.update_from_evaluation(user_vector, persona_id, responses, mode=mode)
+    os.makedirs(os.path.dirname(WEIGHT_LEARNER_PATH), exist_ok=True)
+    learner.save(WEIGHT_LEARNER_PATH)
+
+
+def _score_info_from_ranking(rec_engine: RecommendationEngine, ranking: dict, mode: str) -> dict:
+    """rank_personas satırını calculate_recommendation_score formatına çevir"""
+    return {
+        "total_score": ranking["score"],
+        "mode": mode,
+        "strategy": rec_engine.MODE_STRATEGIES[mode],
+        "components": ranking["components"],
+        "weights": {
+            "alpha": rec_engine.alpha,
+            "beta": rec_engine.beta,
+            "gamma": rec_engine.gamma,
+            "delta": rec_engine.delta
+        },
+        "confidence_interval": ranking["confidence_interval"]
+    }
+
+
 def get_persona_recommendations_from_profile(profile: CompetencyProfile, use_math_engine: bool = True):
     """
     CompetencyProfile'dan Similar ve Complementary persona önerileri al
@@ -108,7 +209,7 @@ def get_persona_recommendations_from_profile(profile: CompetencyProfile, use_mat
     if use_math_engine:
         # 🔬 MATEMATİKSEL ENGINE - 6 AŞAMALI HESAPLAMA
         try:
-            rec_engine = RecommendationEngine()
+            rec_engine = get_recommendation_engine()
 
             # Profile'ı dict'e çevir
             profile_dict = {
@@ -127,47 +228,37 @@ def get_persona_recommendations_from_profile(profile: CompetencyProfile, use_mat
 
             # AŞAMA 3-4: Similarity + Competency hesapla
             # AŞAMA 5-6: Performance + Learning hesapla + Rank
+            # (Önceden hesaplanmış tablodan O(1) okunur, kategori filtresi maske ile)
 
             # SIMILAR MOD: Dominant alandan en benzer
+            # COMPLEMENTARY MOD: Zayıf alandan tamamlayıcı
             domain_map = {"technical": "technology", "educational": "education"}
             dominant_category = domain_map.get(profile.dominant_domain, "technology")
-
-            similar_candidates = [p for p in ALL_PERSONAS if p.category == dominant_category]
-            similar_scores = []
-
-            for persona in similar_candidates:
-                persona_vector = rec_engine.persona_vectors.get(persona.id)
-                if persona_vector:
-                    score_result = rec_engine.calculate_recommendation_score(
-                        user_vector, persona_vector,
-                        task_complexity=0.5,
-                        mode="similarity"
-                    )
-                    similar_scores.append((persona, score_result))
-
-            similar_scores.sort(key=lambda x: x[1]["total_score"], reverse=True)
-            similar_persona = similar_scores[0][0] if similar_scores else ALL_PERSONAS[0]
-            similar_score_info = similar_scores[0][1] if similar_scores else None
-
-            # COMPLEMENTARY MOD: Zayıf alandan tamamlayıcı
             weak_category = domain_map.get(profile.weak_domain, "education")
 
-            complementary_candidates = [p for p in ALL_PERSONAS if p.category == weak_category]
-            complementary_scores = []
+            # Her iki mod da paylaşılan servise aynı anda gönderilir (aynı batch'e düşer)
+            service = get_recommendation_service()
+            if isinstance(service, RecommendationService):
+                similar_future = service.submit(user_vector, top_k=1, mode="similarity",
+                                                categories=dominant_category)
+                complementary_future = service.submit(user_vector, top_k=1, mode="complementary",
+                                                      categories=weak_category)
+                similar_top = similar_future.result(timeout=5.0)
+                complementary_top = complementary_future.result(timeout=5.0)
+            else:
+                similar_top = service.recommend(user_vector, top_k=1, mode="similarity",
+                                                categories=dominant_category)
+                complementary_top = service.recommend(user_vector, top_k=1, mode="complementary",
+                                                      categories=weak_category)
 
-            for persona in complementary_candidates:
-                persona_vector = rec_engine.persona_vectors.get(persona.id)
-                if persona_vector:
-                    score_result = rec_engine.calculate_recommendation_score(
-                        user_vector, persona_vector,
-                        task_complexity=0.5,
-                        mode="complementary"
-                    )
-                    complementary_scores.append((persona, score_result))
+            similar_persona = get_persona_by_id(similar_top[0]["persona_id"]) if similar_top else ALL_PERSONAS[0]
+            similar_score_info = (_score_info_from_ranking(rec_engine, similar_top[0], "similarity")
+                                  if similar_top else None)
 
-            complementary_scores.sort(key=lambda x: x[1]["total_score"], reverse=True)
-            complementary_persona = complementary_scores[0][0] if complementary_scores else similar_persona
-            complementary_score_info = complementary_scores[0][1] if complementary_scores else None
+            complementary_persona = (get_persona_by_id(complementary_top[0]["persona_id"])
+                                     if complementary_top else similar_persona)
+            complementary_score_info = (_score_info_from_ranking(rec_engine, complementary_top[0], "complementary")
+                                        if complementary_top else None)
 
             return {
                 "similar": similar_persona,
@@ -390,7 +481,7 @@ def phase_competency():
             "5 teknik + 5 pedagojik soru ile hem yazılım hem eğitim yetkinliğinizi ölçeceğiz.")
 
     # CompetencyAssessment nesnesi oluştur
-    assessment = CompetencyAssessment()
+    assessment = CompetencyAssessment(rec_engine=get_recommendation_engine())
 
     # Demografik bilgiler
     st.markdown("### 1️⃣ Demografik Bilgiler")
@@ -1092,6 +1183,7 @@ def phase_tasks():
 
         if st.button("✅ AI Değerlendirmesi Tamamlandı", type="primary"):
             DataLogger.save_ai_evaluation(st.session_state.current_task_session_id, ai_eval_responses)
+            record_ai_evaluation_feedback(assigned["persona_id"], assigned["ai_type"], ai_eval_responses)
 
             # Görevi tamamla
             duration = (datetime.now() - st.session_state.task_start_time).total_seconds() / 60
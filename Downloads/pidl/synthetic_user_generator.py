@@ -3,12 +3,18 @@ Synthetic User Profile Generator
 Monte Carlo sampling ile 150 gerçekçi kullanıcı profili oluşturur
 
 Araştırma için: 5 seviye × 2 domain × 15 kişi = 150 user
+
+Büyük kohortlar için generate_columns() alanları strata blokları halinde
+vektörel çeker ve sütunsal (SyntheticUserColumns) döndürür. Dict'ler
+yalnızca istendiğinde üretilir. Her blok SeedSequence ağacında kendi
+stream'ine sahiptir; çıktı worker sayısı ve chunk boyutundan bağımsızdır.
 """
 
 import numpy as np
 import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 import uuid
 
 
@@ -18,15 +24,64 @@ class SyntheticUserGenerator:
     # Dreyfus seviyeleri
     LEVELS = ['novice', 'advanced_beginner', 'competent', 'proficient', 'expert']
     DOMAINS = ['technical', 'educational']
+    EDUCATION_LEVELS = ['Lisans', 'Yüksek Lisans', 'Doktora']
+    
+    # Seviyeye göre (mean, SD) parametreleri
+    SCORE_PARAMS = {
+        'novice': (10, 5),
+        'advanced_beginner': (30, 8),
+        'competent': (50, 7),
+        'proficient': (70, 8),
+        'expert': (90, 5)
+    }
+    AGE_PARAMS = {
+        'novice': (23, 3),  # M=23, SD=3
+        'advanced_beginner': (26, 4),
+        'competent': (32, 5),
+        'proficient': (38, 6),
+        'expert': (45, 8)
+    }
+    EXPERIENCE_PARAMS = {
+        'novice': (0.5, 0.3),
+        'advanced_beginner': (1.5, 0.8),
+        'competent': (4.0, 1.5),
+        'proficient': (8.0, 2.5),
+        'expert': (15.0, 5.0)
+    }
+    # Eğitim durumu kümülatif olasılıkları (Lisans, Yüksek Lisans, Doktora)
+    # Novice: Çoğu lisans, Expert: Çoğu doktora
+    EDUCATION_CUMULATIVE = {
+        'novice': (0.7, 0.95, 1.0),
+        'advanced_beginner': (0.7, 0.95, 1.0),
+        'competent': (0.4, 0.8, 1.0),
+        'proficient': (0.2, 0.6, 1.0),
+        'expert': (0.2, 0.6, 1.0)
+    }
+    # Learning goal Beta(a, b) parametreleri
+    LEARNING_GOAL_PARAMS = {
+        'novice': (8, 2),  # Yüksek (0.7-0.9)
+        'advanced_beginner': (8, 2),
+        'competent': (4, 4),  # Orta (0.4-0.6)
+        'proficient': (2, 8),  # Düşük (0.1-0.3)
+        'expert': (2, 8)
+    }
+    MULTI_SKILLED_RATE = 0.08
+    # Sütunsal modda bir random stream'in kapsadığı kullanıcı sayısı
+    # (stream tanımının parçasıdır; değiştirmek aynı seed'in çıktısını değiştirir)
+    BLOCK_SIZE = 8192
     
     def __init__(self, seed=42):
         """
         Generator başlat
         
+        Global np.random durumuna dokunulmaz; tüm çekilişler seed'den türetilen
+        np.random.Generator'lar ile yapılır.
+        
         Args:
-            seed: Random seed (reproducibility için)
+            seed: Random seed (reproducibility için, None = rastgele entropy)
         """
-        np.random.seed(seed)
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
         self.users = []
     
     def generate_users(self, n_per_stratum=15) -> List[Dict]:
@@ -58,6 +113,96 @@ class SyntheticUserGenerator:
         
         return self.users
     
+    def generate_columns(self, n_per_stratum=15, workers: Optional[int] = None,
+                         chunk_size: Optional[int] = None) -> 'SyntheticUserColumns':
+        """
+        Stratified sampling ile sütunsal (vektörel) kohort oluştur
+        
+        generate_users ile aynı dağılımlar ve strata sırası (seviye → domain
+        → kişi). Her strata BLOCK_SIZE'lık bloklara bölünür ve her blok kendi
+        SeedSequence(seed, spawn_key=(strata, blok)) stream'i ile tek
+        seferde vektörel çekilir. Bu yüzden çıktı, verilen seed için worker
+        sayısından ve chunk_size'dan bağımsız olarak bit düzeyinde aynıdır
+        (generate_users ile aynı stream'i izlemez).
+        
+        Args:
+            n_per_stratum: Her strata'da kaç kişi
+            workers: Process sayısı (None veya 1 = mevcut process)
+            chunk_size: Bir iş parçasındaki kullanıcı sayısı (None = BLOCK_SIZE,
+                BLOCK_SIZE'ın katına yukarı yuvarlanır)
+            
+        Returns:
+            SyntheticUserColumns (self.users'a eklenmez)
+        """
+        # Blok sınırına hizalı chunk'lar: hiçbir blok iki kez üretilmez
+        chunk_size = -(-(chunk_size or self.BLOCK_SIZE) // self.BLOCK_SIZE) * self.BLOCK_SIZE
+        tasks = [
+            (self.seed_sequence.entropy, stratum, n_per_stratum,
+             chunk_start, min(chunk_start + chunk_size, n_per_stratum), self.BLOCK_SIZE)
+            for stratum in range(len(self.LEVELS) * len(self.DOMAINS))
+            for chunk_start in range(0, n_per_stratum, chunk_size)
+        ]
+        
+        if workers and workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map() sırayı korur → birleştirme sırası worker'dan bağımsız
+                parts = list(executor.map(_generate_stratum_range, *zip(*tasks)))
+        else:
+            parts = [_generate_stratum_range(*task) for task in tasks]
+        
+        if parts:
+            columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        else:
+            # Boş kohort: aynı sütunlar, sıfır uzunluk
+            columns = {'user_index': np.empty(0, dtype=np.int64),
+                       **self._sample_block(self.rng, 0, 0, 0)}
+        return SyntheticUserColumns(columns, generated_at=datetime.now().isoformat())
+    
+    @classmethod
+    def _sample_block(cls, rng: np.random.Generator, level_index: int,
+                      domain_index: int, size: int) -> Dict[str, np.ndarray]:
+        """
+        Tek bir strata bloğundaki tüm alanları vektörel çek
+        
+        Çekiliş sırası stream tanımının parçasıdır; değiştirilirse aynı
+        seed farklı kohort üretir.
+        """
+        level = cls.LEVELS[level_index]
+        domain = cls.DOMAINS[domain_index]
+        
+        # Dominant domain normal, zayıf taraf Beta(2, 3) * 50
+        dominant = rng.normal(*cls.SCORE_PARAMS[level], size=size)
+        weak = rng.beta(2, 3, size=size) * 50
+        multi_skilled = rng.random(size) < cls.MULTI_SKILLED_RATE
+        weak += 30 * multi_skilled
+        if domain == 'technical':
+            technical_score, educational_score = dominant, weak
+        else:
+            technical_score, educational_score = weak, dominant
+        technical_score = np.clip(technical_score, 0, 100)
+        educational_score = np.clip(educational_score, 0, 100)
+        
+        age = np.clip(rng.normal(*cls.AGE_PARAMS[level], size=size).astype(np.int64), 18, 65)
+        experience_years = np.round(np.maximum(0, rng.normal(*cls.EXPERIENCE_PARAMS[level], size=size)), 1)
+        # Eğitim: kümülatif olasılıklar üzerinde searchsorted
+        education_code = np.searchsorted(cls.EDUCATION_CUMULATIVE[level], rng.random(size), side='right')
+        learning_goal = np.round(rng.beta(*cls.LEARNING_GOAL_PARAMS[level], size=size), 3)
+        
+        return {
+            'level_code': np.full(size, level_index, dtype=np.int8),
+            'domain_code': np.full(size, domain_index, dtype=np.int8),
+            'technical_score': np.round(technical_score, 1),
+            'educational_score': np.round(educational_score, 1),
+            'overall_score': np.round((technical_score + educational_score) / 2, 1),
+            'learning_goal': learning_goal,
+            'age': age.astype(np.int16),
+            'experience_years': experience_years,
+            'education_code': education_code.astype(np.int8),
+            'multi_skilled': multi_skilled,
+            'ai_experience': rng.random(size) > 0.5,
+            'prompt_experience': rng.random(size) > 0.7
+        }
+    
     def _generate_single_user(self, user_id: int, level: str, domain: str) -> Dict:
         """
         Tek bir user profili oluştur
@@ -71,32 +216,24 @@ class SyntheticUserGenerator:
             User profile dict
         """
         # Seviyeye göre score mean ve SD
-        level_params = {
-            'novice': (10, 5),
-            'advanced_beginner': (30, 8),
-            'competent': (50, 7),
-            'proficient': (70, 8),
-            'expert': (90, 5)
-        }
-        
-        score_mean, score_sd = level_params[level]
+        score_mean, score_sd = self.SCORE_PARAMS[level]
         
         # Dominant domain için yüksek skor
         if domain == 'technical':
             # Technical yüksek
-            technical_score = np.random.normal(score_mean, score_sd)
+            technical_score = self.rng.normal(score_mean, score_sd)
             # Educational düşük (zayıf taraf)
-            educational_score = np.random.beta(2, 3) * 50  # Beta dist, sola çarpık
+            educational_score = self.rng.beta(2, 3) * 50  # Beta dist, sola çarpık
             
         else:  # educational
             # Educational yüksek
-            educational_score = np.random.normal(score_mean, score_sd)
+            educational_score = self.rng.normal(score_mean, score_sd)
             # Technical düşük
-            technical_score = np.random.beta(2, 3) * 50
+            technical_score = self.rng.beta(2, 3) * 50
         
         # Weak negative correlation enforce (r≈-0.20)
         # Bazen her ikisi de yüksek olabilir (multi-skilled, %8)
-        if np.random.rand() < 0.08:  # %8 şans
+        if self.rng.random() < self.MULTI_SKILLED_RATE:  # %8 şans
             # Multi-skilled user
             if domain == 'technical':
                 educational_score += 30
@@ -114,12 +251,7 @@ class SyntheticUserGenerator:
         sector = domain  # Basitleştirilmiş
         
         # Learning goal (seviyeye göre)
-        if level in ['novice', 'advanced_beginner']:
-            learning_goal = np.random.beta(8, 2)  # Yüksek (0.7-0.9)
-        elif level == 'competent':
-            learning_goal = np.random.beta(4, 4)  # Orta (0.4-0.6)
-        else:
-            learning_goal = np.random.beta(2, 8)  # Düşük (0.1-0.3)
+        learning_goal = self.rng.beta(*self.LEARNING_GOAL_PARAMS[level])
         
         # User dict
         user = {
@@ -135,8 +267,8 @@ class SyntheticUserGenerator:
             'experience_years': experience_years,
             'education_level': education_level,
             'sector': sector,
-            'ai_experience': np.random.rand() > 0.5,
-            'prompt_experience': np.random.rand() > 0.7,
+            'ai_experience': self.rng.random() > 0.5,
+            'prompt_experience': self.rng.random() > 0.7,
             'generated_at': datetime.now().isoformat()
         }
         
@@ -144,59 +276,21 @@ class SyntheticUserGenerator:
     
     def _generate_age(self, level: str) -> int:
         """Seviyeye göre realistic yaş"""
-        age_params = {
-            'novice': (23, 3),  # M=23, SD=3
-            'advanced_beginner': (26, 4),
-            'competent': (32, 5),
-            'proficient': (38, 6),
-            'expert': (45, 8)
-        }
-        mean, sd = age_params[level]
-        age = int(np.random.normal(mean, sd))
+        mean, sd = self.AGE_PARAMS[level]
+        age = int(self.rng.normal(mean, sd))
         return np.clip(age, 18, 65)
     
     def _generate_experience(self, level: str) -> float:
         """Seviyeye göre deneyim yılı"""
-        exp_params = {
-            'novice': (0.5, 0.3),
-            'advanced_beginner': (1.5, 0.8),
-            'competent': (4.0, 1.5),
-            'proficient': (8.0, 2.5),
-            'expert': (15.0, 5.0)
-        }
-        mean, sd = exp_params[level]
-        exp = np.random.normal(mean, sd)
+        mean, sd = self.EXPERIENCE_PARAMS[level]
+        exp = self.rng.normal(mean, sd)
         return round(max(0, exp), 1)
     
     def _generate_education(self, level: str) -> str:
         """Seviyeye göre eğitim durumu"""
-        # Novice: Çoğu lisans
-        # Expert: Çoğu doktora
-        rand = np.random.rand()
-        
-        if level in ['novice', 'advanced_beginner']:
-            if rand < 0.7:
-                return 'Lisans'
-            elif rand < 0.95:
-                return 'Yüksek Lisans'
-            else:
-                return 'Doktora'
-        
-        elif level == 'competent':
-            if rand < 0.4:
-                return 'Lisans'
-            elif rand < 0.8:
-                return 'Yüksek Lisans'
-            else:
-                return 'Doktora'
-        
-        else:  # proficient, expert
-            if rand < 0.2:
-                return 'Lisans'
-            elif rand < 0.6:
-                return 'Yüksek Lisans'
-            else:
-                return 'Doktora'
+        rand = self.rng.random()
+        index = np.searchsorted(self.EDUCATION_CUMULATIVE[level], rand, side='right')
+        return self.EDUCATION_LEVELS[index]
     
     def export_to_json(self, filepath='data/synthetic_users.json'):
         """JSON'a export et"""
@@ -241,6 +335,180 @@ class SyntheticUserGenerator:
         return stats
 
 
+
+def _generate_stratum_range(entropy, stratum: int, n_per_stratum: int, start: int,
+                            stop: int, block_size: int) -> Dict[str, np.ndarray]:
+    """
+    Bir strata'nın [start, stop) kullanıcılarını üret (process pool işçisi)
+    
+    Aralığın dokunduğu bloklar tam olarak üretilip kesilir; böylece aynı
+    kullanıcı hangi chunk'ta üretilirse üretilsin aynı değerleri alır.
+    """
+    n_domains = len(SyntheticUserGenerator.DOMAINS)
+    level_index, domain_index = divmod(stratum, n_domains)
+    parts = []
+    for block in range(start // block_size, (stop - 1) // block_size + 1):
+        block_start = block * block_size
+        block_length = min(block_size, n_per_stratum - block_start)
+        # SeedSequence(entropy).spawn(...)[stratum].spawn(...)[block] ile aynı stream
+        rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(stratum, block)))
+        values = SyntheticUserGenerator._sample_block(rng, level_index, domain_index, block_length)
+        rows = slice(max(start, block_start) - block_start, min(stop, block_start + block_length) - block_start)
+        parts.append({name: column[rows] for name, column in values.items()})
+    
+    columns = {'user_index': stratum * n_per_stratum + np.arange(start, stop, dtype=np.int64)}
+    columns.update({name: np.concatenate([part[name] for part in parts]) for name in parts[0]})
+    return columns
+
+
+class SyntheticUserColumns:
+    """
+    Sütunsal sentetik kullanıcı kohortu
+    
+    Her alan bir NumPy dizisidir; seviye, domain ve eğitim durumu kategorik
+    kod (int8) olarak tutulur. 1M kullanıcı ~60 MB yer kaplar. Dict'ler
+    (generate_users formatı) yalnızca iter_users/to_dicts ile istendiğinde
+    üretilir.
+    """
+    
+    LEVELS = SyntheticUserGenerator.LEVELS
+    DOMAINS = SyntheticUserGenerator.DOMAINS
+    EDUCATION_LEVELS = SyntheticUserGenerator.EDUCATION_LEVELS
+    
+    def __init__(self, columns: Dict[str, np.ndarray], generated_at: Optional[str] = None):
+        """
+        Args:
+            columns: Alan adı → eşit uzunlukta NumPy dizisi
+            generated_at: Kohortun oluşturulma zamanı (ISO format)
+        """
+        self.columns = columns
+        self.generated_at = generated_at or datetime.now().isoformat()
+    
+    def __len__(self) -> int:
+        return len(self.columns['user_index'])
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def subset(self, start: int, stop: int) -> 'SyntheticUserColumns':
+        """[start, stop) satırlarını paylaşan (kopyasız) alt kohort"""
+        return SyntheticUserColumns(
+            {name: values[start:stop] for name, values in self.columns.items()},
+            generated_at=self.generated_at
+        )
+    
+    def user_matrix(self, engine) -> np.ndarray:
+        """
+        RecommendationEngine için U×10 kullanıcı matrisi
+        
+        overall_score, seviye, dominant domain ve AI deneyimi sütunları
+        engine.create_user_matrix'e kopyasız kod olarak verilir.
+        """
+        return engine.create_user_matrix(
+            self.columns['overall_score'],
+            self.columns['level_code'],
+            self.columns['domain_code'] == self.DOMAINS.index('technical'),
+            self.columns['ai_experience']
+        )
+    
+    def levels(self) -> np.ndarray:
+        """Seviye adları dizisi"""
+        return np.asarray(self.LEVELS)[self.columns['level_code']]
+    
+    def domains(self) -> np.ndarray:
+        """Dominant domain adları dizisi"""
+        return np.asarray(self.DOMAINS)[self.columns['domain_code']]
+    
+    def to_dataframe(self):
+        """
+        pandas DataFrame'e dönüştür (level, dominant_domain, education_level
+        kategorik dtype ile, kodlar kopyalanmadan)
+        """
+        import pandas as pd
+        
+        data = {
+            name: values for name, values in self.columns.items()
+            if name not in ('level_code', 'domain_code', 'education_code')
+        }
+        data['level'] = pd.Categorical.from_codes(self.columns['level_code'], self.LEVELS)
+        data['dominant_domain'] = pd.Categorical.from_codes(self.columns['domain_code'], self.DOMAINS)
+        data['education_level'] = pd.Categorical.from_codes(
+            self.columns['education_code'], self.EDUCATION_LEVELS
+        )
+        return pd.DataFrame(data)
+    
+    def iter_users(self, start: int = 0, stop: Optional[int] = None,
+                   chunk_size: int = 10000) -> Iterator[Dict]:
+        """
+        generate_users formatında user dict'leri (tembel üretim)
+        
+        Args:
+            start: İlk satır
+            stop: Son satır (hariç, None = sona kadar)
+            chunk_size: Tek seferde Python nesnesine çevrilen satır sayısı
+            
+        Yields:
+            User profile dict
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for chunk_start in range(start, stop, chunk_size):
+            rows = slice(chunk_start, min(chunk_start + chunk_size, stop))
+            # Sütun başına tek tolist(): NumPy skalerleri yerine Python tipleri
+            chunk = {name: values[rows].tolist() for name, values in self.columns.items()}
+            for i in range(len(chunk['user_index'])):
+                technical_score = chunk['technical_score'][i]
+                yield {
+                    'id': f"synthetic_user_{chunk['user_index'][i]:03d}",
+                    'uuid': str(uuid.uuid4()),
+                    'level': self.LEVELS[chunk['level_code'][i]],
+                    'dominant_domain': self.DOMAINS[chunk['domain_code'][i]],
+                    'technical_score': technical_score,
+                    'educational_score': chunk['educational_score'][i],
+                    'overall_score': chunk['overall_score'][i],
+                    'learning_goal': chunk['learning_goal'][i],
+                    'age': chunk['age'][i],
+                    'experience_years': chunk['experience_years'][i],
+                    'education_level': self.EDUCATION_LEVELS[chunk['education_code'][i]],
+                    'sector': self.DOMAINS[chunk['domain_code'][i]],
+                    'ai_experience': chunk['ai_experience'][i],
+                    'prompt_experience': chunk['prompt_experience'][i],
+                    'generated_at': self.generated_at
+                }
+    
+    def to_dicts(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """iter_users çıktısını listeye topla"""
+        return list(self.iter_users(start, stop))
+    
+    def get_statistics(self) -> Dict:
+        """İstatistiksel özet (SyntheticUserGenerator.get_statistics ile aynı format)"""
+        if len(self) == 0:
+            return {}
+        
+        tech_scores = self.columns['technical_score']
+        edu_scores = self.columns['educational_score']
+        level_counts = np.bincount(self.columns['level_code'], minlength=len(self.LEVELS))
+        domain_counts = np.bincount(self.columns['domain_code'], minlength=len(self.DOMAINS))
+        
+        return {
+            'total_users': len(self),
+            'technical': {
+                'mean': tech_scores.mean(),
+                'std': tech_scores.std(),
+                'min': tech_scores.min(),
+                'max': tech_scores.max()
+            },
+            'educational': {
+                'mean': edu_scores.mean(),
+                'std': edu_scores.std(),
+                'min': edu_scores.min(),
+                'max': edu_scores.max()
+            },
+            'correlation': np.corrcoef(tech_scores, edu_scores)[0, 1],
+            'level_distribution': dict(zip(self.LEVELS, level_counts.tolist())),
+            'domain_distribution': dict(zip(self.DOMAINS, domain_counts.tolist()))
+        }
+
+
 # Test için
 if __name__ == "__main__":
     print("🧪 Synthetic User Generator Test\n")
@@ -268,6 +536,26 @@ if __name__ == "__main__":
     for u in users[:5]:
         print(f"  {u['id']}: {u['level']}, {u['dominant_domain']}, "
               f"Tech={u['technical_score']:.1f}, Edu={u['educational_score']:.1f}")
+    
+    # Sütunsal mod: 1M kullanıcı
+    import time
+    start = time.time()
+    cohort = generator.generate_columns(n_per_stratum=100_000)
+    elapsed = time.time() - start
+    column_mb = sum(values.nbytes for values in cohort.columns.values()) / 1e6
+    print(f"\n⚡ Sütunsal mod: {len(cohort):,} user {elapsed:.2f}s içinde ({column_mb:.0f} MB)")
+    cohort_stats = cohort.get_statistics()
+    print(f"  Technical: M={cohort_stats['technical']['mean']:.1f}, "
+          f"Educational: M={cohort_stats['educational']['mean']:.1f}, "
+          f"r={cohort_stats['correlation']:.3f}")
+    print(f"  İlk user: {cohort.to_dicts(0, 1)[0]}")
+    
+    # Process pool: worker sayısı ve chunk boyutu çıktıyı değiştirmez
+    import os
+    start = time.time()
+    parallel = generator.generate_columns(n_per_stratum=100_000, workers=os.cpu_count(), chunk_size=25_000)
+    identical = all(np.array_equal(cohort[name], parallel[name]) for name in cohort.columns)
+    print(f"  {os.cpu_count()} worker: {time.time() - start:.2f}s, bit düzeyinde aynı: {identical}")
 
 
 
@@ -6,6 +6,7 @@ Sistemin tüm bileşenlerini test eder
 
 import os
 import sys
+import json
 from dotenv import load_dotenv
 
 # .env yükle
@@ -194,6 +195,240 @@ print(f"Fibonacci(10) = {result}")
         return False
 
 
+def test_score_matrix():
+    """score_matrix ile calculate_recommendation_score aynı skoru vermeli"""
+    print_header("🧮 Score Matrix Testi")
+    
+    from recommendation_engine import RecommendationEngine
+    from synthetic_user_generator import SyntheticUserGenerator
+    
+    engine = RecommendationEngine()
+    users = [engine.create_user_vector(u)
+             for u in SyntheticUserGenerator(seed=7).generate_users(n_per_stratum=2)]
+    modes = ("similarity", "complementary", "hybrid", "adaptive")
+    
+    matrix = engine.score_matrix(users, modes=modes, task_complexity=0.6, time_factor=0.4)
+    print(f"✓ Tensör: {matrix['total'].shape} (kullanıcı × persona × mod)")
+    
+    max_diff = 0.0
+    for i, user_vec in enumerate(users):
+        for j, persona_id in enumerate(matrix["persona_ids"]):
+            for k, mode in enumerate(modes):
+                expected = engine.calculate_recommendation_score(
+                    user_vec, engine.persona_vectors[persona_id],
+                    task_complexity=0.6, time_factor=0.4, mode=mode
+                )["total_score"]
+                max_diff = max(max_diff, abs(expected - matrix["total"][i, j, k]))
+    print(f"✓ En büyük fark: {max_diff:.2e}")
+    
+    assert max_diff < 1e-9, "score_matrix skaler skorla aynı olmalı"
+    
+    print("\n✅ Score Matrix testi başarılı!")
+    return True
+
+
+def test_cohort_reproducibility():
+    """Aynı seed, worker / chunk ayarından bağımsız olarak aynı kohortu üretmeli"""
+    print_header("🎲 Kohort Tekrarlanabilirlik Testi")
+    
+    import numpy as np
+    from synthetic_user_generator import SyntheticUserGenerator
+    
+    # Birden fazla blok ve blok sınırına hizalı olmayan chunk'lar
+    block = SyntheticUserGenerator.BLOCK_SIZE
+    n_per_stratum = 2 * block + 100
+    reference = SyntheticUserGenerator(seed=11).generate_columns(n_per_stratum=n_per_stratum)
+    print(f"✓ Referans kohort: {len(reference)} kullanıcı")
+    
+    for workers, chunk_size in [(None, block), (2, None), (2, block + 1808), (3, n_per_stratum)]:
+        columns = SyntheticUserGenerator(seed=11).generate_columns(
+            n_per_stratum=n_per_stratum, workers=workers, chunk_size=chunk_size
+        )
+        identical = all(np.array_equal(reference[name], columns[name])
+                        for name in reference.columns)
+        print(f"✓ workers={workers}, chunk_size={chunk_size}: "
+              f"{'bit düzeyinde aynı' if identical else 'FARKLI'}")
+        assert identical, "Kohort worker / chunk ayarına bağlı olmamalı"
+    
+    print("\n✅ Kohort tekrarlanabilirlik testi başarılı!")
+    return True
+
+
+def test_matching_analysis():
+    """MatchingResults.analyze eski liste (DataFrame filtreleme) analiziyle aynı olmalı"""
+    print_header("🔗 Matching Analiz Testi")
+    
+    import io
+    import contextlib
+    import pandas as pd
+    from matching_tester import MatchingTester, MATCHING_MODES
+    from synthetic_user_generator import SyntheticUserGenerator
+    
+    users = SyntheticUserGenerator(seed=3).generate_users(n_per_stratum=5)
+    tester = MatchingTester()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = tester.test_all_matchings(users)
+    analysis = results.analyze()
+    print(f"✓ {len(results)} matching analiz edildi")
+    
+    # Eski analiz: satır dict'lerinden DataFrame, mod / kullanıcı başına filtreleme
+    df = pd.DataFrame(list(results))
+    assert analysis["total_matchings"] == len(df)
+    for mode in MATCHING_MODES:
+        mode_df = df[df["mode"] == mode]
+        scores = mode_df["recommendation_score"]
+        assert abs(analysis[f"{mode}_mode"]["mean_score"] - scores.mean()) < 1e-9
+        assert abs(analysis[f"{mode}_mode"]["std"] - scores.std()) < 1e-9
+        
+        best = {
+            user_id: mode_df[mode_df["user_id"] == user_id]
+            .nlargest(3, "recommendation_score")["persona_id"].tolist()
+            for user_id in mode_df["user_id"].unique()
+        }
+        assert list(analysis[f"best_{mode}_matches"].items()) == list(best.items()), \
+            f"{mode} best-k farklı"
+        print(f"✓ {mode}: ortalama, std ve best-3 aynı")
+    
+    assert analysis["persona_selection_frequency"] == df.groupby("persona_id").size().to_dict()
+    for key, user_domain in [("tech_users_prefer", "technical"), ("edu_users_prefer", "educational")]:
+        user_df = df[df["user_domain"] == user_domain]
+        for mode in MATCHING_MODES:
+            categories = user_df[user_df["mode"] == mode]["persona_category"]
+            assert analysis[key][f"{mode}_mode"] == {
+                "education_personas": int((categories == "education").sum()),
+                "technology_personas": int((categories == "technology").sum())
+            }
+    print("✓ Persona frekansı ve kategori tercihleri aynı")
+    
+    print("\n✅ Matching analiz testi başarılı!")
+    return True
+
+
+def test_quality_batch():
+    """Toplu Pylint çalıştırması kod başına Pylint ile aynı sonucu vermeli"""
+    print_header("🧹 Toplu Pylint Testi")
+    
+    import shutil
+    if shutil.which("pylint") is None:
+        print("⚠️  pylint kurulu değil, bu test atlanıyor")
+        return None
+    
+    from evaluator import CodeEvaluator
+    
+    codes = [
+        "def add(x):\n    return x + 1\n",
+        "import os\nos.system('ls')\n",
+        "x=1\ny = 2\nprint(x,y)\n",
+        "def g( a,b ):\n  unused = 3\n  return a\n"
+    ]
+    evaluator = CodeEvaluator()
+    batch = evaluator._run_quality_batch(codes, fallback=False)
+    
+    for index, (code, batch_result) in enumerate(zip(codes, batch)):
+        single_result = evaluator._run_quality_analysis(code)
+        print(f"✓ Kod {index + 1}: toplu={batch_result['score']}, "
+              f"tekil={single_result['score']}")
+        assert batch_result == single_result, "Toplu ve tekil Pylint sonucu aynı olmalı"
+    
+    print("\n✅ Toplu Pylint testi başarılı!")
+    return True
+
+
+def test_evaluation_cache():
+    """Cache: fingerprint değişince geçersizleşme ve LRU eviction"""
+    print_header("🗄️  Evaluation Cache Testi")
+    
+    import time
+    import tempfile
+    from evaluation_cache import EvaluationCache, environment_fingerprint
+    
+    old_fingerprint = environment_fingerprint("1.0", {"weights": [0.3, 0.3, 0.2, 0.2]})
+    new_fingerprint = environment_fingerprint("1.0", {"weights": [0.4, 0.2, 0.2, 0.2]})
+    assert old_fingerprint != new_fingerprint, "Ağırlık değişince fingerprint değişmeli"
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, "cache.sqlite")
+        cache = EvaluationCache(old_fingerprint, filepath=filepath)
+        cache.put("print(1)", {"total_score": 1})
+        cache.close()
+        
+        cache = EvaluationCache(old_fingerprint, filepath=filepath)
+        assert cache.get("print(1)") == {"total_score": 1}, "Kayıt diskte kalmalı"
+        cache.close()
+        print("✓ Aynı fingerprint: kayıt yeniden açılışta bulundu")
+        
+        cache = EvaluationCache(new_fingerprint, filepath=filepath)
+        assert cache.stats()["entries"] == 0, "Eski fingerprint kayıtları silinmeli"
+        assert cache.get("print(1)") is None
+        cache.close()
+        print("✓ Yeni fingerprint: eski kayıtlar silindi")
+    
+    # Boyut sınırı 3 kayıt; bellekte kalan sık kullanılan kayıt silinmemeli
+    def entry(index):
+        return {"total_score": index, "padding": "x" * 100}
+    
+    entry_size = len(json.dumps(entry(0), ensure_ascii=False).encode("utf-8"))
+    cache = EvaluationCache(old_fingerprint, filepath=":memory:",
+                            max_bytes=3 * entry_size, memory_entries=8)
+    for index in range(3):
+        cache.put(f"print({index})", entry(index))
+        time.sleep(0.01)
+    assert cache.get("print(0)") == entry(0), "Bellek isabeti"
+    time.sleep(0.01)
+    cache.put("print(3)", entry(3))
+    
+    stats = cache.stats()
+    print(f"✓ İstatistik: {stats}")
+    assert stats["evictions"] == 1 and stats["entries"] == 3
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert cache.get("print(0)") is not None, "Yakın zamanda kullanılan kayıt kalmalı"
+    assert cache.get("print(1)") is None, "En eski erişilen kayıt silinmeli"
+    cache.close()
+    print("✓ LRU eviction bellek isabetlerini hesaba katıyor")
+    
+    print("\n✅ Evaluation Cache testi başarılı!")
+    return True
+
+
+def test_weight_learner_segments():
+    """Profilden kurulan vektör, öğrenici güncellemesini doğru seviye segmentine yazmalı"""
+    print_header("📈 Ağırlık Öğrenici Segment Testi")
+    
+    from competency_assessment import CompetencyProfile
+    from online_weight_learner import OnlineWeightLearner, EVALUATION_ITEMS
+    from recommendation_engine import RecommendationEngine
+    
+    def profile(level, score, domain):
+        return CompetencyProfile(
+            user_id=f"test_{level}", technical_score=score, educational_score=score,
+            technical_level=level, educational_level=level, overall_score=score,
+            dominant_domain=domain,
+            weak_domain="educational" if domain == "technical" else "technical",
+            assessment_date="2026-01-01", responses={},
+            recommended_personas_similarity=[], recommended_personas_complementary=[]
+        )
+    
+    engine = RecommendationEngine()
+    learner = OnlineWeightLearner(engine)
+    evaluation = {item: 8 for item in EVALUATION_ITEMS}
+    
+    expert = engine.create_user_vector(profile("expert", 90, "technical").engine_profile())
+    assert expert.technical_skill == engine.LEVEL_MAPPING["expert"], "Seviye vektöre yansımalı"
+    assert expert.declarative_knowledge == 0.9, "Skor vektöre yansımalı"
+    learner.update_from_evaluation(expert, "tech_expert", evaluation, mode="similarity")
+    
+    novice = engine.create_user_vector(profile("novice", 10, "educational").engine_profile())
+    learner.update_from_evaluation(novice, "edu_novice", evaluation, mode="complementary")
+    
+    counts = {segment: state.n_updates for segment, state in learner.segments.items()}
+    print(f"✓ Segment güncellemeleri: {counts}")
+    assert counts.get("expert") == 1, "Expert profil expert segmentine gitmeli"
+    assert counts.get("novice") == 1, "Novice profil novice segmentine gitmeli"
+    
+    print("\n✅ Ağırlık öğrenici segment testi başarılı!")
+    return True
+
+
 def test_dependencies():
     """Bağımlılık testleri"""
     print_header("📦 Bağımlılık Testleri")
@@ -246,6 +481,12 @@ def main():
         "Personas": test_personas(),
         "API Key": test_api_key(),
         "Evaluator": test_evaluator(),
+        "Score Matrix": test_score_matrix(),
+        "Cohort Seed": test_cohort_reproducibility(),
+        "Matching Analysis": test_matching_analysis(),
+        "Pylint Batch": test_quality_batch(),
+        "Evaluation Cache": test_evaluation_cache(),
+        "Learner Segments": test_weight_learner_segments(),
     }
     
     # Code generator testi (API key varsa)
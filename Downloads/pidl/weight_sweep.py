@@ -0,0 +1,273 @@
+"""
+Ağırlık Taraması (Weight Sweep) - α, β, γ, δ Simplex Araması
+
+R(u,p) = α·S + β·C + γ·P + δ·L ağırlıklara göre doğrusaldır. Bu yüzden
+ağırlıktan bağımsız bileşen tensörleri (S, C, P, L, D) bir kez hesaplanır,
+mod'a göre U×P×4 özellik tensörüne dönüştürülür ve binlerce ağırlık noktası
+tek bir matris çarpımı ile değerlendirilir:
+
+    totals = W @ Fᵀ     (N×4) @ (U×4×P) → U×N×P
+
+Persona ekseni son eksendir; böylece sıralama işlemleri contiguous
+bellek üzerinde çalışır.
+
+Çıktılar:
+- Top-k kararlılığı (referans ağırlıklara göre top-k kesişimi)
+- Spearman sıra korelasyonu (referans sıralamaya göre)
+- Ağırlık başına amaç fonksiyonu değeri (yalnızca amaç verilirse)
+
+Varsayılan bir amaç yoktur. Örneğin "kullanıcı başına en yüksek skorun
+ortalaması" w'nin doğrusal fonksiyonlarının maksimumu olduğu için w'de
+konvekstir; simplex üzerindeki maksimumu her zaman bir köşeye (tek
+bileşene %100 ağırlık) düşer ve anlamlı bir "en iyi" nokta vermez. En iyi
+nokta ancak dış bir referansa bağlı amaçla (ör. rating_objective ile
+kullanıcı puanlarına uyum) seçilir.
+"""
+
+import numpy as np
+from itertools import combinations
+from typing import Callable, Dict, Optional, Sequence
+
+from recommendation_engine import RecommendationEngine, SCORING_MODES, SCORE_COMPONENTS
+
+
+WEIGHT_NAMES = ("alpha", "beta", "gamma", "delta")
+
+
+def simplex_grid(resolution: int = 20) -> np.ndarray:
+    """
+    α + β + γ + δ = 1 simplex'i üzerinde düzenli ızgara
+
+    Args:
+        resolution: Adım sayısı (adım = 1/resolution)
+
+    Returns:
+        N×4 ağırlık matrisi, N = C(resolution+3, 3)
+    """
+    # Stars and bars: 3 ayraç konumu → 4 parça
+    bars = np.array(list(combinations(range(resolution + 3), 3)))
+    edges = np.concatenate([
+        np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), resolution + 3)
+    ], axis=1)
+    return (np.diff(edges, axis=1) - 1) / resolution
+
+
+def random_simplex(n_points: int = 5000, concentration: float = 1.0,
+                   seed: Optional[int] = None) -> np.ndarray:
+    """Dirichlet örnekleme ile N×4 rastgele ağırlık noktası"""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.full(len(WEIGHT_NAMES), concentration), size=n_points)
+
+
+def rating_objective(ratings: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Feedback puanlarına uyum amaç fonksiyonu
+
+    Her kullanıcı için tahmin edilen skorlar ile verilen puanlar arasındaki
+    Pearson korelasyonunun kullanıcılar üzerinden ortalaması.
+
+    Args:
+        ratings: U×P puan matrisi (puanlanmamış hücreler NaN)
+
+    Returns:
+        totals (U×N×P) → (N,) amaç fonksiyonu
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    rated = ~np.isnan(ratings)
+    counts = rated.sum(axis=1)
+    y = np.where(rated, ratings, 0.0)
+    y_centered = np.where(rated, y - y.sum(axis=1, keepdims=True) / np.maximum(counts, 1)[:, None], 0.0)
+    y_norm = np.sqrt((y_centered ** 2).sum(axis=1))
+
+    def objective(totals: np.ndarray) -> np.ndarray:
+        mask = rated[:, None, :]
+        x = np.where(mask, totals, 0.0)
+        x_centered = np.where(mask, x - x.sum(axis=2, keepdims=True) / np.maximum(counts, 1)[:, None, None], 0.0)
+        numerator = np.einsum('unp,up->un', x_centered, y_centered)
+        denominator = np.sqrt((x_centered ** 2).sum(axis=2)) * y_norm[:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = numerator / denominator
+        # En az 2 puanı ve varyansı olmayan kullanıcılar hesaba katılmaz
+        valid = (counts >= 2)[:, None] & (denominator > 0)
+        totals_valid = valid.sum(axis=0)
+        summed = np.where(valid, correlation, 0.0).sum(axis=0)
+        return np.where(totals_valid > 0, summed / np.maximum(totals_valid, 1), np.nan)
+
+    return objective
+
+
+def mode_features(components: Dict[str, np.ndarray], learning_goal: np.ndarray,
+                  mode: str) -> np.ndarray:
+    """
+    Mod'a göre U×P×4 özellik tensörü (α, β, γ, δ katsayıları)
+
+    similarity:    [S,     C, P, L]
+    complementary: [1 - S, D, P, L]
+    hybrid:        g·complementary + (1 - g)·similarity
+    adaptive:      learning goal'e göre kullanıcı bazında seçim
+    """
+    performance = components["performance_prediction"]
+    learning = components["learning_trajectory"]
+    similarity_features = np.stack([
+        components["similarity"], components["competency_match"], performance, learning
+    ], axis=-1)
+    complementary_features = np.stack([
+        1 - components["similarity"], components["complementarity"], performance, learning
+    ], axis=-1)
+    if mode == "similarity":
+        return similarity_features
+    if mode == "complementary":
+        return complementary_features
+
+    goal = learning_goal[:, None, None]
+    hybrid_features = goal * complementary_features + (1 - goal) * similarity_features
+    if mode == "hybrid":
+        return hybrid_features
+    return np.where(goal > 0.7, complementary_features,
+                    np.where(goal < 0.3, similarity_features, hybrid_features))
+
+
+class WeightSweep:
+    """Önbelleğe alınmış bileşen tensörleri üzerinde ağırlık taraması"""
+
+    def __init__(self, engine: RecommendationEngine, users, personas=None,
+                 mode: str = "adaptive", task_complexity: float = 0.5,
+                 time_factor: float = 0.5):
+        """
+        Ağırlıktan bağımsız bileşenleri bir kez hesapla
+
+        Args:
+            engine: Recommendation engine (referans ağırlıklar buradan alınır)
+            users: UserVector listesi veya U×10 matris
+            personas: None (tümü), persona id listesi veya PersonaVector listesi
+            mode: "similarity", "complementary", "hybrid", "adaptive"
+            task_complexity: Görev karmaşıklığı
+            time_factor: Zaman faktörü
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Geçersiz mod: {mode}. {SCORING_MODES} olmalı.")
+
+        self.engine = engine
+        self.mode = mode
+        components = engine.score_components(users, personas, task_complexity, time_factor)
+        self.persona_ids = components["persona_ids"]
+        self.components = {name: components[name] for name in SCORE_COMPONENTS}
+        # U×4×P: matmul sonucu persona ekseni sonda kalsın
+        self.features = np.ascontiguousarray(
+            mode_features(components, components["learning_goal"], mode).transpose(0, 2, 1)
+        )
+
+    def totals(self, weights: np.ndarray) -> np.ndarray:
+        """N×4 ağırlık için U×N×P toplam skor tensörü (tek matris çarpımı)"""
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        return np.matmul(weights, self.features)
+
+    @staticmethod
+    def _rank_order(totals: np.ndarray):
+        """
+        Persona ekseninde (son eksen) sıralama
+
+        Returns:
+            (order, ranks): skora göre azalan persona indeksleri ve
+            her persona'nın sıra numarası (0 = en iyi)
+        """
+        order = np.argsort(-totals, axis=-1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(order.shape[-1]), axis=-1)
+        return order, ranks
+
+    def evaluate(self, weights: np.ndarray, reference: Optional[Sequence[float]] = None,
+                 top_k: int = 3, objective: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                 chunk_size: int = 2048) -> Dict:
+        """
+        Ağırlık noktalarını toplu değerlendir
+
+        Args:
+            weights: N×4 (α, β, γ, δ) matrisi
+            reference: Referans ağırlıklar (None = engine'in mevcut ağırlıkları)
+            top_k: Kararlılık için K
+            objective: totals (U×n×P) → (n,) fonksiyonu; None ise amaç
+                hesaplanmaz ve en iyi nokta seçilmez (bkz. modül docstring'i)
+            chunk_size: Bellek sınırı için tek çarpımdaki ağırlık sayısı
+
+        Returns:
+            {
+                "weights": N×4,
+                "topk_stability": (N,) referans top-k ile ortalama kesişim oranı,
+                "top1_agreement": (N,) top-1 persona'sı referansla aynı kullanıcı oranı,
+                "rank_correlation": (N,) ortalama Spearman ρ,
+                "objective": (N,) veya None,
+                "best_index", "best_weights" (amaç yoksa None)
+            }
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        if reference is None:
+            reference = [getattr(self.engine, name) for name in WEIGHT_NAMES]
+        top_k = min(top_k, len(self.persona_ids))
+
+        reference_order, reference_ranks = self._rank_order(
+            self.totals(np.asarray(reference, dtype=np.float64))
+        )
+        # Referans top-k: U×1×P boolean maske
+        reference_mask = reference_ranks < top_k
+
+        n_personas = len(self.persona_ids)
+        spearman_scale = 6.0 / (n_personas * (n_personas ** 2 - 1)) if n_personas > 1 else 0.0
+
+        stability, top1, correlation, objective_values = [], [], [], []
+        for start in range(0, len(weights), chunk_size):
+            totals = self.totals(weights[start:start + chunk_size])
+            order, ranks = self._rank_order(totals)
+
+            overlap = ((ranks < top_k) & reference_mask).sum(axis=2) / top_k
+            stability.append(overlap.mean(axis=0))
+            top1.append((order[:, :, 0] == reference_order[:, :, 0]).mean(axis=0))
+
+            squared_diff = ((ranks - reference_ranks) ** 2).sum(axis=2)
+            correlation.append((1 - spearman_scale * squared_diff).mean(axis=0))
+
+            if objective is not None:
+                objective_values.append(np.asarray(objective(totals), dtype=np.float64))
+
+        best_index = None
+        if objective is not None:
+            objective_values = np.concatenate(objective_values)
+            if np.any(~np.isnan(objective_values)):
+                best_index = int(np.nanargmax(objective_values))
+        else:
+            objective_values = None
+
+        return {
+            "weights": weights,
+            "topk_stability": np.concatenate(stability),
+            "top1_agreement": np.concatenate(top1),
+            "rank_correlation": np.concatenate(correlation),
+            "objective": objective_values,
+            "best_index": best_index,
+            "best_weights": (dict(zip(WEIGHT_NAMES, weights[best_index].tolist()))
+                             if best_index is not None else None)
+        }
+
+
+# Test için
+if __name__ == "__main__":
+    import time
+    from synthetic_user_generator import SyntheticUserGenerator
+
+    engine = RecommendationEngine()
+    users = SyntheticUserGenerator(seed=42).generate_users(n_per_stratum=15)
+    user_vecs = [engine.create_user_vector(u) for u in users]
+
+    sweep = WeightSweep(engine, user_vecs)
+    grid = simplex_grid(30)
+
+    start = time.time()
+    result = sweep.evaluate(grid, top_k=3)
+    print(f"✅ {len(grid)} ağırlık noktası {time.time() - start:.3f}s içinde değerlendirildi")
+
+    stable = np.argsort(-result["rank_correlation"])[:5]
+    print("\n📊 Referansa en yakın sıralamayı veren ağırlıklar:")
+    for idx in stable:
+        w = result["weights"][idx]
+        print(f"  α={w[0]:.2f} β={w[1]:.2f} γ={w[2]:.2f} δ={w[3]:.2f} → "
+              f"ρ={result['rank_correlation'][idx]:.3f}, top-3={result['topk_stability'][idx]:.3f}")